@@ -0,0 +1 @@
+"""Headless benchmarks: run with `python -m benchmarks --help`."""
@@ -0,0 +1,39 @@
+import argparse
+import sys
+from benchmarks import runner, workloads
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Run headless engine benchmarks (SDL dummy video driver).')
+    parser.add_argument('--frames', type=int, default=300, help='timed frames per workload')
+    parser.add_argument('--warmup', type=int, default=30, help='untimed frames before timing')
+    parser.add_argument('--only', nargs='*', help='run only workloads whose name contains one of these')
+    parser.add_argument('--replay', nargs='*', default=[], help='also replay these recorded sessions (game.py --record)')
+    parser.add_argument('--trace-alloc', action='store_true', help='also measure per-frame transient bytes (slow)')
+    parser.add_argument('--out', help='write the JSON report here')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--metric', default='p95', choices=('mean', 'p50', 'p95', 'p99'))
+    parser.add_argument('--tolerance', type=float, default=0.10, help='allowed slowdown ratio (0.10 = 10%%)')
+    args = parser.parse_args(argv)
+
+    selected = workloads.default_workloads() + [workloads.ReplaySession(path) for path in args.replay]
+    if args.only:
+        selected = [w for w in selected if any(key in w.name for key in args.only)]
+
+    report = runner.run(selected, frames=args.frames, warmup=args.warmup, trace_alloc=args.trace_alloc)
+    if args.out:
+        runner.save(report, args.out)
+
+    if args.baseline:
+        regressions = runner.compare(report, runner.load(args.baseline), args.metric, args.tolerance)
+        for name, stage, old, new, ratio in regressions:
+            print(f"REGRESSION {name} {stage} {args.metric}: {old:.3f} -> {new:.3f} ms (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print('No regressions.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#benchmark runner
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def summarize(samples_ms) -> dict:
+    """mean/p50/p95/p99/max of a list of millisecond samples."""
+    data = np.asarray(samples_ms, dtype=np.float64)
+    if not data.size:
+        return {}
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    return {
+        'mean': float(data.mean()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(data.max()),
+    }
+
+
+def run_workload(workload, screen, frames=300, warmup=30, dt=1 / 60, trace_alloc=False) -> dict:
+    """
+    Run one workload and return its timing/allocation summary.
+
+    Allocation metrics per frame:
+    - live_block_delta: net change in live Python memory blocks
+      (sys.getallocatedblocks); a leak shows up, steady allocate-and-free
+      churn does not
+    - peak_kib: transient bytes allocated above the frame's starting level
+      (tracemalloc, only with trace_alloc since it slows everything down)
+    """
+    workload.setup(screen)
+    for frame in range(warmup):
+        workload.update(dt, frame)
+        workload.draw(screen, frame)
+
+    update_ms, draw_ms, blocks, peaks = [], [], [], []
+    gc.collect()
+    if trace_alloc:
+        tracemalloc.start()
+    for frame in range(warmup, warmup + frames):
+        start_blocks = sys.getallocatedblocks()
+        if trace_alloc:
+            tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        workload.update(dt, frame)
+        t1 = time.perf_counter()
+        workload.draw(screen, frame)
+        t2 = time.perf_counter()
+        end_blocks = sys.getallocatedblocks()
+        update_ms.append((t1 - t0) * 1000)
+        draw_ms.append((t2 - t1) * 1000)
+        blocks.append(end_blocks - start_blocks)
+        if trace_alloc:
+            peaks.append((tracemalloc.get_traced_memory()[1] - start_bytes) / 1024)
+    if trace_alloc:
+        tracemalloc.stop()
+
+    result = {
+        'frames': frames,
+        'update_ms': summarize(update_ms),
+        'draw_ms': summarize(draw_ms),
+        'frame_ms': summarize([u + d for u, d in zip(update_ms, draw_ms)]),
+        'live_block_delta': summarize(blocks),
+    }
+    if trace_alloc:
+        result['alloc_peak_kib_per_frame'] = summarize(peaks)
+    return result
+
+
+def run(workloads, frames=300, warmup=30, size=(800, 600), trace_alloc=False, log=print) -> dict:
+    """Run every workload headlessly and return a JSON-serialisable report."""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.chdir(ROOT)  # assets are referenced relative to the repo root
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    import pygame
+    from system.engine import Engine
+    screen = Engine.create_display(size, headless=True)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'frames': frames,
+            'warmup': warmup,
+            'trace_alloc': trace_alloc,
+        },
+        'results': {},
+    }
+    for workload in workloads:
+        result = run_workload(workload, screen, frames, warmup, trace_alloc=trace_alloc)
+        report['results'][workload.name] = result
+        if log:
+            frame = result['frame_ms']
+            log(f"{workload.name:<36} mean {frame['mean']:7.3f} ms  p95 {frame['p95']:7.3f} ms  "
+                f"p99 {frame['p99']:7.3f} ms  live blocks {result['live_block_delta']['mean']:+.1f}/frame")
+    return report
+
+
+def compare(report, baseline, metric='p95', tolerance=0.10) -> list:
+    """
+    Compare frame/update/draw times against a baseline report.
+
+    Returns a list of (workload, stage, baseline_ms, current_ms, ratio) for
+    every stage slower than baseline by more than tolerance.
+    """
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        for stage in ('frame_ms', 'update_ms', 'draw_ms'):
+            old = base.get(stage, {}).get(metric)
+            new = result.get(stage, {}).get(metric)
+            # Ignore sub-0.05 ms stages, they are timer noise
+            if old is None or new is None or max(old, new) < 0.05:
+                continue
+            ratio = new / old if old else float('inf')
+            if ratio > 1 + tolerance:
+                regressions.append((name, stage, old, new, ratio))
+    return regressions
+
+
+def save(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
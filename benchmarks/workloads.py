@@ -0,0 +1,391 @@
+#benchmark workloads
+import math
+import os
+import random
+import pygame
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+
+
+class Workload:
+    """
+    A scripted, deterministic scene fragment to time.
+
+    setup() runs once after the display exists; update()/draw() run every
+    frame and are timed separately.
+    """
+    name = 'workload'
+
+    def setup(self, screen):
+        pass
+
+    def update(self, dt, frame):
+        pass
+
+    def draw(self, screen, frame):
+        pass
+
+
+class Scene0Projectiles(Workload):
+    """Scene0 with a steady population of n projectiles in flight or landed."""
+
+    def __init__(self, n=100, dirty_rendering=False):
+        self.n = n
+        self.dirty_rendering = dirty_rendering
+        self.name = f"scene0_projectiles_{n}" + ('_dirty' if dirty_rendering else '')
+
+    def setup(self, screen):
+        from scenes.Scene0 import Scene0
+        self.scene = Scene0(dirty_rendering=self.dirty_rendering)
+        self.scene.enter()
+        self.rng = random.Random(0)
+
+    def update(self, dt, frame):
+        player = self.scene.player
+        while len(player.projectiles) < self.n:
+            player.shoot((self.rng.uniform(0, SCREEN_WIDTH), self.rng.uniform(0, SCREEN_HEIGHT / 2)))
+        self.scene.update(dt)
+
+    def draw(self, screen, frame):
+        self.scene.draw(screen)
+
+
+class EngineLoop(Workload):
+    """Whole Engine loops (steps and render) over Scene0 with n projectiles, serial or pipelined."""
+
+    def __init__(self, n=200, pipelined=False):
+        self.n = n
+        self.pipelined = pipelined
+        self.name = f"engine_loop_{n}" + ('_pipelined' if pipelined else '')
+
+    def setup(self, screen):
+        from scenes.Scene0 import Scene0
+        from system.engine import Engine
+        from system.manager import SceneManager
+        manager = SceneManager()
+        self.scene = Scene0(seed=0)
+        manager.switch_to(self.scene)
+        self.engine = Engine(manager, screen, headless=True, render=True, pipelined=self.pipelined)
+        self.engine.running = True
+        self.rng = random.Random(0)
+
+    def update(self, dt, frame):
+        # Spawning touches simulation state, so wait for steps still in flight first
+        self.engine.finish()
+        player = self.scene.player
+        while len(player.projectiles) < self.n:
+            player.shoot((self.rng.uniform(0, SCREEN_WIDTH), self.rng.uniform(0, SCREEN_HEIGHT / 2)))
+        self.engine.tick(dt)
+
+
+class FuseLights(Workload):
+    """n moving fuse glows composited into the lighting overlay."""
+
+    def __init__(self, n=200):
+        self.n = n
+        self.name = f"fuse_lights_{n}"
+
+    def setup(self, screen):
+        from renderer import Light as light
+        from renderer.lighting import LightingCompositor
+        from system.entities.character import ProjectileEntity
+        self.mask_spec = ProjectileEntity.FUSE_MASK
+        self.light = light
+        self.lighting = LightingCompositor(screen.get_size())
+        rng = random.Random(1)
+        self.seeds = [(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), rng.uniform(0, 6.28))
+                      for _ in range(self.n)]
+
+    def draw(self, screen, frame):
+        self.lighting.begin_frame()
+        for x, y, phase in self.seeds:
+            mask = self.light.circle_light_mask(*self.mask_spec)
+            self.lighting.add_light(mask, (x + 20 * math.cos(phase + frame * 0.05), y))
+        screen.fill((40, 40, 40))
+        screen.blit(self.lighting.overlay, (0, 0))
+
+
+class RotatingSpotlight(Workload):
+    """A flashlight sweeping a full circle every 2 seconds."""
+
+    def __init__(self, baked=False):
+        self.baked = baked
+        self.name = 'spotlight_baked' if baked else 'spotlight'
+
+    def setup(self, screen):
+        from renderer.Light import SpotLight
+        self.spot = SpotLight(display_surface=screen.get_size())
+        self.beam = self.spot.create_beam()
+        if self.baked:
+            self.spot.bake(self.beam, lazy=False)
+        self.overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        self.center = pygame.Vector2(screen.get_rect().center)
+
+    def draw(self, screen, frame):
+        target = self.center + pygame.Vector2(100, 0).rotate(frame * 3)
+        image, rect = self.spot.draw(self.beam, self.center, target)
+        self.overlay.fill((20, 30, 50, 120))
+        self.overlay.blit(image, rect, special_flags=pygame.BLEND_RGBA_SUB)
+        screen.fill((40, 40, 40))
+        screen.blit(self.overlay, (0, 0))
+
+
+class Buttons(Workload):
+    """n buttons receiving synthetic pointer motion and clicks (optionally through a UIManager)."""
+
+    def __init__(self, n=100, managed=False):
+        self.n = n
+        self.managed = managed
+        self.name = f"buttons_{n}" + ('_ui' if managed else '')
+
+    def setup(self, screen):
+        from renderer.UI.button import Button
+        from renderer.UI.fancy_text import FancyText
+        from renderer.UI.manager import UIManager
+        fancy = FancyText(font_size=18, font_path="assets/fonts/Creepster_Regular.ttf")
+        cols = max(1, int(math.sqrt(self.n)))
+        self.buttons = [
+            Button(color=(200, 200, 200, 250), width=60, height=24,
+                   pos=(40 + (i % cols) * 70, 20 + (i // cols) * 30), text=f"B{i}",
+                   border_color=(255, 0, 0, 255), border_width=2, fancy_text=fancy,
+                   click_callback=lambda b: None)
+            for i in range(self.n)
+        ]
+        self.ui = None
+        if self.managed:
+            self.ui = UIManager(screen.get_size())
+            for button in self.buttons:
+                self.ui.add(button)
+
+    def update(self, dt, frame):
+        button = self.buttons[frame % self.n]
+        pos = button.rect.center
+        pygame.mouse.set_pos(pos)
+        events = [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))]
+        if frame % 10 == 0:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1))
+        if self.ui is not None:
+            self.ui.handle_events(events)
+            return
+        for button in self.buttons:
+            button.update(events)
+
+    def draw(self, screen, frame):
+        screen.fill((0, 0, 0))
+        if self.ui is not None:
+            self.ui.draw(screen)
+            return
+        for button in self.buttons:
+            button.draw(screen)
+
+
+class OutlinedText(Workload):
+    """n outlined FancyText strings re-rendered every frame (FPS-counter style)."""
+
+    def __init__(self, n=20):
+        self.n = n
+        self.name = f"fancy_text_{n}"
+
+    def setup(self, screen):
+        from renderer.UI.fancy_text import FancyText
+        self.fancy = FancyText(font_size=24, font_path="assets/fonts/Creepster_Regular.ttf")
+
+    def draw(self, screen, frame):
+        screen.fill((0, 0, 0))
+        for i in range(self.n):
+            text = self.fancy.render(f"Score {frame + i}", (255, 255, 255), (0, 0, 0), 2)
+            screen.blit(text, (10 + (i % 4) * 190, 10 + (i // 4) * 40))
+
+
+class Crowd(Workload):
+    """n drifting entities moved, clamped and drawn by batched EntityStore systems."""
+
+    def __init__(self, n=10000):
+        self.n = n
+        self.name = f"crowd_{n}"
+
+    def setup(self, screen):
+        from system.ecs import EntityStore
+        from system.GameGlobals import asset_manager
+        image = asset_manager.load('assets/tnt.png', (16, 16))
+        self.store = EntityStore(self.n)
+        rng = random.Random(2)
+        for _ in range(self.n):
+            self.store.create(image, (rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)),
+                              velocity=(rng.uniform(-60, 60), rng.uniform(-60, 60)))
+
+    def update(self, dt, frame):
+        self.store.integrate(dt)
+        self.store.clamp((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def draw(self, screen, frame):
+        screen.fill((0, 0, 0))
+        self.store.draw(screen)
+
+
+class ScrollingWorld(Workload):
+    """A camera sweeping a level `screens` screens wide: parallax background plus a tile layer."""
+
+    def __init__(self, screens=32):
+        self.screens = screens
+        self.name = f"world_{screens}_screens"
+
+    def setup(self, screen):
+        from renderer.camera import Camera
+        from renderer.world import ChunkedLayer, World
+        from system.GameGlobals import asset_manager
+        background = asset_manager.load('assets/background.png', alpha=False)
+        tile = asset_manager.load('assets/tnt.png', (32, 32))
+        columns = self.screens * SCREEN_WIDTH // 32
+        grid = [[0 if (x + y) % 3 == 0 else -1 for x in range(columns)] for y in range(SCREEN_HEIGHT // 32)]
+        self.camera = Camera(columns * 32, SCREEN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.world = World(self.camera, [
+            ChunkedLayer(background, parallax=(0.2, 0.0), repeat_x=True),
+            ChunkedLayer.from_tiles([tile], grid, 32),
+        ])
+
+    def update(self, dt, frame):
+        self.camera.x += 40
+        if self.camera.x > self.camera.world_width - SCREEN_WIDTH:
+            self.camera.x = 0
+
+    def draw(self, screen, frame):
+        self.world.draw(screen)
+
+
+class Explosions(Workload):
+    """A steady population of n live particles from continuous additive bursts."""
+
+    def __init__(self, n=50000, life=1.0):
+        self.n = n
+        self.life = life
+        self.name = f"particles_{n}"
+
+    def setup(self, screen):
+        from renderer.particles import ParticleEmitter
+        self.emitter = ParticleEmitter(capacity=self.n, additive=True, seed=3)
+        self.per_frame = self.n // 60  # at 60 ticks/s particles expire as fast as they are emitted
+        self.rng = random.Random(3)
+
+    def update(self, dt, frame):
+        pos = (self.rng.uniform(100, SCREEN_WIDTH - 100), self.rng.uniform(100, SCREEN_HEIGHT - 100))
+        self.emitter.burst(pos, self.per_frame, life=(self.life * 0.9, self.life * 1.1))
+        self.emitter.update(dt)
+
+    def draw(self, screen, frame):
+        screen.fill((0, 0, 0))
+        self.emitter.draw(screen)
+
+
+class PhysicsBodies(Workload):
+    """n bodies asleep on the ground plus a stream of bouncing ones in a PhysicsWorld."""
+
+    def __init__(self, n=20000, launched=4, integrator='verlet'):
+        self.n = n
+        self.launched = launched
+        self.integrator = integrator
+        self.name = f"physics_{n}_{integrator}"
+
+    def setup(self, screen):
+        from physics_engine.world import PhysicsWorld
+        self.world = PhysicsWorld(ground_y=SCREEN_HEIGHT - 64, integrator=self.integrator, drag=0.2,
+                                  wind=(40.0, 0.0), restitution=0.5, capacity=self.n)
+        self.world.add_collider((300, 380, 200, 16))
+        for i in range(self.n):
+            self.world.add_body((i * SCREEN_WIDTH / self.n, SCREEN_HEIGHT - 64), drag=0.0)
+        self.world.step(1 / 60)  # everything on the ground falls asleep
+        self.rng = random.Random(4)
+        self.dot = pygame.Surface((4, 4))
+        self.dot.fill((255, 200, 80))
+
+    def update(self, dt, frame):
+        world = self.world
+        for _ in range(self.launched):
+            world.add_body((self.rng.uniform(0, SCREEN_WIDTH), 100), (self.rng.uniform(-200, 200), self.rng.uniform(-400, 0)))
+        world.step(dt)
+
+    def draw(self, screen, frame):
+        screen.fill((0, 0, 0))
+        positions = self.world.pos[self.world.active_indices()].astype(int).tolist()
+        screen.blits([(self.dot, pos) for pos in positions], doreturn=False)
+
+
+class InputDispatch(Workload):
+    """Synthetic key and pointer events through an InputManager with n subscribed listeners."""
+
+    def __init__(self, listeners=5000):
+        self.listeners = listeners
+        self.name = f"input_{listeners}_listeners"
+
+    def setup(self, screen):
+        from system.input import InputManager, DEFAULT_BINDINGS
+        self.input = InputManager(DEFAULT_BINDINGS)
+        self.calls = 0
+
+        def listener(_):
+            self.calls += 1
+
+        # Most listeners wait on actions and event types that rarely fire, like idle widgets
+        keys = [pygame.K_F1 + i % 12 for i in range(self.listeners)]
+        for i, key in enumerate(keys):
+            self.input.bind(f"action_{i}", key)
+            self.input.on_action(f"action_{i}", listener)
+        self.input.on_action('shoot', listener)
+        self.input.subscribe(pygame.MOUSEMOTION, listener)
+
+    def update(self, dt, frame):
+        key_event = pygame.KEYDOWN if frame % 2 else pygame.KEYUP
+        events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(frame % SCREEN_WIDTH, 300), rel=(1, 0), buttons=(0, 0, 0)),
+                  pygame.event.Event(key_event, key=pygame.K_SPACE, mod=0, unicode=' ', scancode=44)]
+        self.input.poll(events)
+
+
+class ReplaySession(Workload):
+    """A recorded Scene0 session (game.py --record) replayed frame by frame; wraps around at the end."""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f"replay_{os.path.splitext(os.path.basename(path))[0]}"
+
+    def setup(self, screen):
+        from scenes.Scene0 import Scene0
+        from system.engine import Engine
+        from system.GameGlobals import sim_clock
+        from system.manager import SceneManager
+        from system.replay import InputLog
+        self.log = InputLog.load(self.path)
+        sim_clock.reset()
+        manager = SceneManager()
+        self.scene = Scene0(seed=self.log.seed)
+        manager.switch_to(self.scene)
+        self.engine = Engine(manager, screen, step=self.log.step, headless=True)
+        self.engine.running = True
+
+    def update(self, dt, frame):
+        frame_time, mouse_pos, events, _ = self.log.frames[frame % len(self.log)]
+        self.engine.tick(frame_time, events, mouse_pos)
+
+    def draw(self, screen, frame):
+        self.scene.draw(screen)
+
+
+def default_workloads():
+    return [
+        Scene0Projectiles(10),
+        Scene0Projectiles(200),
+        Scene0Projectiles(200, dirty_rendering=True),
+        EngineLoop(200),
+        EngineLoop(200, pipelined=True),
+        FuseLights(200),
+        RotatingSpotlight(),
+        RotatingSpotlight(baked=True),
+        Buttons(100),
+        Buttons(100, managed=True),
+        OutlinedText(20),
+        Crowd(10000),
+        ScrollingWorld(32),
+        Explosions(50000),
+        PhysicsBodies(20000),
+        InputDispatch(5000),
+    ]
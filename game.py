@@ -1,42 +1,64 @@
-import pygame
-from renderer import Light as light
-from renderer.FrameRater import FrameRateDisplay
-from physics_engine.tract import projectile
-from system import character, mary, stickfigure
-from scenes.Scene0 import Scene0
-import sys
+from system.startup import timeline  # first import: the startup timeline starts here
+with timeline.phase('import'):
+    import argparse
+    import os
+    import pygame
+    from renderer.FrameRater import FrameRateDisplay
+    from renderer.profiler import FrameProfiler
+    from system.GameGlobals import asset_manager
+    from system.manager import SceneManager
+    from system.engine import Engine
+    from system.bake import DEFAULT_ARCHIVE
+    from system.replay import InputLog, InputRecorder, replay
+    from scenes.Scene0 import Scene0
+    import sys
 
 
-pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-clock = pygame.time.Clock()
+parser = argparse.ArgumentParser(description='Scene0 demo.')
+parser.add_argument('--record', metavar='FILE', help='log input and per-frame checksums for --replay')
+parser.add_argument('--replay', metavar='FILE', help='replay a recorded session headless and verify it')
+parser.add_argument('--seed', type=int, default=0, help='random seed of a recorded session')
+parser.add_argument('--startup', action='store_true', help='print the startup timeline on exit')
+args = parser.parse_args()
 
-framerate_display = FrameRateDisplay()
-scene0 = Scene0()
+# Pass headless=True to run the simulation on SDL's dummy driver without a window
+with timeline.phase('init display'):
+    screen = Engine.create_display((SCREEN_WIDTH, SCREEN_HEIGHT), fullscreen=not args.replay,
+                                   headless=bool(args.replay))
+if os.path.exists(DEFAULT_ARCHIVE):
+    with timeline.phase('init mount'):
+        asset_manager.mount(DEFAULT_ARCHIVE)  # built by python -m system.bake
 
 def main():
-    running = True
-    pause = False
-    while running:
-        dt = clock.tick(60) / 1000
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-                elif event.key == pygame.K_e:
-                    pause = not pause
-        if not pause:
-            scene0.update(dt)
+    manager = SceneManager()
+    if args.replay:
+        # Same scene, seed and step as the recording; no rendering, no frame cap
+        log = InputLog.load(args.replay)
+        manager.switch_to(Scene0(dirty_rendering=True, seed=log.seed))
+        result = replay(log, Engine(manager, screen, step=log.step, headless=True))
+        print(f"{result['frames']} frames in {result['seconds']:.2f} s, "
+              + ("checksums match" if result['mismatch'] is None else f"diverged at frame {result['mismatch']}"))
+        pygame.quit()
+        sys.exit(0 if result['mismatch'] is None else 1)
 
-            scene0.draw(screen)
-            framerate_display.draw(screen,clock)
-        pygame.display.flip()
+    profiler = FrameProfiler()  # pass telemetry=TelemetryWriter('frames.jsonl') to log every frame
+    framerate_display = FrameRateDisplay(profiler=profiler)
+    with timeline.phase('scene build Scene0'):
+        scene = Scene0(dirty_rendering=True, seed=args.seed if args.record else None)
+    manager.switch_to(scene)
+    engine = Engine(manager, screen, framerate_display=framerate_display, profiler=profiler)
+    if args.record:
+        engine.recorder = InputRecorder(args.record, engine.step, seed=args.seed, scene_manager=manager)
+    engine.run()
 
+    if args.startup:
+        print(timeline.report())
+    if engine.recorder is not None:
+        engine.recorder.close()
+    profiler.close()
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
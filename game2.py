@@ -1,45 +1,44 @@
-import pygame
-import sys
-from system.GameGlobals import scene_manager
-from scenes.Scene0 import Scene0
-from renderer.FrameRater import FrameRateDisplay
+from system.startup import timeline  # first import: the startup timeline starts here
+with timeline.phase('import'):
+    import argparse
+    import os
+    import pygame
+    import sys
+    from system.GameGlobals import scene_manager, asset_manager
+    from system.bake import DEFAULT_ARCHIVE
+    from system.engine import Engine
+    from scenes.Loading import LoadingScene
+    from renderer.FrameRater import FrameRateDisplay
+    from renderer.profiler import FrameProfiler
 
-pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-clock = pygame.time.Clock()
+parser = argparse.ArgumentParser(description='Scene0 demo behind a loading screen.')
+parser.add_argument('--startup', action='store_true', help='print the startup timeline on exit')
+args = parser.parse_args()
 
-framerate_display = FrameRateDisplay()
+with timeline.phase('init display'):
+    screen = Engine.create_display((SCREEN_WIDTH, SCREEN_HEIGHT), fullscreen=True)
+if os.path.exists(DEFAULT_ARCHIVE):
+    with timeline.phase('init mount'):
+        asset_manager.mount(DEFAULT_ARCHIVE)  # built by python -m system.bake
 
-# Setup initial scene
-scene_manager.switch_to(Scene0())
+profiler = FrameProfiler()  # pass telemetry=TelemetryWriter('frames.jsonl') to log every frame
+framerate_display = FrameRateDisplay(profiler=profiler)
 
-def main():
-    running = True
-    pause = False
-    while running:
-        dt = clock.tick(60) / 1000
-        
-        events = pygame.event.get()
-        for event in events:
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-                elif event.key == pygame.K_e:
-                    pause = not pause
-        
-        # Pass events list to the scene manager
-        scene_manager.handle_events(events)
+# Setup initial scene: Scene0 is imported and prepared in the background behind a progress bar,
+# so the first frame does not wait for its module (NumPy, physics, entities) to load
+scene_manager.switch_to(LoadingScene(scene_manager, 'scenes.Scene0:Scene0', dirty_rendering=True))
 
-        if not pause:
-            scene_manager.update(dt)
-            scene_manager.draw(screen)
-            framerate_display.draw(screen, clock)
-        
-        pygame.display.flip()
+def main():
+    # Fixed 60 Hz simulation; E pauses, ESC quits. With a spare core the steps run
+    # on a worker thread while the previous frame renders (the loading screen stays serial)
+    engine = Engine(scene_manager, screen, framerate_display=framerate_display, profiler=profiler,
+                    pipelined=(os.cpu_count() or 1) > 1)
+    engine.run()
 
+    if args.startup:
+        print(timeline.report())
+    profiler.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,171 @@
+#collision broad phase
+import math
+import pygame
+
+LAYER_ALL = -1  # mask matching every layer bit
+
+
+class SpatialHash:
+    """
+    Uniform-grid broad phase for axis-aligned rects.
+
+    Objects are inserted with a rect and a layer bitmask, then moved or
+    removed as they update. Queries only look at the grid cells a rect
+    overlaps, so pair tests scale with local density instead of N*M.
+    Iteration order is insertion order, so results are deterministic.
+    """
+
+    def __init__(self, cell_size: int = 64):
+        """
+        Parameters:
+        - cell_size (int): Grid cell edge in pixels; ~2x the typical object size works well
+        """
+        self.cell_size = cell_size
+        self._cells = {}  # (cx, cy) -> {obj: None} (ordered set)
+        self._items = {}  # obj -> [rect, layer, (cx0, cy0, cx1, cy1)]
+        self.pairs_tested = 0
+        self.pairs_found = 0
+        self.queries = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, obj):
+        return obj in self._items
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_cells(self, obj, span):
+        cells = self._cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cell = cells[(cx, cy)] = {}
+                cell[obj] = None
+
+    def _remove_cells(self, obj, span):
+        cells = self._cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                cell = cells[(cx, cy)]
+                del cell[obj]
+                if not cell:
+                    del cells[(cx, cy)]
+
+    def insert(self, obj, rect, layer: int = 1):
+        """Add obj covering rect on the given layer bit(s)."""
+        if obj in self._items:
+            raise ValueError('object is already in the spatial hash')
+        rect = pygame.Rect(rect)
+        span = self._span(rect)
+        self._items[obj] = [rect, layer, span]
+        self._add_cells(obj, span)
+
+    def move(self, obj, rect):
+        """Update obj's rect; cells are only touched when it crosses a cell edge."""
+        item = self._items[obj]
+        rect = pygame.Rect(rect)
+        span = self._span(rect)
+        if span != item[2]:
+            self._remove_cells(obj, item[2])
+            self._add_cells(obj, span)
+            item[2] = span
+        item[0] = rect
+
+    def remove(self, obj):
+        """Drop obj (no-op if it is not in the hash)."""
+        item = self._items.pop(obj, None)
+        if item is not None:
+            self._remove_cells(obj, item[2])
+
+    def clear(self):
+        self._cells.clear()
+        self._items.clear()
+
+    def rect_of(self, obj) -> pygame.Rect:
+        return self._items[obj][0]
+
+    def _candidates(self, span, mask):
+        cells = self._cells
+        seen = {}
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    for obj in cell:
+                        if obj not in seen and self._items[obj][1] & mask:
+                            seen[obj] = None
+        return seen
+
+    def query_rect(self, rect, mask: int = LAYER_ALL) -> list:
+        """Objects on mask's layers whose rect overlaps rect."""
+        self.queries += 1
+        rect = pygame.Rect(rect)
+        items = self._items
+        return [obj for obj in self._candidates(self._span(rect), mask) if rect.colliderect(items[obj][0])]
+
+    def query_point(self, pos, mask: int = LAYER_ALL) -> list:
+        """Objects on mask's layers whose rect contains pos (e.g. pointer hit tests)."""
+        self.queries += 1
+        size = self.cell_size
+        # floor, not int(): points in (-1, 0) belong to pixel and cell -1, as in _span()
+        pos = (math.floor(pos[0]), math.floor(pos[1]))
+        cell = self._cells.get((pos[0] // size, pos[1] // size))
+        if not cell:
+            return []
+        items = self._items
+        return [obj for obj in cell if items[obj][1] & mask and items[obj][0].collidepoint(pos)]
+
+    def pairs(self, mask_a: int, mask_b: int) -> list:
+        """
+        Overlapping (a, b) pairs with a on mask_a's layers and b on mask_b's.
+
+        Walks whichever side has fewer objects and looks up the other side in
+        the cells it covers. An object on both masks never pairs with itself.
+        """
+        items = self._items
+        side_a = [obj for obj, item in items.items() if item[1] & mask_a]
+        side_b = [obj for obj, item in items.items() if item[1] & mask_b]
+        swap = len(side_a) > len(side_b)
+        outer, inner_mask = (side_b, mask_a) if swap else (side_a, mask_b)
+
+        found = []
+        seen = set()
+        tested = 0
+        for obj in outer:
+            rect = items[obj][0]
+            for other in self._candidates(items[obj][2], inner_mask):
+                if other is obj:
+                    continue
+                tested += 1
+                if rect.colliderect(items[other][0]):
+                    a, b = (other, obj) if swap else (obj, other)
+                    key = (id(a), id(b))
+                    if key not in seen:
+                        seen.add(key)
+                        found.append((a, b))
+        self.pairs_tested += tested
+        self.pairs_found += len(found)
+        return found
+
+    def stats(self) -> dict:
+        """Cell occupancy and query counters (counters accumulate until reset_stats)."""
+        occupancy = [len(cell) for cell in self._cells.values()]
+        return {
+            'objects': len(self._items),
+            'cells': len(occupancy),
+            'max_per_cell': max(occupancy, default=0),
+            'mean_per_cell': sum(occupancy) / len(occupancy) if occupancy else 0.0,
+            'pairs_tested': self.pairs_tested,
+            'pairs_found': self.pairs_found,
+            'queries': self.queries,
+        }
+
+    def reset_stats(self):
+        self.pairs_tested = 0
+        self.pairs_found = 0
+        self.queries = 0
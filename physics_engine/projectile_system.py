@@ -0,0 +1,195 @@
+#batched projectiles
+import math
+import numpy as np
+from physics_engine.tract import g
+from physics_engine.world import PhysicsWorld
+
+
+class ProjectileSystem:
+    """
+    Struct-of-arrays store for ballistic projectiles.
+
+    Uses the same equations as tract.projectile. Flight runs in a
+    PhysicsWorld ('ballistic' integrator, ground line): each landing is solved
+    when the projectile is launched and arrives as an impact event, so no
+    projectile is tested against the ground per step. Landed projectiles age
+    in one vectorized pass. Sprites keep only a slot index and read their
+    position back for drawing.
+    """
+
+    def __init__(self, capacity: int = 256, death_time: float = 3.0):
+        """
+        Parameters:
+        - capacity (int): Initial number of slots (grows by doubling)
+        - death_time (float): Seconds a landed projectile lingers before expiring
+        """
+        self.death_time = death_time
+        self._capacity = 0
+        self._high = 0  # one past the highest slot ever used
+        self._free = []
+        self.world = PhysicsWorld(integrator='ballistic', capacity=max(1, capacity))
+        self._slots = {}  # world body -> slot of the projectile it carries
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity):
+        old = self._capacity
+
+        def resized(array, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if old:
+                new[:old] = array
+            return new
+
+        self.x0 = resized(getattr(self, 'x0', None), np.float64)
+        self.y0 = resized(getattr(self, 'y0', None), np.float64)
+        self.vx = resized(getattr(self, 'vx', None), np.float64)
+        self.vy = resized(getattr(self, 'vy', None), np.float64)
+        self.t = resized(getattr(self, 't', None), np.float64)
+        self.x = resized(getattr(self, 'x', None), np.float64)
+        self.y = resized(getattr(self, 'y', None), np.float64)
+        self.death_timer = resized(getattr(self, 'death_timer', None), np.float64)
+        self.active = resized(getattr(self, 'active', None), np.bool_)  # in flight
+        self.alive = resized(getattr(self, 'alive', None), np.bool_)  # slot in use
+        self.body = resized(getattr(self, 'body', None), np.intp)  # world body while in flight
+        self.launch_time = resized(getattr(self, 'launch_time', None), np.float64)  # world time at t = 0
+
+        # Hand out low slots first so the live range stays compact
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        """Number of live (flying or landed) projectiles."""
+        return self._capacity - len(self._free)
+
+    def spawn(self, coords, speed: float, angle: float, t: float = 0.0) -> int:
+        """
+        Launch a projectile and return its slot index.
+
+        Parameters:
+        - coords (tuple): Launch (x, y)
+        - speed (float): Launch speed in pixels/s
+        - angle (float): Launch angle in degrees (screen space, y down)
+        - t (float): Starting time
+        """
+        if not self._free:
+            self._grow(self._capacity * 2)
+        i = self._free.pop()
+        self._high = max(self._high, i + 1)
+
+        rad = math.radians(angle)
+        self.x0[i], self.y0[i] = coords
+        self.vx[i] = speed * math.cos(rad)
+        self.vy[i] = speed * math.sin(rad)
+        self.t[i] = t
+        self.x[i] = self.x0[i] + self.vx[i] * t
+        self.y[i] = self.y0[i] + self.vy[i] * t + 0.5 * g * t * t
+        self.death_timer[i] = 0.0
+        self.active[i] = True
+        self.alive[i] = True
+        self._launch(i, t)
+        return i
+
+    def _launch(self, i, t):
+        # The world body starts from the arc's state at t, so its clock runs t behind
+        body = self.world.add_body((self.x[i], self.y[i]), (self.vx[i], self.vy[i] + g * t))
+        self.body[i] = body
+        self.launch_time[i] = self.world.time - t
+        self._slots[body] = i
+
+    def _land(self, i):
+        body = int(self.body[i])
+        self.world.remove_body(body)
+        del self._slots[body]
+        self.active[i] = False
+
+    def release(self, index: int):
+        """Free a slot early (e.g. the sprite was killed by something else)."""
+        if self.alive[index]:
+            if self.active[index]:
+                self._land(index)
+            self.alive[index] = False
+            self._free.append(index)
+
+    def stop(self, index: int):
+        """End a flight where it is (e.g. on a hit); the death timer then runs as after landing."""
+        if self.active[index]:
+            self._land(index)
+
+    def step(self, dt: float, ground_y: float) -> np.ndarray:
+        """
+        Advance every projectile by dt.
+
+        Flying projectiles move and stop where their arc meets ground_y (an
+        impact event from the world, exact at any dt); landed ones age and
+        expire after death_time seconds.
+
+        Returns:
+        - np.ndarray: Slot indices that expired this step (already released)
+        """
+        n = self._high
+        alive = self.alive[:n]
+        active = self.active[:n]
+
+        # Landed projectiles age first so the landing frame is not counted
+        resting = np.flatnonzero(alive & ~active)
+        expired = resting[:0]
+        if resting.size:
+            self.death_timer[resting] += dt
+            expired = resting[self.death_timer[resting] >= self.death_time]
+            if expired.size:
+                self.alive[expired] = False
+                self._free.extend(expired.tolist())
+
+        world = self.world
+        if world.ground_y != ground_y:
+            world.ground_y = ground_y  # reschedules every flight against the new line
+        for body, time, (x, y), _ in world.step(dt):
+            # Landing: the world put the body at the exact impact point and time
+            i = self._slots[body]
+            self.t[i] = time - self.launch_time[i]
+            self.x[i], self.y[i] = x, y
+            self._land(i)
+
+        flying = np.flatnonzero(active)
+        if flying.size:
+            bodies = self.body[flying]
+            self.t[flying] = world.time - self.launch_time[flying]
+            self.x[flying] = world.pos[bodies, 0]
+            self.y[flying] = world.pos[bodies, 1]
+
+        return expired
+
+    def position(self, index: int) -> tuple:
+        """Current (x, y) of a slot as plain floats."""
+        return float(self.x[index]), float(self.y[index])
+
+    def position_at(self, index: int, t: float) -> tuple:
+        """Position of a slot at time t on its unclipped arc."""
+        x = self.x0[index] + self.vx[index] * t
+        y = self.y0[index] + self.vy[index] * t + 0.5 * g * t * t
+        return float(x), float(y)
+
+    def positions_at(self, indices, t) -> tuple:
+        """Vectorized position_at: (xs, ys) arrays for slots at times t."""
+        x = self.x0[indices] + self.vx[indices] * t
+        y = self.y0[indices] + self.vy[indices] * t + 0.5 * g * t * t
+        return x, y
+
+    def landing_time(self, indices, ground_y: float) -> np.ndarray:
+        """Closed-form time at which each slot's arc reaches ground_y."""
+        vy = self.vy[indices]
+        disc = vy * vy - 2 * g * (self.y0[indices] - ground_y)
+        return (-vy + np.sqrt(np.maximum(disc, 0.0))) / g
+
+    def flying_indices(self) -> np.ndarray:
+        """Slot indices of projectiles still in flight."""
+        return np.flatnonzero(self.active[:self._high])
+
+    def live_indices(self) -> np.ndarray:
+        """Slot indices of every live projectile."""
+        return np.flatnonzero(self.alive[:self._high])
@@ -34,3 +34,8 @@ class projectile:
 		x = self.x0 + self.speed * math.cos(self.angle) * t
 		y = self.y0 + self.speed * math.sin(self.angle) * t + 0.5 * g * t**2
 		return x, y
+	def landing_time(self, ground_y):
+		# Solve y0 + vy*t + g*t^2/2 = ground_y for the later (descending) root
+		vy = self.speed * math.sin(self.angle)
+		disc = vy * vy - 2 * g * (self.y0 - ground_y)
+		return (-vy + math.sqrt(max(disc, 0.0))) / g
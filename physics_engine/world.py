@@ -0,0 +1,403 @@
+#physics world
+import heapq
+import math
+import numpy as np
+from physics_engine.tract import g
+
+INTEGRATORS = ('ballistic', 'euler', 'verlet')
+
+
+def _drag_terms(k: float, tau: float) -> tuple:
+    """(f, q, e) of the linear-drag solution x = x0 + v0*f + b*q, v = v0*e + b*f."""
+    if k > 1e-9:
+        e = math.exp(-k * tau)
+        f = (1.0 - e) / k
+        return f, (tau - f) / k, e
+    return tau, 0.5 * tau * tau, 1.0
+
+
+def _drag_terms_v(k: np.ndarray, tau: np.ndarray) -> tuple:
+    """Vectorized _drag_terms."""
+    has_drag = k > 1e-9
+    safe_k = np.where(has_drag, k, 1.0)
+    e = np.where(has_drag, np.exp(-k * tau), 1.0)
+    f = np.where(has_drag, -np.expm1(-k * tau) / safe_k, tau)
+    q = np.where(has_drag, (tau - f) / safe_k, 0.5 * tau * tau)
+    return f, q, e
+
+
+class PhysicsWorld:
+    """
+    Point bodies under gravity, linear drag and wind, with event-driven impacts.
+
+    Every body follows dv/dt = gravity + drag * (wind - v), which has a closed
+    form. When a body is launched, bounces or is pushed, its next impact with
+    the ground line or the top of a static collider is solved from that closed
+    form and pushed onto an event heap; step() pops the impacts that fall due
+    and puts the body at the exact impact point instead of testing every body
+    against the ground every frame, so impacts are as accurate at 10 FPS as at
+    240. Only awake bodies are integrated: bodies that stop bouncing fall
+    asleep where they land and cost nothing until woken.
+    """
+
+    def __init__(self, gravity=(0.0, g), ground_y: float = None, *, integrator: str = 'verlet',
+                 substeps: int = 1, drag: float = 0.0, wind=(0.0, 0.0), restitution: float = 0.0,
+                 friction: float = 0.8, sleep_speed: float = 30.0, capacity: int = 256):
+        """
+        Parameters:
+        - gravity (tuple): Acceleration in pixels/s² (tract.g downwards by default)
+        - ground_y (float): Ground line (None = no ground)
+        - integrator (str): 'ballistic' (closed form, exact), 'euler' (semi-implicit) or 'verlet' (velocity Verlet)
+        - substeps (int): Integration steps per step() call
+        - drag (float): Default linear drag coefficient per second
+        - wind (tuple): Air velocity drag pulls bodies towards, pixels/s
+        - restitution (float): Default bounce factor (0 = stick on impact)
+        - friction (float): Horizontal speed kept on a bounce
+        - sleep_speed (float): Bounces slower than this end with the body asleep
+        - capacity (int): Initial number of body slots (grows by doubling)
+        """
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"integrator must be one of {INTEGRATORS}, not {integrator!r}")
+        self.gravity = (float(gravity[0]), float(gravity[1]))
+        self._ground_y = ground_y
+        self.integrator = integrator
+        self.substeps = max(1, int(substeps))
+        self.default_drag = drag
+        self.wind = (float(wind[0]), float(wind[1]))
+        self.default_restitution = restitution
+        self.friction = friction
+        self.sleep_speed = sleep_speed
+        self.time = 0.0
+
+        self._capacity = 0
+        self._high = 0  # one past the highest slot ever used
+        self._free = []
+        self._grow(max(1, capacity))
+        self._active = np.zeros(0, dtype=np.intp)
+        self._active_dirty = False
+        self._colliders = {}  # handle -> (left, top, right)
+        self._next_collider = 0
+        self._events = []  # heap of (time, seq, body, version, target)
+        self._seq = 0
+        self.impacts = 0
+
+    def _grow(self, capacity):
+        old = self._capacity
+
+        def resized(name, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if old:
+                new[:old] = getattr(self, name)
+            return new
+
+        self.pos = resized('pos', (capacity, 2), np.float64)
+        self.vel = resized('vel', (capacity, 2), np.float64)
+        # Closed-form reference: state at origin_t, used by 'ballistic' and for impacts
+        self.origin = resized('origin', (capacity, 2), np.float64)
+        self.origin_vel = resized('origin_vel', (capacity, 2), np.float64)
+        self.origin_t = resized('origin_t', capacity, np.float64)
+        self.drag = resized('drag', capacity, np.float64)
+        self.restitution = resized('restitution', capacity, np.float64)
+        self.radius = resized('radius', capacity, np.float64)
+        self.alive = resized('alive', capacity, np.bool_)
+        self.awake = resized('awake', capacity, np.bool_)
+        self.version = resized('version', capacity, np.int64)  # bumped to invalidate scheduled events
+        # Line of the scheduled impact (inf: none); the step integrators never carry a body past it
+        self.floor = resized('floor', capacity, np.float64)
+        self.floor[old:] = np.inf
+
+        # Hand out low slots first so the live range stays compact
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    # Bodies
+    @property
+    def count(self) -> int:
+        return self._capacity - len(self._free)
+
+    @property
+    def active_count(self) -> int:
+        return len(self.active_indices())
+
+    def active_indices(self) -> np.ndarray:
+        """Slots of awake bodies (the only ones step() integrates)."""
+        if self._active_dirty:
+            self._active = np.flatnonzero(self.awake[:self._high])
+            self._active_dirty = False
+        return self._active
+
+    def add_body(self, pos, velocity=(0.0, 0.0), *, drag: float = None, restitution: float = None,
+                 radius: float = 0.0) -> int:
+        """
+        Add an awake body and schedule its first impact; returns its slot.
+
+        Parameters:
+        - pos (tuple): Position (x, y)
+        - velocity (tuple): Velocity in pixels/s
+        - drag (float): Linear drag coefficient (default: the world's)
+        - restitution (float): Bounce factor (default: the world's)
+        - radius (float): Distance from the body's position to its contact point below
+        """
+        if not self._free:
+            self._grow(self._capacity * 2)
+        i = self._free.pop()
+        self._high = max(self._high, i + 1)
+        self.pos[i] = pos
+        self.vel[i] = velocity
+        self.drag[i] = self.default_drag if drag is None else drag
+        self.restitution[i] = self.default_restitution if restitution is None else restitution
+        self.radius[i] = radius
+        self.alive[i] = True
+        self._wake(i)
+        return i
+
+    def remove_body(self, i: int):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.awake[i] = False
+            self.version[i] += 1
+            self._active_dirty = True
+            self._free.append(i)
+
+    def position(self, i: int) -> tuple:
+        return float(self.pos[i, 0]), float(self.pos[i, 1])
+
+    def velocity(self, i: int) -> tuple:
+        return float(self.vel[i, 0]), float(self.vel[i, 1])
+
+    def is_sleeping(self, i: int) -> bool:
+        return bool(self.alive[i] and not self.awake[i])
+
+    def set_position(self, i: int, pos):
+        self.pos[i] = pos
+        self._wake(i)
+
+    def set_velocity(self, i: int, velocity):
+        self.vel[i] = velocity
+        self._wake(i)
+
+    def apply_impulse(self, i: int, delta_v):
+        """Change a body's velocity by delta_v (wakes it)."""
+        self.vel[i] += delta_v
+        self._wake(i)
+
+    def _wake(self, i):
+        # The current state becomes the closed-form reference for impacts
+        self.origin[i] = self.pos[i]
+        self.origin_vel[i] = self.vel[i]
+        self.origin_t[i] = self.time
+        if not self.awake[i]:
+            self.awake[i] = True
+            self._active_dirty = True
+        self._schedule(i)
+
+    def _sleep(self, i):
+        self.vel[i] = 0.0
+        self.awake[i] = False
+        self.version[i] += 1
+        self._active_dirty = True
+
+    # Static geometry
+    @property
+    def ground_y(self):
+        return self._ground_y
+
+    @ground_y.setter
+    def ground_y(self, value):
+        self._ground_y = value
+        self._reschedule()
+
+    def add_collider(self, rect) -> int:
+        """Add a static platform; bodies land on its top edge. Returns a handle."""
+        left, top, width, _ = rect
+        handle = self._next_collider
+        self._next_collider += 1
+        self._colliders[handle] = (float(left), float(top), float(left + width))
+        self._reschedule()
+        return handle
+
+    def remove_collider(self, handle: int):
+        if self._colliders.pop(handle, None) is not None:
+            # Bodies resting on it fall again
+            for i in np.flatnonzero(self.alive[:self._high] & ~self.awake[:self._high]).tolist():
+                self._wake(i)
+            self._reschedule()
+
+    def _reschedule(self):
+        for i in self.active_indices().tolist():
+            self._wake(i)
+
+    # Closed form
+    def _state_at(self, i, t) -> tuple:
+        k = float(self.drag[i])
+        f, q, e = _drag_terms(k, t - float(self.origin_t[i]))
+        bx = self.gravity[0] + k * self.wind[0]
+        by = self.gravity[1] + k * self.wind[1]
+        (x0, y0), (vx, vy) = self.origin[i].tolist(), self.origin_vel[i].tolist()
+        return x0 + vx * f + bx * q, y0 + vy * f + by * q, vx * e + bx * f, vy * e + by * f
+
+    @staticmethod
+    def _crossing(y0, vy, by, k, line) -> float:
+        """Earliest tau >= 0 at which y reaches line while moving down, or None."""
+        if k <= 1e-9:
+            # 0.5*by*tau² + vy*tau + (y0 - line) = 0
+            c = y0 - line
+            if abs(by) < 1e-12:
+                return -c / vy if vy > 0 else None
+            disc = vy * vy - 2.0 * by * c
+            if disc < 0:
+                return None
+            root = math.sqrt(disc)
+            taus = [tau for tau in ((-vy - root) / by, (-vy + root) / by) if tau >= 0 and vy + by * tau >= 0]
+            return min(taus) if taus else None
+
+        # With drag: y rises until vy reaches 0, then descends monotonically
+        # (towards terminal speed by/k); bisect the descending stretch.
+        def y(tau):
+            f, q, _ = _drag_terms(k, tau)
+            return y0 + vy * f + by * q
+
+        terminal = by / k
+        lo = 0.0
+        if vy < 0:
+            if terminal <= 0:
+                return None
+            lo = math.log((terminal - vy) / terminal) / k  # apex
+        if terminal > 0:
+            hi = lo + 1.0
+            for _ in range(64):
+                if y(hi) >= line:
+                    break
+                hi *= 2.0
+            else:
+                return None
+        else:
+            # Moving down but slowing to a stop (wind against gravity)
+            hi = lo + 60.0 / k
+            if y(hi) < line:
+                return None
+        if y(lo) >= line:
+            return lo
+        for _ in range(64):
+            mid = 0.5 * (lo + hi)
+            if y(mid) >= line:
+                hi = mid
+            else:
+                lo = mid
+        return hi
+
+    def _schedule(self, i):
+        """Solve body i's next impact and push it onto the event heap."""
+        self.version[i] += 1
+        k = float(self.drag[i])
+        r = float(self.radius[i])
+        (x0, y0), (vx, vy) = self.origin[i].tolist(), self.origin_vel[i].tolist()
+        bx = self.gravity[0] + k * self.wind[0]
+        by = self.gravity[1] + k * self.wind[1]
+
+        lines = [] if self._ground_y is None else [(self._ground_y, None, None)]
+        lines.extend((top, handle, (left, right)) for handle, (left, top, right) in self._colliders.items())
+        best = None
+        self.floor[i] = np.inf
+        for line, target, span in lines:
+            line -= r
+            if y0 > line + 1e-6:
+                if span is not None:
+                    continue  # already below this platform top
+                tau = 0.0  # under the ground: land right away instead of falling forever
+            else:
+                tau = self._crossing(y0, vy, by, k, line)
+            if tau is None or (best is not None and tau >= best[0]):
+                continue
+            if span is not None:
+                f, q, _ = _drag_terms(k, tau)
+                if not span[0] <= x0 + vx * f + bx * q <= span[1]:
+                    continue  # passes beside the platform
+            best = (tau, target, line)
+        if best is not None:
+            self.floor[i] = best[2]
+            self._seq += 1
+            heapq.heappush(self._events, (float(self.origin_t[i]) + best[0], self._seq, i, int(self.version[i]), best[1]))
+
+    def _resolve(self, i, t, target):
+        """Put body i on the surface it hit at time t, then bounce or sleep."""
+        x, y, vx, vy = self._state_at(i, t)
+        line = self._ground_y if target is None else self._colliders[target][1]
+        self.pos[i] = (x, line - self.radius[i])
+        bounce = -vy * self.restitution[i]
+        self.impacts += 1
+        if -bounce < self.sleep_speed:
+            self._sleep(i)
+            return
+        self.vel[i] = (vx * self.friction, bounce)
+        saved, self.time = self.time, t
+        self._wake(i)
+        self.time = saved
+
+    # Simulation
+    def _acceleration(self, idx, vel):
+        acc = np.empty_like(vel)
+        k = self.drag[idx]
+        acc[:, 0] = self.gravity[0] + k * (self.wind[0] - vel[:, 0])
+        acc[:, 1] = self.gravity[1] + k * (self.wind[1] - vel[:, 1])
+        return acc
+
+    def _integrate(self, t1, h, resumed):
+        idx = self.active_indices()
+        if not idx.size:
+            return
+        if self.integrator == 'ballistic':
+            k = self.drag[idx]
+            f, q, e = _drag_terms_v(k, t1 - self.origin_t[idx])
+            b = np.column_stack((self.gravity[0] + k * self.wind[0], self.gravity[1] + k * self.wind[1]))
+            v0 = self.origin_vel[idx]
+            self.pos[idx] = self.origin[idx] + v0 * f[:, None] + b * q[:, None]
+            self.vel[idx] = v0 * e[:, None] + b * f[:, None]
+            return
+
+        dt = np.full((len(idx), 1), h)
+        if resumed:
+            # Bodies that bounced this substep only integrate from their impact
+            bodies = np.fromiter(resumed, dtype=np.intp, count=len(resumed))
+            dt[np.searchsorted(idx, bodies), 0] = t1 - np.fromiter(resumed.values(), dtype=np.float64, count=len(resumed))
+        pos = self.pos[idx]
+        vel = self.vel[idx]
+        acc = self._acceleration(idx, vel)
+        if self.integrator == 'euler':
+            vel += acc * dt
+            pos += vel * dt
+        else:
+            pos += vel * dt + 0.5 * acc * dt * dt
+            vel += 0.5 * (acc + self._acceleration(idx, vel + acc * dt)) * dt
+        # The closed form decides when the impact happens; until it pops, a body
+        # that got ahead of it waits on the impact line instead of sinking through
+        np.minimum(pos[:, 1], self.floor[idx], out=pos[:, 1])
+        self.pos[idx] = pos
+        self.vel[idx] = vel
+
+    def step(self, dt: float) -> list:
+        """
+        Advance the world by dt in `substeps` steps.
+
+        Returns:
+        - list: (body, time, (x, y), target) for every impact resolved; target
+          is None for the ground or a collider handle
+        """
+        impacts = []
+        h = dt / self.substeps
+        events = self._events
+        for _ in range(self.substeps):
+            t1 = self.time + h
+            resumed = {}
+            while events and events[0][0] <= t1:
+                t, _, i, version, target = heapq.heappop(events)
+                if version != self.version[i] or (target is not None and target not in self._colliders):
+                    continue  # stale: the body was pushed, removed or already rescheduled
+                self._resolve(i, t, target)
+                impacts.append((i, t, self.position(i), target))
+                resumed.pop(i, None)
+                if self.awake[i]:
+                    resumed[i] = t
+            self._integrate(t1, h, resumed)
+            self.time = t1
+        return impacts
@@ -1,31 +1,89 @@
 import pygame
+from renderer.profiler import RingBuffer
+from renderer.UI.fonts import get_font
+from renderer.UI.text_atlas import TextRenderer
 
 class FrameRateDisplay:
-    def __init__(self, font_name="Arial", font_size=30, max_samples=10, color=(255, 255, 255), pos_fps=(10, 10), pos_time=(10, 40)):
-        pygame.font.init()
-        self.font = pygame.font.SysFont(font_name, font_size)
+    def __init__(self, font_name="Arial", font_size=30, max_samples=10, color=(255, 255, 255), pos_fps=(10, 10), pos_time=(10, 40),
+                 profiler=None, refresh_ms=250, graph=True, graph_size=(160, 40), budget_ms=1000 / 60):
+        """
+        FPS / frame-time HUD.
+
+        Args:
+            max_samples: Frames averaged for the frame time readout
+            profiler: Optional FrameProfiler whose stage p95s are listed under the frame time
+            refresh_ms: Minimum time between text updates; text is only re-rendered when it changes
+            graph: Draw a scrolling frame-time graph (budget line at budget_ms)
+            graph_size: (width, height) of the graph in pixels
+        """
+        self.font = get_font(font_name, font_size)
+        # Readouts are composed from pre-baked glyphs (digits included), never font.render
+        self.text = TextRenderer(self.font, cache_size=0)
         self.color = color
         self.pos_fps = pos_fps
         self.pos_time = pos_time
-        self.frame_times = []
+        self.frame_times = RingBuffer(max_samples)
         self.max_samples = max_samples
+        self.profiler = profiler
+        self.refresh_ms = refresh_ms
+        self.budget_ms = budget_ms
+
+        self._texts = {}  # slot -> (string, rendered surface)
+        self._last_refresh = None
+        self._lines = []
+
+        self.graph = None
+        if graph:
+            self.graph = pygame.Surface(graph_size, pygame.SRCALPHA)
+            self.graph.fill((0, 0, 0, 120))
+
+    def _text(self, slot, string):
+        cached = self._texts.get(slot)
+        if cached is None or cached[0] != string:
+            cached = self._texts[slot] = (string, self.text.atlas(self.color).render(string))
+        return cached[1]
+
+    def _plot(self, elapsed_time):
+        # Scroll one column left and draw the newest frame time on the right edge
+        width, height = self.graph.get_size()
+        self.graph.scroll(-1, 0)
+        self.graph.fill((0, 0, 0, 120), (width - 1, 0, 1, height))
+        scale = height / (self.budget_ms * 2)
+        bar = min(height, int(elapsed_time * scale))
+        color = (255, 80, 80) if elapsed_time > self.budget_ms else (80, 255, 120)
+        if bar:
+            self.graph.fill(color, (width - 1, height - bar, 1, bar))
+        budget_y = height - int(self.budget_ms * scale)
+        self.graph.fill((255, 255, 0), (width - 1, budget_y, 1, 1))
 
     def draw(self, surface, clock):
         fps = clock.get_fps() or 60  # fallback to 60 if zero
         elapsed_time = clock.get_time()
 
         self.frame_times.append(elapsed_time)
-        if len(self.frame_times) > self.max_samples:
-            self.frame_times.pop(0)
-
-        avg_time = sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0
-        rounded_time = self._round_to_nearest_even(avg_time)
+        if self.graph is not None:
+            self._plot(elapsed_time)
 
-        fps_text = self.font.render(f"FPS: {fps:.2f}", True, self.color)
-        time_text = self.font.render(f"Frame Time: {rounded_time} ms", True, self.color)
+        now = pygame.time.get_ticks()
+        if self._last_refresh is None or now - self._last_refresh >= self.refresh_ms:
+            self._last_refresh = now
+            rounded_time = self._round_to_nearest_even(self.frame_times.mean())
+            lines = [f"FPS: {fps:.2f}", f"Frame Time: {rounded_time} ms"]
+            if self.profiler is not None:
+                for name, buffer in self.profiler.stages.items():
+                    lines.append(f"{name}: {buffer.percentile(95):.2f} ms p95")
+            self._lines = lines
 
-        surface.blit(fps_text, self.pos_fps)
-        surface.blit(time_text, self.pos_time)
+        rects = [surface.blit(self._text(0, self._lines[0]), self.pos_fps),
+                 surface.blit(self._text(1, self._lines[1]), self.pos_time)]
+        line_height = self.pos_time[1] - self.pos_fps[1]
+        y = self.pos_time[1] + line_height
+        for slot, line in enumerate(self._lines[2:], start=2):
+            rects.append(surface.blit(self._text(slot, line), (self.pos_time[0], y)))
+            y += line_height
+        if self.graph is not None:
+            rects.append(surface.blit(self.graph, (self.pos_time[0], y)))
+        return rects
 
     def _round_to_nearest_even(self, number):
         rounded = round(number)
@@ -1,10 +1,108 @@
 import pygame; import math
+import threading
+from collections import OrderedDict
+import numpy as np
+
+#light mask cache: every gradient mask and beam is built once per key
+FALLOFF_CURVES = {
+    'linear': lambda t: t,
+    'quadratic': lambda t: t * t,
+    'sqrt': np.sqrt,
+    'smoothstep': lambda t: t * t * (3 - 2 * t),
+}
+
+_mask_cache = OrderedDict()
+_mask_cache_limit = 128
+_mask_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+_mask_cache_lock = threading.Lock()  # scenes may warm the cache from a preload thread
+
+
+def _cached_mask(key, build):
+    """Return the mask for key, building and storing it on a miss (LRU bounded)."""
+    with _mask_cache_lock:
+        mask = _mask_cache.get(key)
+        if mask is not None:
+            _mask_cache.move_to_end(key)
+            _mask_cache_stats['hits'] += 1
+            return mask
+        _mask_cache_stats['misses'] += 1
+    # Built outside the lock; two threads racing on one key both build, one wins
+    mask = build()
+    with _mask_cache_lock:
+        mask = _mask_cache.setdefault(key, mask)
+        while len(_mask_cache) > _mask_cache_limit:
+            _mask_cache.popitem(last=False)
+            _mask_cache_stats['evictions'] += 1
+    return mask
+
+
+def _falloff_levels(steps, alpha, falloff):
+    """Alpha value of each gradient layer, outermost (i = 0) first."""
+    curve = FALLOFF_CURVES[falloff] if isinstance(falloff, str) else falloff
+    t = np.arange(steps) / steps
+    return (np.clip(curve(t), 0.0, 1.0) * (alpha / 100) * 255).astype(np.uint8)
+
+
+def _mask_surface(size, alpha_levels, layer):
+    """Black SRCALPHA surface whose alpha is alpha_levels[layer] (layer < 0 -> clear)."""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 0))
+    pixels = pygame.surfarray.pixels_alpha(surface)
+    pixels[...] = np.where(layer >= 0, alpha_levels[np.maximum(layer, 0)], 0)
+    del pixels  # unlock the surface
+    return surface
+
+
+def set_light_cache_size(limit: int):
+    """Set how many masks/beams the light cache keeps (least recently used go first)."""
+    global _mask_cache_limit
+    with _mask_cache_lock:
+        _mask_cache_limit = max(1, limit)
+        while len(_mask_cache) > _mask_cache_limit:
+            _mask_cache.popitem(last=False)
+            _mask_cache_stats['evictions'] += 1
+
+
+def light_cache_stats() -> dict:
+    """Return light cache hits/misses/evictions and its current size."""
+    return dict(_mask_cache_stats, entries=len(_mask_cache), limit=_mask_cache_limit)
+
+
+def add_light_masks(masks):
+    """
+    Put prebuilt masks into the light cache, e.g. from a baked asset archive.
+
+    Parameters:
+    - masks: Iterable of (key, surface); keys as returned by circle_mask_key() and SpotLight.beam_key()
+    """
+    with _mask_cache_lock:
+        for key, mask in masks:
+            _mask_cache[key] = mask
+            _mask_cache.move_to_end(key)
+        while len(_mask_cache) > _mask_cache_limit:
+            _mask_cache.popitem(last=False)
+            _mask_cache_stats['evictions'] += 1
+
+
+def warm_up_light_masks(specs):
+    """
+    Build circle masks ahead of time, e.g. from a scene's load().
+
+    Parameters:
+    - specs: Iterable of (radius, steps, alpha) or (radius, steps, alpha, falloff)
+    """
+    for spec in specs:
+        circle_light_mask(*spec)
+
 #spotlights
 class SpotLight:
     """
     Represents a SpotLight effect beam using elliptical gradient rendering.
     """
 
+    # Baked angle counts per quality preset (see bake())
+    BAKE_QUALITY = {'low': 32, 'medium': 64, 'high': 128, 'ultra': 360}
+
     def __init__(self, *, angle: float = None, beam_surface_size: tuple = None, display_surface: tuple=None):
         """
         Initialize the SpotLight effect with optional angle (in degrees) and beam size.
@@ -20,6 +118,7 @@ class SpotLight:
         self._width, self._height = self._screen
         self._beam_surface_size = beam_surface_size or (2 * self._width / 3, self._height / 2)
         self._angle_rad = math.pi / 3 if angle is None else angle * math.pi / 180
+        self._baked = None  # baked sheet state, see bake()
 
     @property
     def angle(self) -> float:
@@ -42,6 +141,29 @@ class SpotLight:
         angle_rad = math.atan2(vector.y, vector.x)
         return math.degrees(angle_rad)
 
+    def _beam_layers(self, steps):
+        """
+        Index of the innermost beam layer covering each pixel (-1 if none).
+
+        Layer i is the elliptical sector drawn by _draw_ellipse_points with
+        angle self._angle_rad - i / steps, computed for all pixels at once.
+        """
+        x, y = self._beam_surface_size
+        width, height = int(x), int(y)
+        px = np.arange(width, dtype=np.float64)[:, None]
+        py = np.arange(height, dtype=np.float64)[None, :]
+        u = px / x
+        v = (py - y / 2) / y
+        spread = 2 * np.abs(np.arctan2(v, u))
+        inside = (u * u + v * v) <= 1.0
+
+        # Layers narrow as i grows: the widest one still covering the pixel wins
+        layer = np.minimum(np.floor((self._angle_rad - spread) * steps), steps - 1)
+        # Past i/steps > angle the sectors widen again (mirrored), so the last layer may cover it
+        mirrored = (steps - 1) >= np.ceil((self._angle_rad + spread) * steps)
+        layer = np.where(mirrored, steps - 1, layer)
+        return np.where(inside & (layer >= 0), layer, -1).astype(np.int64)
+
     def _draw_ellipse_points(self, surface, color: tuple, angle: float):
         """
         Draw a polygonal approximation of an elliptical beam.
@@ -64,6 +186,10 @@ class SpotLight:
 
         pygame.draw.polygon(surface, color, [center] + points)
 
+    def beam_key(self, *, alpha: int = 90, steps: int = 90) -> tuple:
+        """Light cache key of create_beam(alpha=alpha, steps=steps) for this beam size and angle."""
+        return ('beam', self._beam_surface_size, self._angle_rad, alpha, steps)
+
     def create_beam(self, *, alpha: int = 90, steps: int = 90, debug: bool = False) -> pygame.Surface:
         """
         Create the SpotLight effect beam as a surface.
@@ -79,18 +205,15 @@ class SpotLight:
         if not isinstance(debug, bool):
             raise TypeError('debug must be a boolean')
 
-        beam_surface = pygame.Surface(self._beam_surface_size, pygame.SRCALPHA)
-        x, y=beam_surface.get_size()
         if debug:
+            beam_surface = pygame.Surface(self._beam_surface_size, pygame.SRCALPHA)
             beam_surface.fill((255, 255, 0, 255))  # Debug yellow
             return beam_surface
 
-        for i in range(steps):
-            alpha_value = int((i / steps) * (alpha / 100) * 255)
-            color = (0, 0, 0, alpha_value)
-            self._draw_ellipse_points(beam_surface, color, self._angle_rad - (i / steps))
-            
-        return beam_surface
+        key = self.beam_key(alpha=alpha, steps=steps)
+        size = (int(self._beam_surface_size[0]), int(self._beam_surface_size[1]))
+        return _cached_mask(key, lambda: _mask_surface(size, _falloff_levels(steps, alpha, 'linear'),
+                                                       self._beam_layers(steps)))
 
     def draw(self, surface: pygame.Surface, pos, target, rotation: float = 0):
         """
@@ -105,26 +228,127 @@ class SpotLight:
         Returns:
         - (rotated_image, rotated_rect): Beam image and its rect
         """
-        center = surface.get_rect().center
         orbit_radius = self._width / 3
         angle_to_target = self._calculate_angle(pos, target)
 
         offset_x = orbit_radius * math.cos(math.radians(angle_to_target))
         offset_y = orbit_radius * math.sin(math.radians(angle_to_target))
 
+        baked = self._baked
+        if baked is not None and surface is baked['source']:
+            rotated_image, (dx, dy) = self._baked_frame(rotation - angle_to_target)
+            rotated_rect = rotated_image.get_rect()
+            rotated_rect.center = (pos.x + offset_x + dx, pos.y + offset_y + dy)
+            return rotated_image, rotated_rect
+
         rotated_image = pygame.transform.rotate(surface, rotation - angle_to_target)
         rotated_rect = rotated_image.get_rect()
         rotated_rect.center = (pos.x + offset_x, pos.y + offset_y)
 
         return rotated_image, rotated_rect
 
+    def bake(self, surface: pygame.Surface, *, angle_steps: int = None, quality: str = 'medium',
+             lazy: bool = True, rotozoom: bool = False, crop: bool = True):
+        """
+        Pre-rotate a beam surface at evenly spaced angles so draw() can skip
+        pygame.transform.rotate and return the nearest baked frame instead.
+
+        Parameters:
+        - surface (pygame.Surface): Beam surface (from create_beam) passed to draw()
+        - angle_steps (int): Number of baked angles; overrides quality
+        - quality (str): Key of BAKE_QUALITY; more angles = smoother but more memory
+        - lazy (bool): Bake each angle on first use instead of all at once
+        - rotozoom (bool): Bake with the filtered pygame.transform.rotozoom
+        - crop (bool): Trim transparent borders of each frame to save memory
+        """
+        steps = angle_steps or self.BAKE_QUALITY[quality]
+        if steps < 1:
+            raise ValueError('angle_steps must be at least 1')
+        self._baked = {
+            'source': surface, 'steps': steps, 'rotozoom': rotozoom, 'crop': crop,
+            'frames': [None] * steps, 'bytes': 0, 'hits': 0, 'misses': 0,
+        }
+        if not lazy:
+            for i in range(steps):
+                self._bake_frame(i)
+
+    def unbake(self):
+        """Drop the baked sheet; draw() rotates in real time again."""
+        self._baked = None
+
+    def _bake_frame(self, index):
+        baked = self._baked
+        angle = index * 360 / baked['steps']
+        if baked['rotozoom']:
+            image = pygame.transform.rotozoom(baked['source'], angle, 1)
+        else:
+            image = pygame.transform.rotate(baked['source'], angle)
+
+        # Offset of the kept area's center from the full rotated image's center
+        offset = (0, 0)
+        if baked['crop']:
+            bounds = image.get_bounding_rect()
+            if bounds.width and bounds.height:
+                full_center = image.get_rect().center
+                offset = (bounds.centerx - full_center[0], bounds.centery - full_center[1])
+                image = image.subsurface(bounds).copy()
+
+        baked['frames'][index] = (image, offset)
+        baked['bytes'] += image.get_pitch() * image.get_height()
+        return baked['frames'][index]
+
+    def _baked_frame(self, angle):
+        baked = self._baked
+        steps = baked['steps']
+        index = round((angle % 360) * steps / 360) % steps
+        frame = baked['frames'][index]
+        if frame is None:
+            baked['misses'] += 1
+            return self._bake_frame(index)
+        baked['hits'] += 1
+        return frame
+
+    def bake_stats(self) -> dict:
+        """Return baked frame count, memory use and lookup hits/misses (empty if not baked)."""
+        baked = self._baked
+        if baked is None:
+            return {}
+        return {
+            'angle_steps': baked['steps'],
+            'step_degrees': 360 / baked['steps'],
+            'frames_baked': sum(frame is not None for frame in baked['frames']),
+            'bytes': baked['bytes'],
+            'hits': baked['hits'],
+            'misses': baked['misses'],
+        }
+
 #circle_light_mask
-def circle_light_mask(radius, steps, alpha):
-    #making the mask
-    light_mask = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-    #updating the mask with Gradient
-    for i in range(steps):
-        alpha_value = int((i / steps) * (alpha / 100) * 255)
-        color = (0, 0, 0, alpha_value)
-        pygame.draw.circle(light_mask, color, (radius, radius), radius - (radius * i // steps))
-    return light_mask
+def circle_light_mask(radius, steps, alpha, falloff='linear'):
+    """
+    Radial gradient mask (black, alpha rising towards the center).
+
+    The returned surface is cached and shared: blit it, never draw on it.
+
+    Parameters:
+    - radius (int): Mask radius in pixels
+    - steps (int): Number of gradient rings
+    - alpha (int): Maximum intensity (0-100)
+    - falloff (str | callable): Key of FALLOFF_CURVES or f(t) for t in [0, 1)
+    """
+    return _cached_mask(circle_mask_key(radius, steps, alpha, falloff),
+                        lambda: _build_circle_mask(radius, steps, alpha, falloff))
+
+
+def circle_mask_key(radius, steps, alpha, falloff='linear') -> tuple:
+    """Light cache key of circle_light_mask(radius, steps, alpha, falloff)."""
+    return ('circle', radius, steps, alpha, falloff)
+
+
+def _build_circle_mask(radius, steps, alpha, falloff):
+    # Ring i has radius r_i = radius - radius*i//steps; a pixel takes the innermost ring covering it
+    ring_radius = radius - (radius * np.arange(steps)) // steps
+    # Distance from each pixel center; the small bias tracks pygame.draw.circle's rasterization
+    offset = np.arange(radius * 2) + 0.5 - radius
+    d = np.hypot(offset[:, None], offset[None, :]) + 0.2
+    layer = np.searchsorted(-ring_radius, -d, side='right') - 1
+    return _mask_surface((radius * 2, radius * 2), _falloff_levels(steps, alpha, falloff), layer)
@@ -1,6 +1,8 @@
 import pygame
+from renderer.UI.fonts import get_font
+from renderer.UI.tamplate import Widget
 
-class Button(pygame.sprite.Sprite):
+class Button(Widget):
     def __init__(self, color, width, height, pos, text="", font_size=20,
                  text_color=(255, 255, 255, 255),
                  hover_color=None, click_color=None,
@@ -9,7 +11,7 @@ class Button(pygame.sprite.Sprite):
                  border_width=0,
                  fancy_text=None,
                  click_callback=None):
-        pygame.sprite.Sprite.__init__(self)
+        Widget.__init__(self)
 
         # Colors
         self.normal_color = color
@@ -25,29 +27,27 @@ class Button(pygame.sprite.Sprite):
         self.border_width = border_width
 
         # Position and size
-        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=pos)
+        self.size = (width, height)
+        self.rect = pygame.Rect((0, 0), self.size)
+        self.rect.center = pos
 
         # Text
         self.text = text
         self.font_size = font_size
-        self.font = pygame.font.SysFont(None, self.font_size)
+        self.font = get_font(None, self.font_size)
 
         self.text_color_normal = text_color
         self.text_color_hover = hover_text_color if hover_text_color is not None else text_color
         self.text_color_click = click_text_color if click_text_color is not None else text_color
         self.current_text_color = self.text_color_normal
 
-        # States
-        self.is_hovered = False
-        self.is_clicked = False
-
         # Fancy text renderer (optional)
         self.fancy_text = fancy_text
 
         # Callback
         self.click_callback = click_callback
-        self._render_button()
+        # Every state is rendered once; hover/click only swap image
+        self.prerender()
 
     def _brighten_color(self, color, factor=0.2):
         return tuple(min(255, int(c + (255 - c) * factor)) for c in color[:3]) + ((color[3],) if len(color) == 4 else (255,))
@@ -55,77 +55,67 @@ class Button(pygame.sprite.Sprite):
     def _darken_color(self, color, factor=0.2):
         return tuple(max(0, int(c * (1 - factor))) for c in color[:3]) + ((color[3],) if len(color) == 4 else (255,))
 
-    def _render_button(self):
-        self.image.fill((0, 0, 0, 0))  # Clear transparent
+    def _state_colors(self, state):
+        if state == 'click':
+            return self.click_color, self.text_color_click, self.click_border_color
+        if state == 'hover':
+            return self.hover_color, self.text_color_hover, self.hover_border_color
+        return self.normal_color, self.text_color_normal, self.border_color
+
+    def _apply_state(self):
+        self.current_color, self.current_text_color, self.current_border_color = self._state_colors(self.state)
+        Widget._apply_state(self)
+
+    def render_state(self, state):
+        color, text_color, border_color = self._state_colors(state)
+        image = pygame.Surface(self.size, pygame.SRCALPHA)  # transparent
 
         # Background fill if alpha > 0
-        if len(self.current_color) == 4 and self.current_color[3] > 0:
-            bg_surf = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-            bg_surf.fill(self.current_color)
-            self.image.blit(bg_surf, (0, 0))
-        elif len(self.current_color) == 3:
-            self.image.fill(self.current_color)
+        if len(color) == 3 or color[3] > 0:
+            image.fill(color)
 
         # Draw border if visible
         if self.border_width > 0:
-            alpha = self.current_border_color[3] if len(self.current_border_color) == 4 else 255
+            alpha = border_color[3] if len(border_color) == 4 else 255
             if alpha > 0:
-                border_surf = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-                pygame.draw.rect(border_surf, self.current_border_color, border_surf.get_rect(), self.border_width)
-                self.image.blit(border_surf, (0, 0))
+                border_surf = pygame.Surface(self.size, pygame.SRCALPHA)
+                pygame.draw.rect(border_surf, border_color, border_surf.get_rect(), self.border_width)
+                image.blit(border_surf, (0, 0))
 
         # Render text if visible
         if self.text:
-            alpha = self.current_text_color[3] if len(self.current_text_color) == 4 else 255
+            alpha = text_color[3] if len(text_color) == 4 else 255
             if alpha > 0:
                 if self.fancy_text:
-                    text_surf = self.fancy_text.render(self.text, self.current_text_color)
+                    text_surf = self.fancy_text.render(self.text, text_color)
                 else:
-                    text_surf = self.font.render(self.text, True, self.current_text_color)
-                text_rect = text_surf.get_rect(center=self.image.get_rect().center)
+                    text_surf = self.font.render(self.text, True, text_color)
+                text_rect = text_surf.get_rect(center=image.get_rect().center)
 
                 # If fully transparent background, resize button to text size
                 if self.normal_color == (0, 0, 0, 0):
-                    self.image = pygame.Surface(text_surf.get_size(), pygame.SRCALPHA)
-                    self.rect = self.image.get_rect(center=self.rect.center)
-                    self.image.blit(text_surf, (0, 0))
+                    image = pygame.Surface(text_surf.get_size(), pygame.SRCALPHA)
+                    image.blit(text_surf, (0, 0))
                 else:
-                    self.image.blit(text_surf, text_rect)
+                    image.blit(text_surf, text_rect)
+        return image
 
     def update(self, events):
+        # Standalone use; under a UIManager events are routed by hit testing instead
         mouse_pos = pygame.mouse.get_pos()
         was_clicked = False
 
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.rect.collidepoint(event.pos):
-                    self.is_clicked = True
-                    self.current_color = self.click_color
-                    self.current_text_color = self.text_color_click
-                    self.current_border_color = self.click_border_color
-                    self._render_button()
+                    self.set_state(clicked=True)
 
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 if self.rect.collidepoint(event.pos) and self.is_clicked:
                     was_clicked = True
-                self.is_clicked = False
-
-        is_hovering = self.rect.collidepoint(mouse_pos)
-        if is_hovering != self.is_hovered or was_clicked:
-            self.is_hovered = is_hovering
-            if self.is_clicked:
-                self.current_color = self.click_color
-                self.current_text_color = self.text_color_click
-                self.current_border_color = self.click_border_color
-            elif self.is_hovered:
-                self.current_color = self.hover_color
-                self.current_text_color = self.text_color_hover
-                self.current_border_color = self.hover_border_color
-            else:
-                self.current_color = self.normal_color
-                self.current_text_color = self.text_color_normal
-                self.current_border_color = self.border_color
-            self._render_button()
+                self.set_state(clicked=False)
+
+        self.set_state(hovered=self.rect.collidepoint(mouse_pos))
 
         if was_clicked:
             self.handle_click()
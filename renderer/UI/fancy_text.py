@@ -1,6 +1,6 @@
 # fancy_text.py
-import pygame
-import os
+from renderer.UI.fonts import get_font
+from renderer.UI.text_atlas import TextRenderer
 
 class FancyText:
     def __init__(self, font=None, font_size=20, font_path=None):
@@ -12,30 +12,18 @@ class FancyText:
             font_size: Font size in points
             font_path: Path to a .ttf/.otf font file (takes priority)
         """
-        if font_path and os.path.exists(font_path):
-            self.font = pygame.font.Font(font_path, font_size)
-        else:
-            self.font = pygame.font.SysFont(font, font_size)
+        self.font = get_font(font, font_size, path=font_path or None)
+        self.text = TextRenderer(self.font)
 
     def render(self, text, text_color=(255, 255, 255), outline_color=None, outline_thickness=2):
-        """Render text with optional outline (stroke) effect."""
-        base = self.font.render(text, True, text_color)
-
-        if outline_color:
-            outline = pygame.Surface(
-                (base.get_width() + 2 * outline_thickness, base.get_height() + 2 * outline_thickness),
-                pygame.SRCALPHA
-            )
+        """
+        Render text with optional outline (stroke) effect.
 
-            for dx in range(-outline_thickness, outline_thickness + 1):
-                for dy in range(-outline_thickness, outline_thickness + 1):
-                    if dx != 0 or dy != 0:
-                        outline.blit(
-                            self.font.render(text, True, outline_color),
-                            (dx + outline_thickness, dy + outline_thickness)
-                        )
+        Strings are composed from a glyph atlas and cached, so the returned
+        surface is shared: blit it, do not draw on it.
+        """
+        return self.text.render(text, text_color, outline_color or None, outline_thickness)
 
-            outline.blit(base, (outline_thickness, outline_thickness))
-            return outline
-        else:
-            return base
+    def draw(self, surface, text, pos, text_color=(255, 255, 255), outline_color=None, outline_thickness=2):
+        """Draw text straight onto surface without caching (for text that changes every frame)."""
+        return self.text.draw(surface, text, pos, text_color, outline_color or None, outline_thickness)
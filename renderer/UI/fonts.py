@@ -0,0 +1,87 @@
+#font cache: system font names resolved once per machine, one Font object per (path, size)
+import json
+import os
+import threading
+import pygame
+from system.startup import timeline
+
+# Resolved font files survive restarts here; delete the file to rescan after installing fonts
+CACHE_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                          'pygame-micro-engine', 'fonts.json')
+
+_fonts = {}  # (path, size) -> pygame.font.Font
+_paths = None  # system font name -> file (None: not installed, pygame's default font is used)
+_lock = threading.Lock()
+
+
+def _load_paths():
+    global _paths
+    if _paths is None:
+        try:
+            with open(CACHE_PATH) as file:
+                _paths = json.load(file)
+        except (OSError, ValueError):
+            _paths = {}
+    return _paths
+
+
+def _save_paths():
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH + '.tmp', 'w') as file:
+            json.dump(_paths, file, indent=1, sort_keys=True)
+        os.replace(CACHE_PATH + '.tmp', CACHE_PATH)
+    except OSError:
+        pass  # a read-only home only costs the rescan next time
+
+
+def font_path(name) -> str:
+    """
+    File pygame.font.SysFont(name) would load, or None for pygame's default font.
+
+    The first lookup of a name scans the system fonts (fc-list on Linux);
+    the result is kept in CACHE_PATH so later runs skip the scan.
+
+    Parameters:
+    - name (str | list): System font name(s), as for SysFont; None means the default font
+    """
+    if not name:
+        return None
+    key = name if isinstance(name, str) else ','.join(name)
+    with _lock:
+        paths = _load_paths()
+        if key in paths and (paths[key] is None or os.path.exists(paths[key])):
+            return paths[key]
+    with timeline.phase(f'font scan {key}'):
+        path = pygame.font.match_font(name)
+    with _lock:
+        _paths[key] = path
+        _save_paths()
+    return path
+
+
+def get_font(name=None, size: int = 20, path: str = None) -> pygame.font.Font:
+    """
+    Shared Font for a system font name (or a font file) at size.
+
+    Every widget asking for the same file and size gets the same object, so
+    do not change its style (set_bold, set_italic, ...) in place.
+
+    Parameters:
+    - name (str): System font name; None uses pygame's default font
+    - size (int): Font size in points
+    - path (str): Font file; takes priority over name when it exists
+    """
+    if path is None or not os.path.exists(path):
+        path = font_path(name)
+    key = (path, size)
+    with _lock:
+        font = _fonts.get(key)
+    if font is not None:
+        return font
+    with timeline.phase(f'font {os.path.basename(path) if path else "default"} {size}'):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.Font(path, size)
+    with _lock:
+        return _fonts.setdefault(key, font)
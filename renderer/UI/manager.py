@@ -0,0 +1,122 @@
+# manager.py
+import pygame
+from physics_engine.collision import SpatialHash
+from renderer.group_overide import merge_dirty_rects
+
+
+class UIManager:
+    """
+    Retained-mode UI: widgets are composited into one cached layer.
+
+    The layer is only recomposited where a widget changed state, moved, or
+    was added/removed, so a static screen costs one blit however many widgets
+    it holds. Pointer events go through a spatial index and reach only the
+    topmost widget under the cursor.
+    """
+
+    def __init__(self, size, cell_size=64):
+        """
+        Args:
+            size: (width, height) of the UI layer, usually the screen size
+            cell_size: Spatial index cell size in pixels
+        """
+        self.layer = pygame.Surface(size, pygame.SRCALPHA)
+        self.index = SpatialHash(cell_size)
+        self.widgets = []  # draw order, topmost last
+        self._z = {}
+        self._dirty = []  # layer areas to recomposite
+        self.bounds = None  # union of widget rects (what draw() blits)
+        self.version = 0  # bumped on every recomposite, for change detection
+        self.hovered = None
+        self.pressed = None
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        self._z[widget] = len(self.widgets) - 1
+        widget.manager = self
+        self.index.insert(widget, widget.rect)
+        self._dirty.append(pygame.Rect(widget.rect))
+        self._update_bounds()
+        return widget
+
+    def remove(self, widget):
+        if widget not in self._z:
+            return
+        self._dirty.append(self.index.rect_of(widget))
+        self.index.remove(widget)
+        self.widgets.remove(widget)
+        self._z = {w: z for z, w in enumerate(self.widgets)}
+        widget.manager = None
+        if self.hovered is widget:
+            self.hovered = None
+        if self.pressed is widget:
+            self.pressed = None
+        self._update_bounds()
+
+    def refresh(self, widget):
+        """Re-index and repaint a widget after its image or rect changed outside the manager."""
+        old = self.index.rect_of(widget)
+        self.index.move(widget, widget.rect)
+        self._dirty.append(old)
+        self._dirty.append(pygame.Rect(widget.rect))
+        if old != widget.rect:
+            self._update_bounds()
+
+    def _update_bounds(self):
+        self.bounds = self.widgets[0].rect.unionall([w.rect for w in self.widgets[1:]]) if self.widgets else None
+
+    def widget_at(self, pos):
+        """Topmost widget whose rect contains pos, or None."""
+        hits = self.index.query_point(pos)
+        return max(hits, key=self._z.__getitem__) if hits else None
+
+    def _set_state(self, widget, **state):
+        if widget is not None and widget.set_state(**state):
+            self.refresh(widget)
+
+    def _hover(self, widget):
+        if widget is not self.hovered:
+            self._set_state(self.hovered, hovered=False)
+            self._set_state(widget, hovered=True)
+            self.hovered = widget
+
+    def handle_events(self, events):
+        """Route pointer events to the widget under the cursor (one index lookup per event)."""
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                self._hover(self.widget_at(event.pos))
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                widget = self.widget_at(event.pos)
+                self._hover(widget)
+                self.pressed = widget
+                self._set_state(widget, clicked=True)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                widget = self.widget_at(event.pos)
+                pressed, self.pressed = self.pressed, None
+                self._set_state(pressed, clicked=False)
+                self._hover(widget)
+                if pressed is not None and pressed is widget:
+                    widget.handle_click()
+
+    def compose(self):
+        """Recomposite the changed areas of the layer; returns them."""
+        if not self._dirty:
+            return []
+        # Merged areas are disjoint, so the threshold can never trigger a full redraw
+        areas = merge_dirty_rects(self._dirty, self.layer.get_rect(), threshold=1.0)
+        self._dirty = []
+        for area in areas:
+            self.layer.fill((0, 0, 0, 0), area)
+            self.layer.set_clip(area)
+            for widget in sorted(self.index.query_rect(area), key=self._z.__getitem__):
+                widget.draw(self.layer)
+            self.layer.set_clip(None)
+        self.version += 1
+        return areas
+
+    def draw(self, surface, special_flags=0):
+        """Blit the cached layer (recomposited first if needed); returns the blitted rect."""
+        self.compose()
+        if self.bounds is None:
+            return pygame.Rect(0, 0, 0, 0)
+        return surface.blit(self.layer, self.bounds.topleft, self.bounds, special_flags=special_flags)
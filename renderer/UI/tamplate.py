@@ -0,0 +1,61 @@
+# tamplate.py
+from abc import ABC, abstractmethod
+import pygame
+
+class Widget(pygame.sprite.Sprite, ABC):
+    """
+    Template for retained UI widgets.
+
+    Subclasses implement render_state(state) for 'normal', 'hover' and
+    'click'; prerender() builds each state image once and state changes
+    only swap image. A UIManager dispatches pointer events and composites
+    the widget into its cached layer.
+    """
+    STATES = ('normal', 'hover', 'click')
+
+    def __init__(self):
+        pygame.sprite.Sprite.__init__(self)
+        self.is_hovered = False
+        self.is_clicked = False
+        self.manager = None  # set by UIManager.add
+        self._state_images = {}
+
+    @property
+    def state(self):
+        if self.is_clicked:
+            return 'click'
+        return 'hover' if self.is_hovered else 'normal'
+
+    @abstractmethod
+    def render_state(self, state):
+        """Return the image for state (called once per state by prerender)."""
+
+    def prerender(self):
+        """(Re)build every state image, e.g. after changing text or colors."""
+        self._state_images = {state: self.render_state(state) for state in self.STATES}
+        self._apply_state()
+        if self.manager is not None:
+            self.manager.refresh(self)
+
+    def _apply_state(self):
+        center = self.rect.center if getattr(self, 'rect', None) is not None else (0, 0)
+        self.image = self._state_images[self.state]
+        self.rect = self.image.get_rect(center=center)
+
+    def set_state(self, hovered=None, clicked=None):
+        """Update hover/click flags; returns True if the visible state changed."""
+        previous = self.state
+        if hovered is not None:
+            self.is_hovered = hovered
+        if clicked is not None:
+            self.is_clicked = clicked
+        if self.state == previous:
+            return False
+        self._apply_state()
+        return True
+
+    def handle_click(self):
+        pass
+
+    def draw(self, surface):
+        surface.blit(self.image, self.rect)
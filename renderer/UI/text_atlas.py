@@ -0,0 +1,167 @@
+# text_atlas.py
+from collections import OrderedDict
+import pygame
+
+DIGITS = "0123456789.,:-+% "  # pre-baked so counters never render glyphs mid-game
+
+
+class GlyphAtlas:
+    """
+    Glyphs of one text style (font, color, outline) baked once into shared sheets.
+
+    Each glyph is rendered on first use (outline stamps included) and packed
+    into a sheet surface; strings are then composed from sheet subsurfaces
+    with a couple of Surface.blits calls instead of font.render calls.
+    """
+
+    SHEET_SIZE = 512
+
+    def __init__(self, font, color, outline_color=None, outline_thickness=0):
+        """
+        Args:
+            font: pygame.font.Font used to render glyphs
+            color: Fill color
+            outline_color: Outline color (None for no outline)
+            outline_thickness: Outline size in pixels
+        """
+        self.font = font
+        self.color = color
+        self.outline_color = outline_color
+        self.outline = outline_thickness if outline_color is not None else 0
+        self.height = font.get_height() + 2 * self.outline
+        self._glyphs = {}  # char -> (fill, outline or None, advance)
+        self.sheets = []
+        self._cursor = (0, 0)
+        self._shelf = 0  # height of the current row in the sheet
+
+    def _pack(self, surface):
+        """Copy surface into a sheet and return the subsurface holding it."""
+        width, height = surface.get_size()
+        size = self.SHEET_SIZE
+        x, y = self._cursor
+        if not self.sheets or x + width > size:
+            x, y = 0, y + self._shelf
+            self._shelf = 0
+        if not self.sheets or y + height > size:
+            sheet = pygame.Surface((max(size, width), max(size, height)), pygame.SRCALPHA)
+            self.sheets.append(sheet)
+            x, y = 0, 0
+            self._shelf = 0
+        sheet = self.sheets[-1]
+        # Blits onto fully transparent pixels copy the source exactly
+        sheet.blit(surface, (x, y))
+        self._cursor = (x + width, y)
+        self._shelf = max(self._shelf, height)
+        return sheet.subsurface((x, y, width, height))
+
+    def glyph(self, char):
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            metrics = self.font.metrics(char)[0]
+            advance = metrics[4] if metrics else self.font.size(char)[0]
+            fill = self.font.render(char, True, self.color)
+            outline = None
+            if self.outline:
+                t = self.outline
+                stamp = self.font.render(char, True, self.outline_color)
+                outline = pygame.Surface((fill.get_width() + 2 * t, fill.get_height() + 2 * t), pygame.SRCALPHA)
+                outline.blits([(stamp, (dx + t, dy + t))
+                               for dx in range(-t, t + 1) for dy in range(-t, t + 1) if dx or dy],
+                              doreturn=False)
+                outline = self._pack(outline)
+            glyph = self._glyphs[char] = (self._pack(fill), outline, advance)
+        return glyph
+
+    def warm(self, chars):
+        """Bake glyphs ahead of time."""
+        for char in chars:
+            self.glyph(char)
+
+    def size(self, text):
+        return (sum(self.glyph(char)[2] for char in text) + 2 * self.outline, self.height)
+
+    def _blits(self, text, x, y):
+        # Every outline first, then every fill, like FancyText's stamped rendering
+        outlines, fills = [], []
+        t = self.outline
+        for char in text:
+            fill, outline, advance = self.glyph(char)
+            if outline is not None:
+                outlines.append((outline, (x, y)))
+            fills.append((fill, (x + t, y + t)))
+            x += advance
+        return outlines + fills
+
+    def draw(self, surface, text, pos):
+        """Compose text straight onto surface; returns the covered rect."""
+        x, y = int(pos[0]), int(pos[1])
+        surface.blits(self._blits(text, x, y), doreturn=False)
+        width, height = self.size(text)
+        return pygame.Rect(x, y, width, height).clip(surface.get_clip())
+
+    def render(self, text):
+        """Compose text into a new SRCALPHA surface."""
+        surface = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        surface.blits(self._blits(text, 0, 0), doreturn=False)
+        return surface
+
+
+class TextRenderer:
+    """
+    Atlas-backed text for one font: one GlyphAtlas per (color, outline) style
+    plus an LRU cache of fully rendered strings.
+
+    render() suits labels and menus (cached surfaces); draw() composes
+    straight onto the target and suits text that changes every frame such
+    as FPS counters, which would only churn the cache.
+    """
+
+    def __init__(self, font, cache_size=256):
+        """
+        Args:
+            font: pygame.font.Font
+            cache_size: Rendered strings kept (least recently used go first)
+        """
+        self.font = font
+        self.cache_size = cache_size
+        self._atlases = {}
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def atlas(self, color=(255, 255, 255), outline_color=None, outline_thickness=2):
+        key = (tuple(color), tuple(outline_color) if outline_color is not None else None,
+               outline_thickness if outline_color is not None else 0)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(self.font, *key)
+            atlas.warm(DIGITS)
+        return atlas
+
+    def render(self, text, color=(255, 255, 255), outline_color=None, outline_thickness=2):
+        """Cached rendered string (shared: blit it, do not draw on it)."""
+        atlas = self.atlas(color, outline_color, outline_thickness)
+        key = (text, id(atlas))
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self._cache[key] = atlas.render(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return surface
+
+    def draw(self, surface, text, pos, color=(255, 255, 255), outline_color=None, outline_thickness=2):
+        """Uncached fast path: glyphs blitted straight onto surface. Returns the covered rect."""
+        return self.atlas(color, outline_color, outline_thickness).draw(surface, text, pos)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'cached_strings': len(self._cache),
+            'atlases': len(self._atlases),
+            'sheets': sum(len(atlas.sheets) for atlas in self._atlases.values()),
+        }
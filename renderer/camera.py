@@ -1,37 +1,61 @@
+import pygame
+
+
 class Camera:
-    def __init__(self, world_width, world_height, viewport_width, viewport_height, deadzone_width=100):
+    def __init__(self, world_width, world_height, viewport_width, viewport_height, deadzone_width=100,
+                 deadzone_height=None):
         self.world_width = world_width
         self.world_height = world_height
         self.viewport_width = viewport_width
         self.viewport_height = viewport_height
 
-        # Deadzone defines horizontal area in center where player moves freely without camera moving
+        # Deadzone defines the area in the center where the player moves freely without the camera moving
         self.deadzone_width = deadzone_width
+        self.deadzone_height = deadzone_width if deadzone_height is None else deadzone_height
 
         # Camera's top-left position in the world coords
         self.x = 0
-        self.y = 0  # assuming no vertical scrolling; can add similar logic if needed
+        self.y = 0
+
+    @staticmethod
+    def _follow(position, target, viewport, deadzone):
+        # Deadzone bounds relative to the camera viewport on one axis
+        deadzone_low = position + (viewport - deadzone) // 2
+        deadzone_high = deadzone_low + deadzone
+
+        # Move camera forward if the target goes past the deadzone's far edge
+        if target > deadzone_high:
+            return target - (viewport + deadzone) // 2
+        # Move camera back if the target goes past the deadzone's near edge
+        if target < deadzone_low:
+            return target - (viewport - deadzone) // 2
+        return position
 
     def update(self, player_rect):
         # Center of player in world coords
-        player_x = player_rect.centerx
-
-        # Left and right bounds of the deadzone relative to camera viewport
-        deadzone_left = self.x + (self.viewport_width - self.deadzone_width) // 2
-        deadzone_right = deadzone_left + self.deadzone_width
-
-        # Move camera left if player goes past deadzone right edge
-        if player_x > deadzone_right:
-            self.x = player_x - (self.viewport_width + self.deadzone_width) // 2
+        self.x = self._follow(self.x, player_rect.centerx, self.viewport_width, self.deadzone_width)
+        self.y = self._follow(self.y, player_rect.centery, self.viewport_height, self.deadzone_height)
+        self.clamp()
 
-        # Move camera right if player goes past deadzone left edge
-        elif player_x < deadzone_left:
-            self.x = player_x - (self.viewport_width - self.deadzone_width) // 2
-
-        # Clamp camera to world boundaries
+    def clamp(self):
+        """Keep the view inside the world (worlds smaller than the viewport pin to 0)."""
         self.x = max(0, min(self.x, self.world_width - self.viewport_width))
-        self.y = 0  # add vertical clamping if you scroll vertically
+        self.y = max(0, min(self.y, self.world_height - self.viewport_height))
+
+    @property
+    def view_rect(self):
+        """The visible part of the world, in world coords."""
+        return pygame.Rect(self.x, self.y, self.viewport_width, self.viewport_height)
 
-    def apply(self, target_rect):
+    def apply(self, target_rect, cull=False):
         # Return the rectangle shifted by camera offset to draw on screen
+        # With cull=True, rects outside the view return None (skip drawing them)
+        if cull and not self.view_rect.colliderect(target_rect):
+            return None
         return target_rect.move(-self.x, -self.y)
+
+    def visible(self, sprites):
+        """The sprites whose rect (or draw_bounds) overlaps the view."""
+        view = self.view_rect
+        return [sprite for sprite in sprites
+                if view.colliderect(getattr(sprite, 'draw_bounds', None) or sprite.rect)]
@@ -1,11 +1,112 @@
 #group overdirve class
 import pygame
+
+
+def merge_dirty_rects(rects, screen_rect, threshold=0.5):
+    """
+    Clip and merge overlapping dirty rects.
+
+    Returns the merged list, or None when the merged area exceeds threshold
+    of the screen and a full redraw/flip is cheaper.
+    """
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect).clip(screen_rect)
+        if not (rect.width and rect.height):
+            continue
+        # Absorb every rect this one overlaps until it is disjoint from the rest
+        index = rect.collidelist(merged)
+        while index >= 0:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+
+    if sum(r.width * r.height for r in merged) > threshold * screen_rect.width * screen_rect.height:
+        return None
+    return merged
+
+
+def offset_blits(blits, offset):
+    """(image, dest) blits moved by -offset (a camera position); dests are Rects or (x, y) points."""
+    dx, dy = offset
+    if not (dx or dy):
+        return blits
+    return [(image, dest.move(-dx, -dy) if isinstance(dest, pygame.Rect) else (dest[0] - dx, dest[1] - dy))
+            for image, dest in blits]
+
+
 class CustomGroup(pygame.sprite.Group):
+    def __init__(self, *sprites, camera=None):
+        super().__init__(*sprites)
+        self._last_bounds = {}  # sprite -> area it covered when dirty_rects() last ran
+        # Optional Camera: off-screen sprites are skipped, the rest drawn at screen coords (camera.apply)
+        self.camera = camera
+
+    @property
+    def offset(self) -> tuple:
+        """Camera position subtracted from world coords when drawing ((0, 0) without a camera)."""
+        camera = self.camera
+        return (0, 0) if camera is None else (camera.x, camera.y)
+
     def draw(self, surface):
-        for sprite in self.sprites():
+        camera = self.camera
+        sprites = self.sprites() if camera is None else camera.visible(self.sprites())
+        for sprite in sprites:
             # Call the sprite's custom draw method if it exists,
             # fallback to blit image if not.
+            # (with a camera, custom draw(surface, offset) methods get its position as offset)
             if hasattr(sprite, 'draw'):
-                sprite.draw(surface)
+                if camera is not None:
+                    sprite.draw(surface, self.offset)
+                else:
+                    sprite.draw(surface)
+            elif camera is not None:
+                surface.blit(sprite.image, camera.apply(sprite.rect))
+            else:
+                surface.blit(sprite.image, sprite.rect)
+
+    def capture(self):
+        """
+        The (image, dest) blits draw() would make, in screen coords, copied
+        out of the sprites' current state so they can be drawn while the
+        simulation moves on. None when a sprite has a custom draw() but no
+        capture(); such a group has to be drawn live with draw().
+        """
+        camera = self.camera
+        sprites = self.sprites() if camera is None else camera.visible(self.sprites())
+        blits = []
+        for sprite in sprites:
+            if hasattr(sprite, 'capture'):
+                blits.extend(sprite.capture())
+            elif hasattr(sprite, 'draw'):
+                return None
             else:
-                surface.blit(sprite.image, sprite.rect)
\ No newline at end of file
+                blits.append((sprite.image, sprite.rect.copy()))
+        return offset_blits(blits, self.offset)
+
+    def dirty_rects(self):
+        """
+        Areas that must be redrawn since the last call: the old and new bounds
+        of every sprite that moved, was removed, or flags itself dirty.
+
+        Sprites may expose draw_bounds (a Rect covering everything their
+        draw() touches) and a truthy dirty attribute for in-place changes.
+        Rects are in screen coords (moved by the camera, if any).
+        """
+        rects = []
+        current = {}
+        dx, dy = self.offset
+        for sprite in self.sprites():
+            bounds = getattr(sprite, 'draw_bounds', None) or sprite.rect
+            bounds = pygame.Rect(bounds).move(-dx, -dy)
+            current[sprite] = bounds
+            previous = self._last_bounds.get(sprite)
+            if previous != bounds or getattr(sprite, 'dirty', 0):
+                rects.append(bounds)
+                if previous is not None:
+                    rects.append(previous)
+        for sprite, previous in self._last_bounds.items():
+            if sprite not in current:
+                rects.append(previous)
+        self._last_bounds = current
+        return rects
@@ -0,0 +1,180 @@
+#lighting compositor
+import pygame
+
+
+class LightingCompositor:
+    """
+    Owns the darkness overlay a scene blits over the world.
+
+    Static lights are subtracted once into a cached lightmap, which is only
+    rebaked when a static light is added, moved or removed. Dynamic lights are
+    subtracted straight into the reused overlay each frame; at the start of the
+    next frame only the areas they touched are restored from the lightmap.
+    """
+
+    def __init__(self, size: tuple, ambient: tuple = (20, 30, 50, 120)):
+        """
+        Parameters:
+        - size (tuple): Overlay (width, height), usually the screen size
+        - ambient (tuple): RGBA darkness color lights are cut out of
+        """
+        self.size = (int(size[0]), int(size[1]))
+        self._ambient = ambient
+        self._lightmap = pygame.Surface(self.size, pygame.SRCALPHA)
+        self._overlay = pygame.Surface(self.size, pygame.SRCALPHA)
+        self._static = {}  # handle -> [surface, pos, special_flags]
+        self._next_handle = 0
+        self._static_dirty = True
+        self._dirty = []  # overlay areas touched by dynamic lights this frame
+        self._exact = []  # subset of _dirty drawn with something other than BLEND_RGBA_SUB
+        self._restored = []  # areas restored from the lightmap at begin_frame
+        self._ops = []  # (op key, rect) drawn this frame, for change detection
+        self._prev_ops = []
+        self._rebaked = False
+        self._batches = 0  # numbers unkeyed add_lights() batches
+        self.bakes = 0
+
+    @property
+    def overlay(self) -> pygame.Surface:
+        """The composited overlay (reused every frame, do not keep references)."""
+        return self._overlay
+
+    @property
+    def nbytes(self) -> int:
+        """Pixel memory held by the lightmap and overlay buffers."""
+        return sum(buffer.get_pitch() * buffer.get_height() for buffer in (self._lightmap, self._overlay))
+
+    @property
+    def ambient(self) -> tuple:
+        return self._ambient
+
+    @ambient.setter
+    def ambient(self, color: tuple):
+        self._ambient = color
+        self._static_dirty = True
+
+    # Static lights
+    def add_static_light(self, surface: pygame.Surface, pos, special_flags: int = pygame.BLEND_RGBA_SUB) -> int:
+        """Add a light baked into the lightmap; returns a handle for move/remove."""
+        handle = self._next_handle
+        self._next_handle += 1
+        self._static[handle] = [surface, tuple(pos), special_flags]
+        self._static_dirty = True
+        return handle
+
+    def move_static_light(self, handle: int, pos):
+        """Move a static light; the lightmap is rebaked only if the position changed."""
+        light = self._static[handle]
+        pos = tuple(pos)
+        if light[1] != pos:
+            light[1] = pos
+            self._static_dirty = True
+
+    def remove_static_light(self, handle: int):
+        if self._static.pop(handle, None) is not None:
+            self._static_dirty = True
+
+    def clear_static_lights(self):
+        if self._static:
+            self._static.clear()
+            self._static_dirty = True
+
+    def _copy_lightmap(self, rect=None, subtracted_only=False):
+        if subtracted_only:
+            # Subtractive lights only lower channels, so MAX with the lightmap restores it in one pass
+            self._overlay.blit(self._lightmap, rect, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            return
+        # Plain blits alpha-blend SRCALPHA sources, so clear then add for an exact copy
+        if rect is None:
+            self._overlay.fill((0, 0, 0, 0))
+            self._overlay.blit(self._lightmap, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        else:
+            self._overlay.fill((0, 0, 0, 0), rect)
+            self._overlay.blit(self._lightmap, rect, rect, special_flags=pygame.BLEND_RGBA_ADD)
+
+    def bake(self):
+        """Rebuild the static lightmap and reset the overlay to it."""
+        self._lightmap.fill(self._ambient)
+        for surface, pos, special_flags in self._static.values():
+            self._lightmap.blit(surface, pos, special_flags=special_flags)
+        self._copy_lightmap()
+        self._static_dirty = False
+        self.bakes += 1
+
+    # Dynamic layer
+    def begin_frame(self):
+        """Restore the areas dynamic lights touched last frame (rebakes if statics changed)."""
+        self._restored = self._dirty
+        exact = self._exact
+        self._dirty = []
+        self._exact = []
+        self._prev_ops = self._ops
+        self._ops = []
+        self._rebaked = self._static_dirty
+        if self._static_dirty:
+            self.bake()
+            self._restored = [self._overlay.get_rect()]
+            return
+        for rect in self._restored:
+            self._copy_lightmap(rect, subtracted_only=rect.collidelist(exact) < 0)
+
+    def add_light(self, surface: pygame.Surface, dest, special_flags: int = pygame.BLEND_RGBA_SUB,
+                  key=None) -> pygame.Rect:
+        """
+        Subtract a dynamic light into the overlay for this frame.
+
+        key identifies the surface's content for dirty_rects(); it defaults to
+        the surface object itself, so pass one for surfaces rebuilt every frame.
+        """
+        rect = self._overlay.blit(surface, dest, special_flags=special_flags)
+        if rect.width and rect.height:
+            self._dirty.append(rect)
+            if special_flags != pygame.BLEND_RGBA_SUB:
+                self._exact.append(rect)
+            self._ops.append(((id(surface) if key is None else key, tuple(rect), special_flags), rect))
+        return rect
+
+    def add_lights(self, lights, special_flags: int = pygame.BLEND_RGBA_SUB, key=None) -> pygame.Rect:
+        """
+        Subtract many dynamic lights (e.g. particles) with one Surface.blits call.
+
+        lights is a sequence of (surface, dest). The batch is tracked as one
+        area, the union of its blits; without a key it counts as changed
+        every frame.
+        """
+        rects = self._overlay.blits([(surface, dest, None, special_flags) for surface, dest in lights])
+        if not rects:
+            return pygame.Rect(0, 0, 0, 0)
+        rect = rects[0].unionall(rects[1:])
+        if rect.width and rect.height:
+            self._dirty.append(rect)
+            if special_flags != pygame.BLEND_RGBA_SUB:
+                self._exact.append(rect)
+            self._batches += 1
+            op_key = ('batch', self._batches) if key is None else key
+            self._ops.append(((op_key, tuple(rect), special_flags), rect))
+        return rect
+
+    def draw(self, surface: pygame.Surface, dest, special_flags: int = 0, key=None) -> pygame.Rect:
+        """Blit anything else (e.g. UI) into the overlay for this frame."""
+        return self.add_light(surface, dest, special_flags, key)
+
+    def mark_dirty(self, rect, key=None):
+        """Register an area drawn directly on overlay (e.g. pygame.draw calls)."""
+        rect = pygame.Rect(rect).clip(self._overlay.get_rect())
+        if rect.width and rect.height:
+            self._dirty.append(rect)
+            self._exact.append(rect)
+            self._ops.append((('mark', key, tuple(rect)), rect))
+
+    def dirty_rects(self) -> list:
+        """
+        Overlay areas whose pixels changed since the previous frame: the rects
+        of draws that were added, removed or changed (everything after a rebake).
+        """
+        if self._rebaked:
+            return [self._overlay.get_rect()]
+        previous = {op for op, _ in self._prev_ops}
+        current = {op for op, _ in self._ops}
+        return [rect for op, rect in self._prev_ops if op not in current] \
+            + [rect for op, rect in self._ops if op not in previous]
@@ -0,0 +1,293 @@
+#particle effects
+import copy
+import math
+import numpy as np
+import pygame
+from physics_engine.tract import g
+from renderer.Light import circle_light_mask
+
+FIRE_PALETTE = ((255, 240, 180), (255, 190, 70), (255, 120, 30), (200, 60, 20), (90, 80, 80))
+
+
+class ParticleEmitter:
+    """
+    Fixed-capacity particle pool in preallocated NumPy arrays.
+
+    Particles are written into a ring buffer (when it is full the oldest slots
+    are reused), integrated under gravity in one vectorized step and drawn
+    with a single Surface.blits call. Sprites are built once per palette color
+    and fade level; a particle picks its frame from its remaining life.
+    update() only moves live particles; dead slots keep their last state
+    until a new particle reuses them, and nothing is reallocated per frame.
+    """
+
+    def __init__(self, capacity: int = 4096, palette=FIRE_PALETTE, radius: int = 2, fade_levels: int = 8,
+                 gravity: float = g, drag: float = 0.0, additive: bool = False, glow: tuple = None,
+                 max_lights: int = 64, blit_limit: int = 4096, seed: int = None):
+        """
+        Parameters:
+        - capacity (int): Most live particles; new ones overwrite the oldest
+        - palette (tuple): RGB colors particles pick from
+        - radius (int): Particle sprite radius in pixels
+        - fade_levels (int): Pre-rendered fade frames per color
+        - gravity (float): Downward acceleration in pixels/s² (tract.g by default)
+        - drag (float): Fraction of velocity lost per second
+        - additive (bool): Blend onto the target with BLEND_RGB_ADD (sparks, fire)
+        - glow (tuple): (radius, steps, alpha) light mask cut out of the lighting overlay by draw_light()
+        - max_lights (int): Most particles draw_light() submits per frame
+        - blit_limit (int): Above this many live additive particles draw() sums the
+          sprites into one layer with NumPy and blits it once instead of each sprite
+        - seed (int): Seed for the emitter's random generator
+        """
+        self.capacity = capacity
+        self.radius = radius
+        self.gravity = gravity
+        self.drag = drag
+        self.additive = additive
+        self.glow = glow
+        self.max_lights = max_lights
+        self.blit_limit = blit_limit
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.life = np.zeros(capacity, dtype=np.float64)  # seconds left; <= 0 is dead
+        self.life_max = np.ones(capacity, dtype=np.float64)
+        self.color = np.zeros(capacity, dtype=np.uint8)  # palette index
+        self._head = 0  # next ring-buffer slot to write
+        self._high = 0  # one past the highest slot ever written
+
+        self.palette = tuple(tuple(color) for color in palette)
+        self.fade_levels = fade_levels
+        self.sprites = np.empty((len(self.palette), fade_levels), dtype=object)
+        for c, color in enumerate(self.palette):
+            for level in range(fade_levels):
+                self.sprites[c, level] = self._sprite(color, (level + 1) / fade_levels)
+        self._build_stamps()
+        self._scratch = {}  # additive fast path layer and planes, see _splat(); shared with snapshots
+        self._live = np.zeros(0, dtype=np.intp)
+        self.bounds = None  # area covered by the live particles after update()
+        self._reported = None  # bounds returned by the last dirty_rects()
+
+    def _sprite(self, color, fade):
+        size = self.radius * 2
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        if self.additive:
+            # Additive blending ignores alpha, so fade the color itself
+            rgba = (*(int(channel * fade) for channel in color), 255)
+        else:
+            rgba = (*color, int(255 * fade))
+        pygame.draw.circle(surface, rgba, (self.radius, self.radius), self.radius)
+        return surface
+
+    def _build_stamps(self):
+        # Sprites are solid discs: one covered-pixel kernel plus one color per frame
+        coverage = pygame.surfarray.array_alpha(self.sprites[0, -1]) > 0
+        self._kernel = [(int(dx), int(dy)) for dx, dy in zip(*np.nonzero(coverage))]
+        r = self.radius
+        # (channel, frame) as float64, the weight type np.bincount works in
+        self._frame_rgb = np.array([tuple(sprite.get_at((r, r)))[:3] for sprite in self.sprites.ravel()],
+                                   dtype=np.float64).T.copy()
+
+    @property
+    def count(self) -> int:
+        """Live particles as of the last update()."""
+        return len(self._live)
+
+    def emit(self, positions, velocities, life, colors=None) -> np.ndarray:
+        """
+        Write particles into the ring buffer; returns their slots.
+
+        Parameters:
+        - positions (array-like): (n, 2) start positions, or one (x, y) for all
+        - velocities (array-like): (n, 2) velocities in pixels/s
+        - life (float | array-like): Lifetime(s) in seconds
+        - colors (array-like): Palette indices (default: random)
+        """
+        velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 2)
+        n = min(len(velocities), self.capacity)
+        velocities = velocities[-n:]
+        slots = (self._head + np.arange(n)) % self.capacity
+        self._high = max(self._high, min(self._head + n, self.capacity))
+        self._head = (self._head + n) % self.capacity
+
+        self.pos[slots] = self._per_particle(positions, n, (2,))
+        self.vel[slots] = velocities
+        life = self._per_particle(life, n)
+        self.life[slots] = life
+        self.life_max[slots] = np.maximum(life, 1e-6)
+        if colors is None:
+            self.color[slots] = self.rng.integers(0, len(self.palette), n)
+        else:
+            self.color[slots] = self._per_particle(colors, n)
+        self._live = np.flatnonzero(self.life[:self._high] > 0)
+        return slots
+
+    @staticmethod
+    def _per_particle(values, n, shape=()):
+        # One value shared by every particle, or the last n of a per-particle array
+        values = np.asarray(values)
+        if values.ndim == len(shape):
+            return np.broadcast_to(values, (n, *shape))
+        return values[-n:]
+
+    def burst(self, pos, count: int = 200, speed=(60.0, 360.0), life=(0.4, 1.2), angle=(0.0, 360.0)) -> np.ndarray:
+        """
+        Emit count particles from pos in random directions (explosions, sparks).
+
+        Parameters:
+        - pos (tuple): Origin (x, y)
+        - count (int): Particles to emit
+        - speed (tuple): (min, max) launch speed in pixels/s
+        - life (tuple): (min, max) lifetime in seconds
+        - angle (tuple): (min, max) direction in degrees (screen space, y down)
+        """
+        rng = self.rng
+        theta = np.radians(rng.uniform(angle[0], angle[1], count))
+        # sqrt keeps the burst filled instead of piling up on the rim
+        v = speed[0] + (speed[1] - speed[0]) * np.sqrt(rng.random(count))
+        velocities = np.column_stack((np.cos(theta) * v, np.sin(theta) * v))
+        return self.emit(pos, velocities, rng.uniform(life[0], life[1], count))
+
+    def clear(self):
+        self.life[:] = 0.0
+        self.bounds = None
+        self._live = self._live[:0]
+
+    def update(self, dt: float):
+        """Age, cull and integrate the particles in one vectorized pass."""
+        if not self._live.size:
+            self.bounds = None
+            return
+        # Contiguous passes masked to the slots alive after the last update (cheaper
+        # than gathering them); dead slots keep their last state until reused
+        n = self._high
+        life = self.life[:n]
+        vel = self.vel[:n]
+        pos = self.pos[:n]
+        moving = life > 0
+        moving_xy = moving[:, None]
+        np.subtract(life, dt, out=life, where=moving)
+        np.add(vel[:, 1], self.gravity * dt, out=vel[:, 1], where=moving)
+        if self.drag:
+            np.multiply(vel, max(0.0, 1.0 - self.drag * dt), out=vel, where=moving_xy)
+        np.add(pos, vel * dt, out=pos, where=moving_xy)
+        alive = life > 0
+        live = np.flatnonzero(alive)
+        self._live = live
+        if not live.size:
+            self.bounds = None
+            return
+        x, y = pos[:, 0], pos[:, 1]
+        low_x, high_x = x.min(where=alive, initial=np.inf), x.max(where=alive, initial=-np.inf)
+        low_y, high_y = y.min(where=alive, initial=np.inf), y.max(where=alive, initial=-np.inf)
+        r = self.radius
+        self.bounds = pygame.Rect(math.floor(low_x) - r, math.floor(low_y) - r,
+                                  math.ceil(high_x - low_x) + 2 * r + 1, math.ceil(high_y - low_y) + 2 * r + 1)
+
+    def snapshot(self) -> 'ParticleEmitter':
+        """
+        Frozen copy of the live particles: draw() and draw_light() on it keep
+        working while update() advances this emitter (pipelined rendering).
+        """
+        frozen = copy.copy(self)
+        n = self._high
+        frozen.pos = self.pos[:n].copy()
+        frozen.life = self.life[:n].copy()
+        frozen.life_max = self.life_max[:n].copy()
+        frozen.color = self.color[:n].copy()
+        frozen._live = self._live.copy()
+        frozen.bounds = None if self.bounds is None else self.bounds.copy()
+        return frozen
+
+    def dirty_rects(self) -> list:
+        """Areas covered by the particles at the previous call and now (call once per frame)."""
+        rects = [rect for rect in (self._reported, self.bounds) if rect is not None]
+        self._reported = self.bounds
+        return rects
+
+    def _levels(self, live):
+        level = (self.life[live] / self.life_max[live] * self.fade_levels).astype(np.intp)
+        np.clip(level, 0, self.fade_levels - 1, out=level)
+        return level
+
+    def _dests(self, live, offset):
+        xy = (self.pos[live] - offset).astype(np.int64)
+        return zip(xy[:, 0].tolist(), xy[:, 1].tolist())
+
+    def draw(self, surface: pygame.Surface, offset=(0, 0)):
+        """Draw every live particle (offset: camera position)."""
+        live = self._live
+        if not live.size:
+            return
+        if self.additive and live.size > self.blit_limit:
+            self._splat(surface, live, offset)
+            return
+        dests = self._dests(live, (offset[0] + self.radius, offset[1] + self.radius))
+        frames = self.sprites[self.color[live], self._levels(live)].tolist()
+        if self.additive:
+            surface.blits([(frame, dest, None, pygame.BLEND_RGB_ADD) for frame, dest in zip(frames, dests)],
+                          doreturn=False)
+        else:
+            surface.blits(list(zip(frames, dests)), doreturn=False)
+
+    def _splat(self, surface, live, offset):
+        """
+        Additive fast path for many particles: sum every particle's sprite into
+        a reused layer with NumPy, then blit the layer once. The result matches
+        blitting each sprite with BLEND_RGB_ADD.
+        """
+        area = pygame.Rect(self.bounds.move(-offset[0], -offset[1])).clip(surface.get_clip())
+        if not area.width or not area.height:
+            return
+        w, h = area.size
+        scratch = self._scratch
+        layer = scratch.get('layer')
+        if layer is None or layer.get_width() < w or layer.get_height() < h:
+            layer = scratch['layer'] = pygame.Surface((max(w, surface.get_width()), max(h, surface.get_height())))
+            size = layer.get_size()
+            d = 2 * self.radius
+            # Scratch planes reused every frame: (channel, y, x)
+            scratch['points'] = np.empty((3, size[1] + d, size[0] + d), dtype=np.uint16)
+            scratch['sums'] = np.empty((3, size[1], size[0]), dtype=np.uint16)
+
+        # Sprite top-left in layer space, padded by d so partly visible sprites count
+        d = 2 * self.radius
+        tx = (self.pos[live, 0] - (offset[0] + self.radius + area.x)).astype(np.intp) + d
+        ty = (self.pos[live, 1] - (offset[1] + self.radius + area.y)).astype(np.intp) + d
+        keep = (tx > 0) & (tx < w + d) & (ty > 0) & (ty < h + d)
+        live = live[keep]
+        origins = ty[keep] * (w + d) + tx[keep]
+        frames = self.color[live].astype(np.intp) * self.fade_levels + self._levels(live)
+
+        # Color sums per sprite origin, then shifted sums under each covered kernel
+        # pixel. Clipping the origins at 255 keeps uint16 totals without changing
+        # the saturated result. Planes are (y, x) so rows match the layer's memory.
+        points = scratch['points'][:, :h + d, :w + d]
+        for channel in range(3):
+            total = np.bincount(origins, self._frame_rgb[channel][frames], minlength=(w + d) * (h + d))
+            np.minimum(total, 255, out=total)
+            points[channel] = total.reshape(h + d, w + d)
+        out = scratch['sums'][:, :h, :w]
+        out.fill(0)
+        for dx, dy in self._kernel:
+            out += points[:, d - dy:d - dy + h, d - dx:d - dx + w]
+        np.minimum(out, 255, out=out)
+        for plane, view in zip(out, (pygame.surfarray.pixels_red, pygame.surfarray.pixels_green,
+                                     pygame.surfarray.pixels_blue)):
+            pixels = view(layer)
+            pixels[:w, :h] = plane.T
+            del pixels  # unlock the layer
+        surface.blit(layer, area, (0, 0, w, h), special_flags=pygame.BLEND_RGB_ADD)
+
+    def draw_light(self, lighting, offset=(0, 0)):
+        """Cut a glow for up to max_lights particles out of a LightingCompositor's overlay."""
+        live = self._live
+        if self.glow is None or not live.size:
+            return None
+        mask = circle_light_mask(*self.glow)
+        if live.size > self.max_lights:
+            live = live[::-(-live.size // self.max_lights)]
+        half = mask.get_width() // 2
+        dests = self._dests(live, (offset[0] + half, offset[1] + half))
+        return lighting.add_lights([(mask, dest) for dest in dests])
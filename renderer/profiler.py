@@ -0,0 +1,243 @@
+#frame profiler
+import csv
+import gc
+import json
+import threading
+import time
+from collections import deque
+import numpy as np
+
+_active = None  # profiler used by the module-level scope()
+
+
+class RingBuffer:
+    """Fixed-size float buffer; the oldest sample is overwritten when full."""
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.float64)
+        self._index = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def append(self, value: float):
+        self._data[self._index] = value
+        self._index = (self._index + 1) % len(self._data)
+        if self._count < len(self._data):
+            self._count += 1
+
+    def values(self) -> np.ndarray:
+        """Samples oldest first (a copy)."""
+        if self._count < len(self._data):
+            return self._data[:self._count].copy()
+        return np.roll(self._data, -self._index)
+
+    def last(self, default: float = 0.0) -> float:
+        return float(self._data[self._index - 1]) if self._count else default
+
+    def mean(self) -> float:
+        return float(self._data[:self._count].mean()) if self._count else 0.0
+
+    def percentile(self, q) -> float:
+        return float(np.percentile(self._data[:self._count], q)) if self._count else 0.0
+
+
+class _Scope:
+    # One per with-block: the start time lives here, so nested and concurrent scopes of a stage stay separate
+    __slots__ = ('profiler', 'name', 'start', 'depth')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        # Only the outermost scope of a stage on this thread records, so nested time is not counted twice
+        self.depth = self.profiler._depths()
+        self.depth[self.name] = self.depth.get(self.name, 0) + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        depth = self.depth
+        depth[self.name] -= 1
+        if not depth[self.name]:
+            current = self.profiler._current
+            current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NullScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SCOPE = _NullScope()
+
+
+def scope(name: str):
+    """Time a block under the active profiler (no-op when none is active)."""
+    return _active.scope(name) if _active is not None else NULL_SCOPE
+
+
+class TelemetryWriter:
+    """Streams one row per frame to a CSV or JSON-lines file."""
+
+    def __init__(self, path: str, format: str = None):
+        """
+        Parameters:
+        - path (str): Output file
+        - format (str): 'csv' or 'jsonl' (default from the file extension)
+        """
+        self.format = format or ('csv' if path.endswith('.csv') else 'jsonl')
+        if self.format not in ('csv', 'jsonl'):
+            raise ValueError("format must be 'csv' or 'jsonl'")
+        self._file = open(path, 'w', newline='')
+        self._csv = None
+
+    def write(self, row: dict):
+        if self.format == 'jsonl':
+            self._file.write(json.dumps(row) + '\n')
+            return
+        if self._csv is None:
+            # Columns are fixed by the first frame; stages first seen later are dropped
+            self._csv = csv.DictWriter(self._file, fieldnames=list(row), extrasaction='ignore')
+            self._csv.writeheader()
+        self._csv.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class FrameProfiler:
+    """
+    Named per-frame stage timers with ring-buffer history.
+
+    Wrap stages with `with profiler.scope('update'):` (or the module-level
+    scope() once activate() was called) between begin_frame()/end_frame().
+    Tracks percentiles, frames over budget (spikes) and GC pauses, and can
+    stream every frame to a TelemetryWriter.
+    """
+
+    def __init__(self, capacity: int = 240, budget_ms: float = 1000 / 60, spike_factor: float = 1.5,
+                 telemetry: TelemetryWriter = None, track_gc: bool = True):
+        """
+        Parameters:
+        - capacity (int): Frames of history kept per stage
+        - budget_ms (float): Frame budget (16.6 ms at 60 FPS)
+        - spike_factor (float): A frame longer than budget_ms * spike_factor is a spike
+        - telemetry (TelemetryWriter): Optional per-frame output
+        - track_gc (bool): Record garbage collector pauses via gc.callbacks
+        """
+        self.capacity = capacity
+        self.budget_ms = budget_ms
+        self.spike_factor = spike_factor
+        self.telemetry = telemetry
+        self.frame_times = RingBuffer(capacity)
+        self.stages = {}  # name -> RingBuffer
+        self.spikes = deque(maxlen=64)  # (frame, total ms, {stage: ms})
+        self.gc_pauses = deque(maxlen=64)  # (frame, generation, ms, collected)
+        self.frame = 0
+        self._current = {}
+        self._local = threading.local()  # per-thread stage name -> open scopes
+        self._frame_start = None
+        self._gc_start = None
+        self._gc_ms = 0.0
+        self._track_gc = track_gc
+        if track_gc:
+            gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            ms = (time.perf_counter() - self._gc_start) * 1000
+            self._gc_start = None
+            self._gc_ms += ms
+            self.gc_pauses.append((self.frame, info.get('generation'), ms, info.get('collected')))
+
+    def activate(self):
+        """Make this the profiler used by the module-level scope()."""
+        global _active
+        _active = self
+        return self
+
+    def _depths(self) -> dict:
+        depths = getattr(self._local, 'depths', None)
+        if depths is None:
+            depths = self._local.depths = {}
+        return depths
+
+    def scope(self, name: str) -> _Scope:
+        """
+        Context manager adding the block's duration to stage name for this
+        frame; a scope nested in one of the same name (on the same thread)
+        is already counted by the outer one.
+        """
+        return _Scope(self, name)
+
+    def add(self, name: str, ms: float):
+        """Add ms measured elsewhere (e.g. on a worker thread) to stage name for this frame."""
+        self._current[name] = self._current.get(name, 0.0) + ms
+
+    def begin_frame(self):
+        self._current = {}
+        self._gc_ms = 0.0
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        total = (time.perf_counter() - self._frame_start) * 1000
+        self._frame_start = None
+        self.frame_times.append(total)
+        for name in self.stages.keys() | self._current.keys():
+            buffer = self.stages.get(name)
+            if buffer is None:
+                buffer = self.stages[name] = RingBuffer(self.capacity)
+            buffer.append(self._current.get(name, 0.0))
+
+        spike = total > self.budget_ms * self.spike_factor
+        if spike:
+            self.spikes.append((self.frame, total, dict(self._current)))
+        if self.telemetry is not None:
+            row = {'frame': self.frame, 'time': time.time(), 'total_ms': round(total, 4)}
+            row.update((f"{name}_ms", round(ms, 4)) for name, ms in self._current.items())
+            row['gc_ms'] = round(self._gc_ms, 4)
+            row['spike'] = int(spike)
+            self.telemetry.write(row)
+        self.frame += 1
+
+    def stats(self, percentiles=(50, 95, 99)) -> dict:
+        """Per-stage mean and percentiles (ms) plus spike and GC counters."""
+        def describe(buffer):
+            result = {'mean': buffer.mean(), 'last': buffer.last()}
+            result.update((f"p{q}", buffer.percentile(q)) for q in percentiles)
+            return result
+
+        return {
+            'frames': self.frame,
+            'frame': describe(self.frame_times),
+            'stages': {name: describe(buffer) for name, buffer in self.stages.items()},
+            'spikes': len(self.spikes),
+            'gc_pauses': len(self.gc_pauses),
+            'gc_ms_total': sum(pause[2] for pause in self.gc_pauses),
+        }
+
+    def close(self):
+        """Detach the GC hook and close telemetry."""
+        global _active
+        if self._track_gc and self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if _active is self:
+            _active = None
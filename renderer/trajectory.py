@@ -0,0 +1,115 @@
+#trajectory preview
+import math
+import numpy as np
+import pygame
+
+
+class TrajectoryPreview:
+    """
+    Dotted arc preview for every projectile in a ProjectileSystem.
+
+    One dot sprite is built up front and reused; all dots of a frame go out in
+    a single Surface.blits call. Arcs stop at the analytic landing time, and
+    dots are thinned when many projectiles are in flight or far from a focus.
+    A frame never draws more than max_dots dots: past max_dots // 2
+    projectiles only the nearest to the focus (or the newest) are previewed.
+    """
+
+    def __init__(self, *, steps: int = 30, step_time: float = 0.1, color: tuple = (128, 128, 128),
+                 alpha: int = 80, radius: int = 3, max_dots: int = 600, lod_distance: float = None):
+        """
+        Parameters:
+        - steps (int): Dots per arc at full detail
+        - step_time (float): Seconds between dots at full detail
+        - color (tuple): RGB dot color
+        - alpha (int): Dot alpha (0-255)
+        - radius (int): Dot radius in pixels
+        - max_dots (int): Dot budget per frame shared by all projectiles (a hard limit)
+        - lod_distance (float): With a focus point, halve/third/... the dots
+          for every lod_distance pixels between projectile and focus
+        """
+        self.steps = steps
+        self.step_time = step_time
+        self.max_dots = max_dots
+        self.lod_distance = lod_distance
+        self.radius = radius
+        self.dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        self.bounds = None  # area covered by the last prepare(), for dirty-rect rendering
+        self._blits = []
+        pygame.draw.circle(self.dot, (*color, alpha), (radius, radius), radius)
+
+    def _select(self, system, indices, focus):
+        # Every previewed arc needs at least two dots, so the budget caps the projectile count
+        limit = max(1, self.max_dots // 2)
+        if len(indices) <= limit:
+            return indices
+        if focus is not None:
+            key = np.hypot(system.x[indices] - focus[0], system.y[indices] - focus[1])
+        else:
+            key = system.t[indices]  # newest first
+        return indices[np.argpartition(key, limit - 1)[:limit]]
+
+    def _strides(self, system, indices, focus):
+        # Count LOD: spread the dot budget across projectiles, keeping the time span
+        per_projectile = max(2, self.max_dots // len(indices))
+        stride = np.full(len(indices), max(1, math.ceil(self.steps / per_projectile)))
+
+        # Distance LOD: thin further for every lod_distance away from the focus
+        if focus is not None and self.lod_distance:
+            dist = np.hypot(system.x[indices] - focus[0], system.y[indices] - focus[1])
+            stride *= 1 + (dist // self.lod_distance).astype(np.int64)
+        return stride
+
+    def prepare(self, system, ground_y: float, indices=None, focus=None):
+        """
+        Compute this frame's dots without drawing them; sets bounds.
+
+        Parameters:
+        - system (ProjectileSystem): Source of projectile state
+        - ground_y (float): Ground line; arcs are clipped where they reach it
+        - indices: Optional slot indices to draw (default: every flying projectile)
+        - focus (tuple): Optional (x, y) used for distance LOD
+        """
+        self._blits = []
+        self.bounds = None
+        if indices is None:
+            indices = system.flying_indices()
+        indices = np.asarray(indices, dtype=np.int64)
+        if not len(indices):
+            return
+
+        indices = self._select(system, indices, focus)
+        stride = self._strides(system, indices, focus)
+        k = np.arange(self.steps)
+        times = system.t[indices, None] + k[None, :] * (stride[:, None] * self.step_time)
+        visible = (k[None, :] * stride[:, None] < self.steps) \
+            & (times <= system.landing_time(indices, ground_y)[:, None])
+
+        t = times[visible]
+        if not t.size:
+            return
+        slots = indices[np.nonzero(visible)[0]]
+        xs, ys = system.positions_at(slots, t)
+        xs = (xs - self.radius).astype(np.int64)
+        ys = (ys - self.radius).astype(np.int64)
+        size = self.radius * 2
+        self.bounds = pygame.Rect(int(xs.min()), int(ys.min()),
+                                  int(xs.max() - xs.min()) + size, int(ys.max() - ys.min()) + size)
+
+        dot = self.dot
+        self._blits = [(dot, pos) for pos in zip(xs.tolist(), ys.tolist())]
+
+    @property
+    def prepared(self) -> list:
+        """(dot, position) pairs from the last prepare(); replaced, never mutated, by the next one."""
+        return self._blits
+
+    def blit_prepared(self, surface: pygame.Surface):
+        """Draw the dots from the last prepare() in one Surface.blits call."""
+        if self._blits:
+            surface.blits(self._blits, doreturn=False)
+
+    def draw(self, surface: pygame.Surface, system, ground_y: float, indices=None, focus=None):
+        """Prepare and draw the preview arcs (see prepare() for parameters)."""
+        self.prepare(system, ground_y, indices, focus)
+        self.blit_prepared(surface)
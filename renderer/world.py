@@ -0,0 +1,134 @@
+#chunked world layers
+import pygame
+
+
+class ChunkedLayer:
+    """
+    A large image or tile map split into pre-converted square chunks.
+
+    Only the chunks overlapping the camera's view are blitted, so a level many
+    screens wide costs about as much to draw as one screen. parallax scales
+    the camera offset (0 = fixed to the screen, 1 = moves with the world).
+    Fully transparent chunks are not stored.
+    """
+
+    def __init__(self, surface: pygame.Surface, chunk_size: int = 256, parallax=(1.0, 1.0),
+                 offset=(0, 0), repeat_x: bool = False, alpha: bool = None):
+        """
+        Parameters:
+        - surface (pygame.Surface): Layer image (may be far larger than the screen)
+        - chunk_size (int): Chunk edge in pixels
+        - parallax (tuple): (x, y) factors applied to the camera position
+        - offset (tuple): Layer position in world pixels
+        - repeat_x (bool): Tile the layer horizontally forever
+        - alpha (bool): Keep per-pixel alpha (default: the surface has SRCALPHA)
+        """
+        self.chunk_size = chunk_size
+        self.parallax = (float(parallax[0]), float(parallax[1]))
+        self.offset = (int(offset[0]), int(offset[1]))
+        self.repeat_x = repeat_x
+        self.width, self.height = surface.get_size()
+        self.columns = -(-self.width // chunk_size)
+        self.rows = -(-self.height // chunk_size)
+        if alpha is None:
+            alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+
+        self.chunks = {}  # (column, row) -> converted surface
+        for column in range(self.columns):
+            for row in range(self.rows):
+                area = pygame.Rect(column * chunk_size, row * chunk_size, chunk_size, chunk_size).clip(surface.get_rect())
+                chunk = surface.subsurface(area)
+                if alpha and not chunk.get_bounding_rect().width:
+                    continue
+                self.chunks[(column, row)] = self._convert(chunk, alpha)
+        self.drawn = 0  # chunks blitted by the last draw()
+
+    @staticmethod
+    def _convert(chunk, alpha):
+        if pygame.display.get_surface() is None:
+            return chunk.copy()
+        return chunk.convert_alpha() if alpha else chunk.convert()
+
+    @classmethod
+    def from_tiles(cls, tiles, grid, tile_size: int, chunk_size: int = 256, **kwargs):
+        """
+        Bake a tile map into a chunked layer.
+
+        Parameters:
+        - tiles (list): Tile surfaces, indexed by the grid values
+        - grid (list[list[int]]): Rows of tile indices; negative or None = empty
+        - tile_size (int): Tile edge in pixels
+        """
+        rows = len(grid)
+        columns = max((len(row) for row in grid), default=0)
+        surface = pygame.Surface((columns * tile_size, rows * tile_size), pygame.SRCALPHA)
+        surface.blits([(tiles[index], (x * tile_size, y * tile_size))
+                       for y, row in enumerate(grid) for x, index in enumerate(row)
+                       if index is not None and index >= 0], doreturn=False)
+        return cls(surface, chunk_size, alpha=True, **kwargs)
+
+    def origin(self, camera) -> tuple:
+        """Screen position of the layer's top-left for the camera."""
+        return (round(self.offset[0] - camera.x * self.parallax[0]),
+                round(self.offset[1] - camera.y * self.parallax[1]))
+
+    def draw(self, surface: pygame.Surface, camera, area: pygame.Rect = None):
+        """
+        Blit the chunks visible through camera.
+
+        Parameters:
+        - surface (pygame.Surface): Target (usually the screen)
+        - camera (Camera): Supplies x/y and the viewport size
+        - area (pygame.Rect): Only draw chunks overlapping this screen area (dirty rects)
+        """
+        area = pygame.Rect(area) if area is not None else pygame.Rect(0, 0, camera.viewport_width, camera.viewport_height)
+        ox, oy = self.origin(camera)
+        size = self.chunk_size
+        if self.repeat_x:
+            # Whole repeats left of the area, then chunks within the repeat
+            start = (area.left - ox) // self.width
+            first_column = start * self.columns + ((area.left - ox) - start * self.width) // size
+            end = (area.right - 1 - ox) // self.width
+            last_column = end * self.columns + ((area.right - 1 - ox) - end * self.width) // size
+        else:
+            first_column = (area.left - ox) // size
+            last_column = (area.right - 1 - ox) // size
+        first_row = max(0, (area.top - oy) // size)
+        last_row = min(self.rows - 1, (area.bottom - 1 - oy) // size)
+        if not self.repeat_x:
+            first_column = max(0, first_column)
+            last_column = min(self.columns - 1, last_column)
+
+        chunks = self.chunks
+        blits = []
+        for column in range(first_column, last_column + 1):
+            # Repeats are laid out per layer width, so a narrower last chunk leaves no gap
+            repeat, source = divmod(column, self.columns)
+            x = ox + repeat * self.width + source * size
+            for row in range(first_row, last_row + 1):
+                chunk = chunks.get((source, row))
+                if chunk is not None:
+                    blits.append((chunk, (x, oy + row * size)))
+        if blits:
+            surface.blits(blits, doreturn=False)
+        self.drawn = len(blits)
+
+
+class World:
+    """Ordered parallax layers (back to front) drawn through one camera."""
+
+    def __init__(self, camera, layers=()):
+        self.camera = camera
+        self.layers = list(layers)
+
+    def add_layer(self, layer: ChunkedLayer) -> ChunkedLayer:
+        self.layers.append(layer)
+        return layer
+
+    def draw(self, surface: pygame.Surface, area: pygame.Rect = None):
+        for layer in self.layers:
+            layer.draw(surface, self.camera, area)
+
+    @property
+    def chunks_drawn(self) -> int:
+        return sum(layer.drawn for layer in self.layers)
@@ -0,0 +1,58 @@
+# Loading.py
+
+import pygame
+from system.abstract_scene import AbstractScene
+from renderer.UI.fonts import get_font
+
+
+class LoadingScene(AbstractScene):
+    """
+    Shows a progress bar while SceneManager.preload() prepares the next scene,
+    then switches to it.
+    """
+    loading_screen = True
+
+    def __init__(self, manager, scene_cls, *args, bar_color=(200, 200, 200), background=(0, 0, 0), **kwargs):
+        """
+        Parameters:
+        - manager (SceneManager): Manager running this scene and the preload
+        - scene_cls (type | str): Scene to load, or a 'module:Class' string imported by the
+          preload (see SceneManager.preload); *args/**kwargs go to its constructor
+        """
+        self.manager = manager
+        self.scene_cls = scene_cls
+        self.args = args
+        self.kwargs = kwargs
+        self.bar_color = bar_color
+        self.background = background
+        self.handle = None
+        self.font = None
+
+    def enter(self):
+        if self.font is None:
+            self.font = get_font(None, 24)
+        self.handle = self.manager.preload(self.scene_cls, *self.args, **self.kwargs)
+
+    def exit(self):
+        pass
+
+    def handle_events(self, events):
+        pass
+
+    def update(self, dt):
+        # manager.update() builds the scene on this thread once its preparation is done
+        if self.handle.error is None and self.handle.ready:
+            self.manager.switch_to(self.scene_cls, *self.args, **self.kwargs)
+
+    def draw(self, screen):
+        screen.fill(self.background)
+        width, height = screen.get_size()
+        bar = pygame.Rect(0, 0, width // 2, 16)
+        bar.center = (width // 2, height // 2)
+        pygame.draw.rect(screen, self.bar_color, bar, 1)
+        fill = bar.inflate(-4, -4)
+        fill.width = round(fill.width * self.handle.fraction)
+        if fill.width > 0:
+            screen.fill(self.bar_color, fill)
+        label = self.font.render(f"Loading {self.handle.stage}...", True, self.bar_color)
+        screen.blit(label, label.get_rect(midbottom=(bar.centerx, bar.top - 8)))
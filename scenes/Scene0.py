@@ -3,20 +3,63 @@
 import pygame
 from system.entities import character, mary, stickfigure
 from system.abstract_scene import AbstractScene
-from system.GameGlobals import scene_manager
+from system.GameGlobals import scene_manager, asset_manager, input_manager
 from renderer import Light as light
-from renderer.group_overide import CustomGroup
+from renderer.group_overide import CustomGroup, merge_dirty_rects
+from renderer.lighting import LightingCompositor
+from renderer.camera import Camera
+from renderer.world import ChunkedLayer, World
+from renderer.particles import ParticleEmitter
+from renderer import profiler
+from physics_engine.collision import SpatialHash
+from system.ecs import EntityStore
 from renderer.UI.button import Button  # Note the capital B for class name
+from renderer.UI.manager import UIManager
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
 from renderer.UI.fancy_text import FancyText
+# Collision layers (bitmask)
+TARGET_LAYER = 1
+PROJECTILE_LAYER = 2
+EXPLOSION_GLOW = (12, 40, 60)  # (radius, steps, alpha) of each lit explosion particle
+
 def load_and_scale(path, height):
-    img = pygame.image.load(path).convert_alpha()
-    width = img.get_width() * (height / img.get_height())
-    return pygame.transform.scale(img, (int(width), int(height)))
+    return asset_manager.load_height(path, height)
 
 class Scene0(AbstractScene):
-    def __init__(self):
-    	self.load()
+    def __init__(self, dirty_rendering=False, dirty_threshold=0.5, seed=None):
+        # Dirty-rect mode: draw() repaints only changed areas and returns them
+        self.dirty_rendering = dirty_rendering
+        self.dirty_threshold = dirty_threshold
+        self.seed = seed  # fixed for recorded sessions so explosions replay identically
+        self._invalidated = []
+        self._full_redraw = True
+        self.load()
+
+    @classmethod
+    def prepare(cls, progress):
+        """Decode/scale the images and build the light masks load() uses (worker thread)."""
+        height = SCREEN_HEIGHT // 4
+
+        def decode_scaled(path, height, scale):
+            base = asset_manager.load_height(path, height, convert=False)
+            asset_manager.load(path, base.get_size(), scale=scale, convert=False)
+
+        jobs = [
+            ('player', lambda: asset_manager.load_height('assets/white.png', height, convert=False)),
+            ('stick figure', lambda: decode_scaled('assets/stick.png', height * 2, 'smooth')),
+            ('mary', lambda: decode_scaled('assets/Scream.png', height * 2, 'smooth')),
+            ('background', lambda: asset_manager.load('assets/background.png', alpha=False, convert=False)),
+            ('projectiles', lambda: asset_manager.load('assets/tnt.png', convert=False)),
+            # Fuse glow and Mary's light (light_radius, gradient_steps, light_alpha)
+            ('lights', lambda: light.warm_up_light_masks([character.ProjectileEntity.FUSE_MASK, EXPLOSION_GLOW,
+                                                          (32, 100, 90)])),
+            ('flashlight', lambda: light.SpotLight(display_surface=(SCREEN_WIDTH, SCREEN_HEIGHT)).create_beam()),
+        ]
+        progress.begin(len(jobs))
+        for stage, job in jobs:
+            job()
+            progress.advance(stage)
+
     def load(self):
         self.character_height = SCREEN_HEIGHT // 4
         self.character_image_path = 'assets/white.png'
@@ -27,29 +70,51 @@ class Scene0(AbstractScene):
         self.bstic_img = load_and_scale('assets/stick.png', self.bstic_height)
 
         self.yr_height = self.character_height * 2
-        self.yr_img = load_and_scale('assets/scream.png', self.yr_height)
+        self.yr_img = load_and_scale('assets/Scream.png', self.yr_height)
+
+        # Entity transforms live in one store; update() runs its systems once per step
+        self.store = EntityStore()
+        self.store.managed = True
 
         self.player = character.Character(
             image_path=self.character_image_path,
             pos=(SCREEN_WIDTH//2 - self.character_img.get_width()//2, SCREEN_HEIGHT - self.character_height // 2),
             width=self.character_img.get_width(),
-            height=self.character_height
+            height=self.character_height,
+            store=self.store
         )
         self.mary = mary.Mary(
-            image_path='assets/scream.png',
+            image_path='assets/Scream.png',
             pos=(SCREEN_WIDTH - SCREEN_WIDTH // 3 - self.bstic_img.get_width() // 2, SCREEN_HEIGHT // 6 - self.bstic_height // 2),
             width=self.yr_img.get_width(),
-            height=self.yr_height
+            height=self.yr_height,
+            store=self.store
         )
         self.stick = stickfigure.stickfigure(
             image_path='assets/stick.png',
             pos=(SCREEN_WIDTH // 2 - self.bstic_img.get_width() // 2, SCREEN_HEIGHT - self.bstic_height * 3 // 2),
             width=self.bstic_img.get_width(),
-            height=self.bstic_height
+            height=self.bstic_height,
+            store=self.store
         )
 
-        self.background = pygame.image.load('assets/background.png').convert()
-        self.entities = CustomGroup(self.player, self.mary, self.stick)
+        self.background = asset_manager.load('assets/background.png', alpha=False)
+        # Background as culled chunks; the camera stays at the origin while the play area is one screen
+        self.camera = Camera(self.background.get_width(), self.background.get_height(), SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.world = World(self.camera, [ChunkedLayer(self.background, alpha=False)])
+        self.entities = CustomGroup(self.player, self.mary, self.stick, camera=self.camera)
+
+        # Broad phase for projectile hits on the targets
+        self.collision = SpatialHash(cell_size=64)
+        self.targets = (self.mary, self.stick)
+        for target in self.targets:
+            self.collision.insert(target, target.rect, TARGET_LAYER)
+        self.player.collision = self.collision
+        self.player.collision_layer = PROJECTILE_LAYER
+
+        # TNT detonations: additive sparks that also light up the darkness overlay
+        self.particles = ParticleEmitter(capacity=8192, additive=True, glow=EXPLOSION_GLOW, seed=self.seed)
+        self.player.effects = self.particles
 
         # Setup lighting stuff here
         self.light_radius = 32
@@ -57,9 +122,11 @@ class Scene0(AbstractScene):
         self.gradient_steps = 100
         self.overlay_color = (20, 30, 50, 120)
 
+        light.warm_up_light_masks([character.ProjectileEntity.FUSE_MASK, EXPLOSION_GLOW])
         self.light_mask = light.circle_light_mask(self.light_radius, self.gradient_steps, self.light_alpha)
         self.flash_light = light.SpotLight(display_surface=(SCREEN_WIDTH, SCREEN_HEIGHT))
         self.beam_mask = self.flash_light.create_beam(debug=False)
+        self._build_lighting()
         self.Button = Button(
                 color=(200, 200, 200, 250),
                 width=150,
@@ -82,38 +149,143 @@ class Scene0(AbstractScene):
 
         self.Button.rect.topleft = (250, 250)  # Position the button
         pygame.draw.rect(self.Button.image, (255, 0, 0), self.Button.image.get_rect(), 1)
+        # Retained UI layer: recomposited only when the button changes state
+        self.ui = UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.ui.add(self.Button)
     
+    def _build_lighting(self):
+        # Screen-sized buffers and baked beam frames: dropped by unload(), rebuilt by reload()
+        self.flash_light.bake(self.beam_mask, quality='medium', lazy=True)
+        self.lighting = LightingCompositor((SCREEN_WIDTH, SCREEN_HEIGHT), self.overlay_color)
+        self.mary_light = self.lighting.add_static_light(self.light_mask, self._mary_light_pos())
+
     def enter(self):
-        pass
-
-    def draw_light_overlay(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill(self.overlay_color)
-        light_pos = (self.player.rect.centerx - self.light_radius, self.player.rect.centery - self.light_radius)
-        fls, flr = self.flash_light.draw(self.beam_mask, pygame.math.Vector2(self.player.rect.center), pygame.Vector2(pygame.mouse.get_pos()))
-        overlay.blit(fls, flr, special_flags=pygame.BLEND_RGBA_SUB)
-        overlay.blit(self.light_mask,(self.mary.rect.centerx+5,self.mary.rect.centery+10),special_flags=pygame.BLEND_RGBA_SUB)
-        self.Button.draw(overlay)
-        pygame.draw.rect(overlay, (255, 0, 0), self.Button.rect, 1)
+        self._full_redraw = True
+
+    def resource_footprint(self):
+        if self.lighting is None:
+            return 0
+        # Images are shared through asset_manager and not counted here
+        return self.lighting.nbytes + self.flash_light.bake_stats().get('bytes', 0)
+
+    def unload(self):
+        self.lighting = None
+        self.flash_light.unbake()
+
+    def reload(self):
+        self._build_lighting()
+        self._full_redraw = True
+
+    def _mary_light_pos(self):
+        return (self.mary.rect.centerx + 5, self.mary.rect.centery + 10)
+
+    def draw_light_overlay(self, frame):
+        with profiler.scope('lighting'):
+            return self._draw_light_overlay(frame)
+
+    def _draw_light_overlay(self, frame):
+        # Static lights only rebake when they move; dynamic ones are redrawn in place
+        self.lighting.move_static_light(self.mary_light, frame['mary_light'])
+        self.lighting.begin_frame()
+        overlay = self.lighting.overlay
+
+        mouse_pos = frame['mouse_pos']
+        player_center = frame['player_center']
+        fls, flr = self.flash_light.draw(self.beam_mask, pygame.math.Vector2(player_center), pygame.Vector2(mouse_pos))
+        self.lighting.add_light(fls, flr, key=(player_center, mouse_pos))
+        self.lighting.mark_dirty(self.ui.draw(overlay), key=self.ui.version)
+        self.lighting.mark_dirty(pygame.draw.rect(overlay, (255, 0, 0), self.Button.rect, 1))
         
         #tnt firecracker
-        for proj in self.player.projectiles:
-            if hasattr(proj, "fuse"):
-                fuse_surf, fuse_rect = proj.fuse()
-                overlay.blit(fuse_surf, fuse_rect, special_flags=pygame.BLEND_RGBA_SUB)
+        for fuse_surf, fuse_rect in frame['fuses']:
+            self.lighting.add_light(fuse_surf, fuse_rect)
+        frame['particles'].draw_light(self.lighting)
 
         return overlay
 
     def update(self, dt):
         self.entities.update(dt, SCREEN_WIDTH, SCREEN_HEIGHT)
-        
+        self.store.integrate(dt)
+        self.store.clamp((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.particles.update(dt)
+        for target in self.targets:
+            self.collision.move(target, target.rect)
+        for proj, target in self.collision.pairs(PROJECTILE_LAYER, TARGET_LAYER):
+            if proj.active:
+                proj.hit()
 
     def draw(self, screen):
-        screen.blit(self.background, (0, 0))
-        self.entities.draw(screen)
-        self.player.projectiles.draw(screen)
-        overlay = self.draw_light_overlay()
+        return self.render(screen, self._frame())
+
+    def capture(self):
+        """
+        Copy what render() reads out of the simulation state (see AbstractScene.capture);
+        None keeps the scene serial while an entity can only draw() itself live.
+        """
+        frame = self._frame()
+        return frame if frame['sprites'] is not None else None
+
+    def _frame(self):
+        self.player.interpolation = self.interpolation
+        self.player.prepare_frame(SCREEN_HEIGHT)
+        return {
+            'sprites': self.entities.capture(),
+            'projectiles': [(proj.image, proj.rect.copy()) for proj in self.player.projectiles],
+            'fuses': [proj.fuse() for proj in self.player.projectiles if hasattr(proj, "fuse")],
+            'particles': self.particles.snapshot(),
+            'player_center': self.player.render_rect.center,
+            'mouse_pos': input_manager.snapshot.mouse_pos,
+            'mary_light': self._mary_light_pos(),
+            'dirty': self.entities.dirty_rects() + self.particles.dirty_rects() if self.dirty_rendering else [],
+        }
+
+    def render(self, screen, frame):
+        if self.dirty_rendering:
+            return self.render_dirty(screen, frame)
+        self._draw_world(screen, frame)
+        overlay = self.draw_light_overlay(frame)
         screen.blit(overlay, (0, 0))
+
+    def _draw_world(self, screen, frame, area=None):
+        self.world.draw(screen, area)
+        if frame['sprites'] is None:
+            self.entities.draw(screen)  # no capture(): only reached by serial draw()
+        else:
+            screen.blits(frame['sprites'], doreturn=False)
+        screen.blits(frame['projectiles'], doreturn=False)
+        frame['particles'].draw(screen)
+
+    def render_dirty(self, screen, frame):
+        """Repaint only changed areas; returns their rects, or None after a full redraw."""
+        overlay = self.draw_light_overlay(frame)
+        rects = frame['dirty'] + self.lighting.dirty_rects() + self._invalidated
+        self._invalidated = []
+        rects = merge_dirty_rects(rects, screen.get_rect(), self.dirty_threshold)
+        if rects is None or self._full_redraw:
+            self._full_redraw = False
+            self._draw_world(screen, frame)
+            screen.blit(overlay, (0, 0))
+            return None
+
+        for rect in rects:
+            screen.set_clip(rect)
+            self._draw_world(screen, frame, rect)
+            screen.blit(overlay, rect, rect)
+        screen.set_clip(None)
+        return rects
+
+    def sim_state(self):
+        store, projectiles, particles = self.store, self.player.projectile_system, self.particles
+        return (store.pos, store.vel, store.alive,
+                projectiles.x, projectiles.y, projectiles.vx, projectiles.vy, projectiles.t,
+                projectiles.death_timer, projectiles.alive,
+                particles.pos, particles.vel, particles.life, self.player.last_shot_time)
+
+    def invalidate(self, rects=None):
+        if rects is None:
+            self._full_redraw = True
+        else:
+            self._invalidated.extend(rects)
         
     def handle_events(self, events):
         """Handle all events"""
@@ -121,15 +293,10 @@ class Scene0(AbstractScene):
         if not isinstance(events, (list, tuple)):
             events = [events]
         
-        # Process button events
-        self.Button.update(events)
+        # Process button events (hit tested through the UI manager's index)
+        self.ui.handle_events(events)
         
-        # Add other event handling here as needed
-        # For example:
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    # Handle space bar press
-                    pass
+        # Other input: subscribe through the input manager instead of scanning events here,
+        # e.g. input_manager.on_action('shoot', handler) or input_manager.subscribe(pygame.KEYDOWN, handler)
     def exit(self):
         pass
\ No newline at end of file
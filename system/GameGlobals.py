@@ -1,3 +1,11 @@
 from system.manager import SceneManager
+from system.asset_manager import AssetManager
+from system.ecs import EntityStore
+from system.input import InputManager, DEFAULT_BINDINGS
+from system.clock import SimulationClock
 
 scene_manager = SceneManager()
+asset_manager = AssetManager()
+entity_store = EntityStore()  # default store for entities created without one
+input_manager = InputManager(DEFAULT_BINDINGS)  # drained once per tick by the Engine
+sim_clock = SimulationClock()  # simulated seconds, advanced by the Engine every step
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 
 class AbstractScene(ABC):
+    interpolation = 1.0  # render blend factor between the last two simulation steps
+    loading_screen = False  # startup timelines keep recording through loading screens (see Engine.run)
+
     @abstractmethod
     def enter(self): pass
 
@@ -15,3 +18,59 @@ class AbstractScene(ABC):
 
     @abstractmethod
     def draw(self, screen): pass
+    # draw() may return a list of changed rects (dirty-rect mode); None means the whole screen
+
+    @classmethod
+    def prepare(cls, progress):
+        """
+        CPU-side loading run on a worker thread by SceneManager.preload():
+        decode files and build caches (AssetManager loads with convert=False,
+        light masks). No display calls here; the constructor, which runs on
+        the main thread afterwards, picks the prepared assets up from the caches.
+        Report work through progress.begin(total) / progress.advance(stage).
+        """
+        pass
+
+    # Scene stack hooks (see SceneManager.push/pop)
+    def suspend(self):
+        """Another scene was pushed on top; state is kept."""
+        pass
+
+    def resume(self):
+        """The scene above was popped; this scene is current again."""
+        pass
+
+    def resource_footprint(self) -> int:
+        """Bytes of re-creatable resources unload() would free."""
+        return 0
+
+    def unload(self):
+        """Free re-creatable resources (buffers, baked frames) while suspended; keep game state."""
+        pass
+
+    def reload(self):
+        """Rebuild what unload() freed, before the scene is shown again."""
+        pass
+
+    def invalidate(self, rects=None):
+        """Ask the scene to repaint rects (everything if None) on its next draw."""
+        pass
+
+    def capture(self):
+        """
+        Copy out of the simulation state everything draw() reads, as data
+        render() can use while the next steps already run on another thread
+        (Engine(pipelined=True)). None, the default, keeps the scene serial.
+        """
+        return None
+
+    def render(self, screen, frame):
+        """
+        Draw a frame returned by capture() without touching simulation state.
+        The default draws the live scene, for scenes whose capture() is None.
+        """
+        return self.draw(screen)
+
+    def sim_state(self):
+        """Arrays (or numbers) holding the simulation state; replays checksum them every frame."""
+        return ()
@@ -0,0 +1,166 @@
+#asset cache
+import threading
+from collections import OrderedDict
+import pygame
+from system.startup import timeline
+
+
+class AssetManager:
+    """
+    Central image cache. Every loader should go through here so a file is
+    decoded and converted once and each scaled variant is built once.
+
+    Entries are keyed by (path, size, scale mode, alpha, convert) and evicted
+    least-recently-used first once the cached pixel data exceeds the budget.
+    Returned surfaces are shared between callers: copy() before drawing on them.
+
+    Loads with convert=False never touch the display, so they can run on a
+    worker thread (see SceneManager.preload); a later converted load of the
+    same key then converts the already decoded surface instead of the file.
+
+    mount() adds a baked archive (python -m system.bake): keys it holds are
+    served from its memory-mapped pixels instead of decoding and scaling.
+    """
+
+    SCALE_MODES = {
+        'scale': pygame.transform.scale,
+        'smooth': pygame.transform.smoothscale,
+    }
+
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024):
+        """
+        Parameters:
+        - budget_bytes (int): Maximum bytes of pixel data kept in the cache.
+        """
+        self.budget_bytes = budget_bytes
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._archives = []
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        """Return the size of a surface's pixel buffer in bytes."""
+        return surface.get_pitch() * surface.get_height()
+
+    @staticmethod
+    def height_size(size: tuple, height: int) -> tuple:
+        """Size load_height() scales an image of the given size to."""
+        return int(size[0] * (height / size[1])), int(height)
+
+    def mount(self, path: str):
+        """
+        Serve loads from a baked archive and seed the light mask cache with
+        its masks. Entries whose source file changed since the bake are
+        ignored, so a stale archive only costs the decode it would save.
+
+        Returns:
+        - AssetArchive: The mounted archive
+        """
+        from system.bake import AssetArchive
+        from renderer import Light as light
+        archive = AssetArchive(path)
+        with self._lock:
+            self._archives.append(archive)
+        light.add_light_masks(archive.light_masks())
+        return archive
+
+    def _baked(self, key):
+        for archive in self._archives:
+            surface = archive.image(key)
+            if surface is not None:
+                return surface
+        return None
+
+    def _decode(self, path, alpha, convert):
+        image = pygame.image.load(path)
+        if convert:
+            image = image.convert_alpha() if alpha else image.convert()
+        return image
+
+    def _store(self, key, surface):
+        self._cache[key] = surface
+        self._bytes += self.surface_bytes(surface)
+        # Never evict the entry that was just inserted
+        while self._bytes > self.budget_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._bytes -= self.surface_bytes(evicted)
+            self.evictions += 1
+
+    def load(self, path: str, size: tuple = None, *, scale: str = 'scale',
+             alpha: bool = True, convert: bool = True) -> pygame.Surface:
+        """
+        Return the image at path, optionally scaled to size.
+
+        Parameters:
+        - path (str): Image file path
+        - size (tuple): Optional (width, height) to scale to
+        - scale (str): 'scale' or 'smooth' (smoothscale); ignored without size
+        - alpha (bool): convert_alpha() instead of convert()
+        - convert (bool): Convert to the display format (needs a display mode)
+
+        Returns:
+        - pygame.Surface: The cached surface (shared, do not draw on it)
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+            if scale not in self.SCALE_MODES:
+                raise ValueError(f"scale must be one of {tuple(self.SCALE_MODES)}")
+        key = (path, size, scale if size else None, alpha, convert)
+
+        with self._lock:
+            surface = self._cache.get(key)
+            if surface is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+            decoded = self._cache.get(key[:-1] + (False,)) if convert else None
+
+        # Decode/scale outside the lock so a preload thread never stalls cache hits
+        with timeline.phase(f'asset {path}'):
+            baked = self._baked(key[:-1]) if decoded is None and self._archives else None
+            if decoded is not None:
+                # Preloaded off-thread: only the display conversion is left
+                surface = decoded.convert_alpha() if alpha else decoded.convert()
+            elif baked is not None:
+                # Already scaled raw pixels; converting copies them out of the mapping
+                surface = (baked.convert_alpha() if alpha else baked.convert()) if convert else baked
+            elif size is None:
+                surface = self._decode(path, alpha, convert)
+            else:
+                base = self.load(path, alpha=alpha, convert=convert)
+                surface = self.SCALE_MODES[scale](base, size)
+        with self._lock:
+            if key not in self._cache:
+                self._store(key, surface)
+            return self._cache[key]
+
+    def load_height(self, path: str, height: int, **kwargs) -> pygame.Surface:
+        """Load an image scaled to height, keeping its aspect ratio."""
+        alpha = kwargs.get('alpha', True)
+        # A mounted archive knows the native size without loading the full-size image
+        size = next((s for s in (a.image_size(path, alpha) for a in self._archives) if s is not None), None)
+        if size is None:
+            size = self.load(path, alpha=alpha, convert=kwargs.get('convert', True)).get_size()
+        return self.load(path, self.height_size(size, height), **kwargs)
+
+    def clear(self):
+        """Drop every cached surface (stats are kept)."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and the current byte usage."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._cache),
+            'bytes': self._bytes,
+            'budget_bytes': self.budget_bytes,
+        }
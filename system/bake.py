@@ -0,0 +1,248 @@
+#asset bake: pre-scaled pixels and light masks in one memory-mapped archive
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import pygame
+from system.asset_manager import AssetManager
+
+MAGIC = b'PMEPAK'
+VERSION = 1  # bump when the blob layout or a builder changes; every hash changes with it
+_HEADER = struct.Struct('<6sHQQ')  # magic, version, index offset, index length
+ALIGN = 64  # blob alignment inside the archive
+PIXEL_FORMAT = 'BGRA'  # byte order of SRCALPHA/convert_alpha() surfaces on little-endian machines
+
+DEFAULT_MANIFEST = 'assets/bake.json'
+DEFAULT_ARCHIVE = 'assets/baked.pak'
+
+
+def _as_key(value):
+    # JSON turns the tuples of cache keys into lists; keys need them back as tuples
+    return tuple(_as_key(v) for v in value) if isinstance(value, list) else value
+
+
+def _light_module():
+    from renderer import Light as light
+    return light
+
+
+def _jobs(manifest: dict) -> list:
+    """Expand a bake manifest into one job per baked surface."""
+    jobs = []
+    for image in manifest.get('images', ()):
+        path = image['path']
+        alpha = image.get('alpha', True)
+        jobs.append({'kind': 'image', 'source': path, 'alpha': alpha})
+        scales = image.get('scale', 'scale')
+        for scale in [scales] if isinstance(scales, str) else scales:
+            if 'height' in image:
+                jobs.append({'kind': 'image', 'source': path, 'alpha': alpha, 'height': image['height'], 'scale': scale})
+            elif 'size' in image:
+                jobs.append({'kind': 'image', 'source': path, 'alpha': alpha, 'size': image['size'], 'scale': scale})
+    # Masks depend on the light module's builders, so it is their source file
+    light_source = os.path.relpath(_light_module().__file__)
+    for spec in manifest.get('circle_masks', ()):
+        jobs.append({'kind': 'circle', 'source': light_source, 'spec': list(spec)})
+    for beam in manifest.get('beams', ()):
+        jobs.append({'kind': 'beam', 'source': light_source, 'display_surface': list(beam['display_surface']),
+                     'angle': beam.get('angle'), 'alpha': beam.get('alpha', 90), 'steps': beam.get('steps', 90)})
+    return jobs
+
+
+def _job_hash(job) -> str:
+    digest = hashlib.sha256(json.dumps([VERSION, job], sort_keys=True).encode())
+    with open(job['source'], 'rb') as file:
+        digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _bake_job(job):
+    """Build one job's surface (runs in a worker process) -> (kind, key, size, pixel bytes)."""
+    kind = job['kind']
+    if kind == 'image':
+        surface = pygame.image.load(job['source'])
+        size = None
+        if 'height' in job:
+            size = AssetManager.height_size(surface.get_size(), job['height'])
+        elif 'size' in job:
+            size = (int(job['size'][0]), int(job['size'][1]))
+        if size is not None:
+            surface = AssetManager.SCALE_MODES[job['scale']](surface, size)
+        # Same key as AssetManager.load() minus the convert flag
+        key = (job['source'], size, job['scale'] if size else None, job['alpha'])
+    else:
+        light = _light_module()
+        if kind == 'circle':
+            surface = light.circle_light_mask(*job['spec'])
+            key = light.circle_mask_key(*job['spec'])
+        else:
+            spot = light.SpotLight(angle=job['angle'], display_surface=tuple(job['display_surface']))
+            surface = spot.create_beam(alpha=job['alpha'], steps=job['steps'])
+            key = spot.beam_key(alpha=job['alpha'], steps=job['steps'])
+        kind = 'mask'
+    return kind, key, surface.get_size(), pygame.image.tobytes(surface, PIXEL_FORMAT)
+
+
+class AssetArchive:
+    """
+    A baked archive, memory-mapped once. Surfaces are built straight from the
+    mapping with pygame.image.frombuffer, so a load pages in raw pixels
+    instead of decoding and scaling a file.
+
+    The mapping is copy-on-write: a surface that is drawn on by mistake
+    changes this process's copy of the page, never the file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+        - path (str): Archive written by bake()
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, offset, length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} asset archive")
+        self._view = memoryview(self._map)
+        self.entries = json.loads(bytes(self._view[offset:offset + length]))['entries']
+        self.images = {}  # AssetManager key without convert -> entry
+        self.masks = {}  # light cache key -> entry
+        self.stale = 0  # entries skipped because their source changed since the bake
+        sources = {}
+        for entry in self.entries:
+            source = entry['source']
+            if source['path'] not in sources:
+                try:
+                    stat = os.stat(source['path'])
+                    sources[source['path']] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    sources[source['path']] = None
+            if sources[source['path']] != (source['mtime_ns'], source['bytes']):
+                self.stale += 1
+                continue
+            table = self.images if entry['kind'] == 'image' else self.masks
+            table[_as_key(entry['key'])] = entry
+
+    def __len__(self):
+        return len(self.images) + len(self.masks)
+
+    def surface(self, entry) -> pygame.Surface:
+        """Surface over an entry's mapped pixels (no copy)."""
+        pixels = self._view[entry['offset']:entry['offset'] + entry['nbytes']]
+        return pygame.image.frombuffer(pixels, tuple(entry['size']), entry['format'])
+
+    def image(self, key) -> pygame.Surface:
+        """Baked image for an AssetManager key without its convert flag, or None."""
+        entry = self.images.get(key)
+        return self.surface(entry) if entry is not None else None
+
+    def image_size(self, path: str, alpha: bool = True) -> tuple:
+        """Native size of a baked image, or None."""
+        entry = self.images.get((path, None, None, alpha))
+        return tuple(entry['size']) if entry is not None else None
+
+    def light_masks(self):
+        """(key, surface) for every baked light mask (see Light.add_light_masks)."""
+        return [(key, self.surface(entry)) for key, entry in self.masks.items()]
+
+    def blob(self, entry) -> bytes:
+        return bytes(self._view[entry['offset']:entry['offset'] + entry['nbytes']])
+
+
+def bake(manifest_path: str = DEFAULT_MANIFEST, out: str = DEFAULT_ARCHIVE, *,
+         workers: int = None, force: bool = False) -> dict:
+    """
+    Build the archive described by a manifest.
+
+    Jobs are hashed over the job description and its source file; entries of
+    an existing archive whose hash is unchanged are copied over instead of
+    rebuilt, and the rest are decoded, scaled and rasterized by a process
+    pool. The archive is written next to out and renamed over it when done.
+
+    Parameters:
+    - manifest_path (str): JSON manifest (images, circle_masks, beams)
+    - out (str): Archive path
+    - workers (int): Worker processes (None: one per CPU)
+    - force (bool): Rebuild every entry
+
+    Returns:
+    - dict: built/reused entry counts, archive bytes and seconds taken
+    """
+    # Imported here: games import this module for mounting and should not pay for multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    start = time.perf_counter()
+    with open(manifest_path) as file:
+        jobs = _jobs(json.load(file))
+    hashes = [_job_hash(job) for job in jobs]
+
+    previous = {}
+    old = None
+    if not force and os.path.exists(out):
+        try:
+            old = AssetArchive(out)
+            previous = {entry['hash']: entry for entry in old.entries}
+        except ValueError:
+            old = None
+
+    todo = [job for job, digest in zip(jobs, hashes) if digest not in previous]
+    built = {}
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for job, result in zip(todo, pool.map(_bake_job, todo)):
+                built[id(job)] = result
+
+    entries = []
+    tmp = out + '.tmp'
+    with open(tmp, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+        for job, digest in zip(jobs, hashes):
+            if id(job) in built:
+                kind, key, size, data = built[id(job)]
+            else:
+                entry = previous[digest]
+                kind, key, size, data = entry['kind'], entry['key'], entry['size'], old.blob(entry)
+            file.write(b'\0' * (-file.tell() % ALIGN))
+            stat = os.stat(job['source'])
+            entries.append({
+                'kind': kind, 'key': key, 'hash': digest, 'offset': file.tell(), 'nbytes': len(data),
+                'size': list(size), 'format': PIXEL_FORMAT,
+                'source': {'path': job['source'], 'mtime_ns': stat.st_mtime_ns, 'bytes': stat.st_size},
+            })
+            file.write(data)
+        index = json.dumps({'entries': entries}).encode()
+        offset = file.tell()
+        file.write(index)
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, VERSION, offset, len(index)))
+    old = previous = None  # release the old mapping before replacing the file
+    os.replace(tmp, out)
+    return {
+        'entries': len(entries),
+        'built': len(todo),
+        'reused': len(entries) - len(todo),
+        'bytes': os.path.getsize(out),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m system.bake',
+                                     description='Bake scaled images and light masks into one archive.')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help='bake manifest (JSON)')
+    parser.add_argument('--out', default=DEFAULT_ARCHIVE, help='archive to write')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='rebuild every entry')
+    args = parser.parse_args(argv)
+    result = bake(args.manifest, args.out, workers=args.workers, force=args.force)
+    print(f"{args.out}: {result['entries']} entries ({result['built']} built, {result['reused']} reused), "
+          f"{result['bytes'] / 1e6:.1f} MB in {result['seconds']:.2f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
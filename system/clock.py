@@ -0,0 +1,36 @@
+#game clocks
+import pygame
+
+
+class SimulationClock:
+    """
+    Seconds of simulated time, advanced by the Engine once per fixed step.
+
+    Gameplay timers (cooldowns, fuses) read this instead of the wall clock,
+    so a replayed session sees exactly the times the recording saw.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.time = start
+
+    def now(self) -> float:
+        return self.time
+
+    def advance(self, dt: float):
+        self.time += dt
+
+    def reset(self, time: float = 0.0):
+        self.time = time
+
+
+class WallClock:
+    """Seconds since pygame.init(); for timers that should follow real time (not replayable)."""
+
+    def now(self) -> float:
+        return pygame.time.get_ticks() / 1000
+
+    def advance(self, dt: float):
+        pass
+
+    def reset(self, time: float = 0.0):
+        pass
@@ -0,0 +1,152 @@
+#entity component store
+import numpy as np
+import pygame
+
+
+class EntityStore:
+    """
+    Packed component arrays for sprite-like entities.
+
+    Transforms, velocities and sizes live in NumPy arrays indexed by entity
+    id, images in a parallel list. Systems (integrate, clamp, draw, projectile
+    spawning) are batched passes over every live entity instead of one
+    update()/draw() call per sprite. Ids are recycled through a free list.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Parameters:
+        - capacity (int): Initial number of slots (grows by doubling)
+        """
+        self._capacity = 0
+        self._high = 0  # one past the highest id ever used
+        self._free = []
+        self.images = []
+        # When True an owner (usually the scene) runs the systems for every
+        # entity once per step; adapters then only feed input
+        self.managed = False
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity):
+        old = self._capacity
+
+        def resized(array, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if old:
+                new[:old] = array
+            return new
+
+        self.pos = resized(getattr(self, 'pos', None), (capacity, 2), np.float64)
+        self.prev_pos = resized(getattr(self, 'prev_pos', None), (capacity, 2), np.float64)
+        self.vel = resized(getattr(self, 'vel', None), (capacity, 2), np.float64)
+        self.size = resized(getattr(self, 'size', None), (capacity, 2), np.int32)
+        self.clamped = resized(getattr(self, 'clamped', None), capacity, np.bool_)  # kept inside bounds
+        self.alive = resized(getattr(self, 'alive', None), capacity, np.bool_)
+        self.images.extend([None] * (capacity - old))
+
+        # Hand out low ids first so the live range stays compact
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        return self._capacity - len(self._free)
+
+    def create(self, image: pygame.Surface, pos=(0, 0), velocity=(0, 0), clamp: bool = True) -> int:
+        """
+        Add an entity and return its id.
+
+        Parameters:
+        - image (pygame.Surface): Sprite image (also sets the entity size)
+        - pos (tuple): Top-left position
+        - velocity (tuple): Pixels per second
+        - clamp (bool): Keep the entity inside the bounds given to clamp()
+        """
+        if not self._free:
+            self._grow(self._capacity * 2)
+        e = self._free.pop()
+        self._high = max(self._high, e + 1)
+        self.pos[e] = pos
+        self.prev_pos[e] = pos
+        self.vel[e] = velocity
+        self.clamped[e] = clamp
+        self.alive[e] = True
+        self.set_image(e, image)
+        return e
+
+    def destroy(self, e: int):
+        if self.alive[e]:
+            self.alive[e] = False
+            self.images[e] = None
+            self._free.append(e)
+
+    def set_image(self, e: int, image: pygame.Surface):
+        self.images[e] = image
+        self.size[e] = image.get_size()
+
+    def set_position(self, e: int, x: float, y: float):
+        """Teleport (no interpolation from the old position)."""
+        self.pos[e] = (x, y)
+        self.prev_pos[e] = (x, y)
+
+    def live_indices(self) -> np.ndarray:
+        return np.flatnonzero(self.alive[:self._high])
+
+    def _indices(self, indices):
+        return self.live_indices() if indices is None else np.asarray(indices, dtype=np.intp)
+
+    def rect(self, e: int) -> pygame.Rect:
+        """Integer rect at the current position (a new Rect each call)."""
+        x, y = self.pos[e]
+        return pygame.Rect(round(x), round(y), int(self.size[e, 0]), int(self.size[e, 1]))
+
+    def render_positions(self, interpolation: float = 1.0, indices=None) -> np.ndarray:
+        """Top-left pixel positions blended between the last two steps."""
+        idx = self._indices(indices)
+        alpha = max(0.0, min(1.0, interpolation))
+        pos = self.prev_pos[idx] + (self.pos[idx] - self.prev_pos[idx]) * alpha
+        return np.rint(pos).astype(np.int64)
+
+    def render_rect(self, e: int, interpolation: float = 1.0) -> pygame.Rect:
+        x, y = self.render_positions(interpolation, [e])[0].tolist()
+        return pygame.Rect(x, y, int(self.size[e, 0]), int(self.size[e, 1]))
+
+    def centers(self, indices=None) -> np.ndarray:
+        idx = self._indices(indices)
+        return self.pos[idx] + self.size[idx] / 2
+
+    # Systems
+    def integrate(self, dt: float, indices=None):
+        """Movement system: pos += vel * dt (prev_pos keeps the last step)."""
+        idx = self._indices(indices)
+        self.prev_pos[idx] = self.pos[idx]
+        self.pos[idx] += self.vel[idx] * dt
+
+    def clamp(self, bounds, indices=None):
+        """Clamp system: keep clamped entities inside bounds (centred if larger, like Rect.clamp)."""
+        bounds = pygame.Rect(bounds)
+        idx = self._indices(indices)
+        idx = idx[self.clamped[idx]]
+        if not idx.size:
+            return
+        origin = np.array(bounds.topleft, dtype=np.float64)
+        extent = np.array(bounds.size, dtype=np.float64)
+        size = self.size[idx]
+        pos = self.pos[idx]
+        fits = size <= extent
+        limit = origin + extent - size
+        self.pos[idx] = np.where(fits, np.clip(pos, origin, np.maximum(origin, limit)),
+                                 origin + (extent - size) // 2)
+
+    def draw(self, surface: pygame.Surface, interpolation: float = 1.0, indices=None):
+        """Draw system: blit every (or the given) entity with one Surface.blits call."""
+        idx = self._indices(indices)
+        if not idx.size:
+            return
+        positions = self.render_positions(interpolation, idx).tolist()
+        images = self.images
+        surface.blits([(images[e], pos) for e, pos in zip(idx.tolist(), positions)], doreturn=False)
@@ -0,0 +1,247 @@
+#engine loop
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from renderer.profiler import NULL_SCOPE
+from system.startup import timeline
+from system.GameGlobals import input_manager as default_input_manager, sim_clock as default_sim_clock
+
+
+class Engine:
+    """
+    Fixed-timestep game loop driving a SceneManager.
+
+    Simulation always advances in steps of `step` seconds using an
+    accumulator; rendering happens once per loop with an interpolation factor
+    (0..1) telling scenes how far they are between the last two ticks.
+
+    Pipelined, the steps run on a worker thread while the main thread renders
+    the frame the scene captured at the end of the previous steps; blits,
+    transforms and NumPy release the GIL, so on several cores a loop costs
+    about max(update, draw) instead of their sum.
+    """
+    PIPELINES = ('throughput', 'latency')
+
+    def __init__(self, scene_manager, screen: pygame.Surface = None, *, step: float = 1 / 60,
+                 fps: int = 60, max_frame_time: float = 0.25, max_steps: int = 5,
+                 headless: bool = False, render: bool = None, framerate_display=None,
+                 profiler=None, input_manager=None, sim_clock=None, recorder=None,
+                 pipelined: bool = False, pipeline: str = 'throughput',
+                 pause_key: int = pygame.K_e, quit_key: int = pygame.K_ESCAPE):
+        """
+        Parameters:
+        - scene_manager (SceneManager): Scenes to drive
+        - screen (pygame.Surface): Display surface (default: pygame.display.get_surface())
+        - step (float): Simulation step in seconds
+        - fps (int): Frame cap; 0 runs uncapped (use with a vsync display)
+        - max_frame_time (float): Longest frame fed to the accumulator (after a hitch)
+        - max_steps (int): Most simulation steps per frame; the rest of the backlog
+          is dropped so a slow frame cannot snowball (spiral of death)
+        - headless (bool): Run one step per loop as fast as possible, no frame cap
+        - render (bool): Draw frames; defaults to False headless, True otherwise
+        - framerate_display (FrameRateDisplay): Optional HUD drawn over the scene
+        - profiler (FrameProfiler): Optional; times the events/update/draw/ui/flip stages
+        - input_manager (InputManager): Drained once per loop (default: GameGlobals.input_manager)
+        - sim_clock (SimulationClock): Advanced by every step (default: GameGlobals.sim_clock)
+        - recorder (InputRecorder): Optional; logs every loop's frame time and input for replay
+        - pipelined (bool): Simulate on a worker thread while rendering the last captured
+          frame; loops whose scene cannot capture() (or headless runs) stay serial
+        - pipeline (str): 'throughput' overlaps the whole render with the next steps (input
+          shows one frame later); 'latency' starts the steps after the flip, overlapping
+          only the frame-cap wait, so frames are as fresh as serial ones
+        - pause_key / quit_key (int): Keys toggling pause / stopping the loop
+        """
+        self.scene_manager = scene_manager
+        self.screen = screen or pygame.display.get_surface()
+        self.step = step
+        self.fps = fps
+        self.max_frame_time = max_frame_time
+        self.max_steps = max_steps
+        self.headless = headless
+        self.render = (not headless) if render is None else render
+        self.framerate_display = framerate_display
+        self.profiler = profiler.activate() if profiler is not None else None
+        self.input_manager = input_manager or default_input_manager
+        self.sim_clock = sim_clock or default_sim_clock
+        self.recorder = recorder
+        if pipeline not in self.PIPELINES:
+            raise ValueError(f"pipeline must be one of {self.PIPELINES}")
+        self.pipelined = pipelined
+        self.pipeline = pipeline
+        self.pause_key = pause_key
+        self.quit_key = quit_key
+
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0.0
+        self.ticks = 0  # simulation steps run so far
+        self.frames = 0
+        self.dropped_time = 0.0  # simulation time discarded by the spiral-of-death cap
+        self.running = False
+        self.paused = False
+        self._worker = None  # single simulation thread, started by the first pipelined loop
+        self._simulation = None  # (future, frame_time, snapshot) of the steps in flight
+
+    @staticmethod
+    def create_display(size: tuple, *, fullscreen: bool = False, vsync: bool = False,
+                       headless: bool = False) -> pygame.Surface:
+        """Initialise pygame and open the display (SDL dummy video driver when headless)."""
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        pygame.init()
+        flags = pygame.FULLSCREEN if fullscreen and not headless else 0
+        if vsync and not headless:
+            # vsync needs a renderer-backed window
+            flags |= pygame.SCALED
+        return pygame.display.set_mode(size, flags, vsync=int(vsync and not headless))
+
+    @property
+    def interpolation(self) -> float:
+        """Fraction of a step left in the accumulator (render blend factor)."""
+        return self.accumulator / self.step
+
+    def handle_events(self, events=None, mouse_pos=None):
+        # One drain per loop; subscribers are dispatched while the snapshot is built
+        snapshot = self.input_manager.poll(events, mouse_pos)
+        if snapshot.has(pygame.QUIT) or self.quit_key in snapshot.pressed:
+            self.running = False
+        if self.pause_key in snapshot.pressed:
+            self.paused = not self.paused
+        self.scene_manager.handle_events(list(snapshot.events))
+        return snapshot
+
+    def simulate(self, frame_time: float):
+        """Feed frame_time into the accumulator and run the due fixed steps."""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = 0
+        while self.accumulator >= self.step and steps < self.max_steps:
+            self.sim_clock.advance(self.step)
+            self.scene_manager.update(self.step)
+            self.accumulator -= self.step
+            self.ticks += 1
+            steps += 1
+        if self.accumulator >= self.step:
+            # Too far behind: drop the backlog instead of trying to catch up
+            self.dropped_time += self.accumulator - self.accumulator % self.step
+            self.accumulator %= self.step
+        return steps
+
+    def _scope(self, name):
+        return self.profiler.scope(name) if self.profiler is not None else NULL_SCOPE
+
+    def _simulate_timed(self, frame_time):
+        start = time.perf_counter()
+        self.simulate(frame_time)
+        return (time.perf_counter() - start) * 1000
+
+    def finish(self):
+        """Wait for steps running on the worker thread; state is consistent afterwards."""
+        if self._simulation is None:
+            return
+        future, frame_time, snapshot = self._simulation
+        self._simulation = None
+        update_ms = future.result()  # re-raises anything the steps raised
+        # Scopes are not thread-safe, so the worker's time is booked here
+        if self.profiler is not None:
+            self.profiler.add('update', update_ms)
+        if self.recorder is not None:
+            self.recorder.record(frame_time, snapshot)
+
+    def draw(self, captured=None):
+        """Render the current state, or a frame from SceneManager.capture()."""
+        with self._scope('draw'):
+            if captured is None:
+                rects = self.scene_manager.draw(self.screen, self.interpolation)
+            else:
+                rects = self.scene_manager.render(self.screen, captured)
+        with self._scope('ui'):
+            hud_rects = self.framerate_display.draw(self.screen, self.clock) if self.framerate_display else []
+        with self._scope('flip'):
+            if rects is None:
+                pygame.display.flip()
+            else:
+                # Dirty-rect mode: push only changed areas, repaint under the HUD next frame
+                pygame.display.update(rects + hud_rects)
+                if hud_rects:
+                    self.scene_manager.invalidate(hud_rects)
+        self.frames += 1
+
+    def tick(self, frame_time: float = None, events=None, mouse_pos=None):
+        """
+        Run one loop iteration: events, due simulation steps, one render.
+
+        frame_time, events and mouse_pos replay a recorded frame in place of
+        the clock, the SDL queue and the pointer (see system.replay).
+        """
+        if frame_time is not None:
+            self.clock.tick()
+        elif self.headless:
+            self.clock.tick()
+            frame_time = self.step
+        else:
+            frame_time = self.clock.tick(self.fps) / 1000
+        # The profiled frame excludes the clock's sleep, so it measures work only
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+        if self.pipelined and self.render:
+            self._tick_pipelined(frame_time, events, mouse_pos)
+        else:
+            with self._scope('events'):
+                snapshot = self.handle_events(events, mouse_pos)
+            if not self.paused:
+                with self._scope('update'):
+                    self.simulate(frame_time)
+                if self.render:
+                    self.draw()
+            if self.recorder is not None:
+                self.recorder.record(frame_time, snapshot)
+        if self.profiler is not None:
+            self.profiler.end_frame()
+
+    def _tick_pipelined(self, frame_time, events, mouse_pos):
+        # Handoff: the previous steps are done, so the scene captures a consistent frame
+        with self._scope('sync'):
+            self.finish()
+        self.scene_manager.poll()  # scenes are built on the main thread
+        captured = None if self.paused else self.scene_manager.capture(self.interpolation)
+        if captured is not None and self.pipeline == 'latency':
+            self.draw(captured)
+        with self._scope('events'):
+            snapshot = self.handle_events(events, mouse_pos)
+        if self.paused:
+            if self.recorder is not None:
+                self.recorder.record(frame_time, snapshot)
+            return
+        if captured is None:
+            # Nothing captured to render alongside the steps: run this loop serially
+            with self._scope('update'):
+                self.simulate(frame_time)
+            self.draw()
+            if self.recorder is not None:
+                self.recorder.record(frame_time, snapshot)
+            return
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='simulation')
+        self._simulation = (self._worker.submit(self._simulate_timed, frame_time), frame_time, snapshot)
+        if self.pipeline == 'throughput':
+            self.draw(captured)
+
+    def run(self, max_ticks: int = None):
+        """Loop until quit (or until max_ticks simulation steps have run)."""
+        self.running = True
+        self.clock.tick()
+        startup_scene = None
+        while self.running:
+            self.tick()
+            if timeline.active:
+                # The startup timeline ends with the first frame of the first gameplay scene
+                scene = self.scene_manager.current_scene
+                if scene is not startup_scene:
+                    startup_scene = scene
+                    timeline.mark(f'first frame {type(scene).__name__}')
+                    if not getattr(scene, 'loading_screen', False):
+                        timeline.finish()
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+        self.finish()
+        self.running = False
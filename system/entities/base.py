@@ -0,0 +1,161 @@
+#sprite adapter over the entity store
+import pygame
+from system.GameGlobals import entity_store
+
+
+class StoreRect(pygame.Rect):
+    """
+    StoreSprite.rect: in-place changes (rect.x += 5, rect.center = ...,
+    rect.clamp_ip(...)) teleport the entity in its store, like
+    set_position(). Only the axes that changed are written, so the other
+    keeps its sub-pixel position. The size follows the image; resizing
+    raises ValueError. Rects derived from it (move(), copy(), ...) are
+    detached and change nothing.
+    """
+
+    def __init__(self, sprite, rect):
+        super().__init__(rect)
+        self._sprite = sprite
+        self._origin = (self.x, self.y)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            self._write_back()
+
+    def _write_back(self):
+        sprite = self.__dict__.get('_sprite')
+        if sprite is None:
+            return
+        if self.size != (sprite.width, sprite.height):
+            raise ValueError("a StoreSprite's rect size follows its image; set image instead")
+        x, y = sprite.store.pos[sprite.entity].tolist()
+        if self.x != self._origin[0]:
+            x = self.x
+        if self.y != self._origin[1]:
+            y = self.y
+        sprite.set_position(x, y)
+        self._origin = (self.x, self.y)
+
+
+def _write_back_after(name):
+    method = getattr(pygame.Rect, name)
+
+    def in_place(self, *args, **kwargs):
+        method(self, *args, **kwargs)
+        self._write_back()
+    in_place.__name__ = name
+    return in_place
+
+
+for _name in ('move_ip', 'inflate_ip', 'scale_by_ip', 'update', 'clamp_ip', 'union_ip', 'unionall_ip', 'normalize'):
+    setattr(StoreRect, _name, _write_back_after(_name))
+
+
+class StoreSprite(pygame.sprite.Sprite):
+    """
+    Thin pygame Sprite whose transform and image live in an EntityStore.
+
+    rect, pos and velocity are views computed from the store's arrays (rect
+    and velocity write back), so groups, collision and dirty-rect code keep
+    working unchanged. When the store is managed, the owner runs the
+    movement/clamp systems for every entity at once and update() only feeds
+    input; otherwise update() runs them for this entity alone.
+    """
+
+    def __init__(self, image: pygame.Surface, pos=(0, 0), store=None, clamp: bool = True):
+        """
+        Parameters:
+        - image (pygame.Surface): Sprite image
+        - pos (tuple): Top-left position
+        - store (EntityStore): Store to live in (default: GameGlobals.entity_store)
+        - clamp (bool): Keep inside the screen in update()
+        """
+        super().__init__()
+        self.store = store if store is not None else entity_store
+        self.entity = self.store.create(image, pos, clamp=clamp)
+        self.interpolation = 1.0
+
+    @property
+    def image(self) -> pygame.Surface:
+        return self.store.images[self.entity]
+
+    @image.setter
+    def image(self, image: pygame.Surface):
+        self.store.set_image(self.entity, image)
+
+    @property
+    def rect(self) -> StoreRect:
+        """Integer rect at the current position; changing it in place moves the entity (see StoreRect)."""
+        return StoreRect(self, self.store.rect(self.entity))
+
+    @rect.setter
+    def rect(self, rect):
+        rect = pygame.Rect(rect)
+        if rect.size != (self.width, self.height):
+            raise ValueError("a StoreSprite's rect size follows its image; set image instead")
+        self.set_position(rect.x, rect.y)
+
+    @property
+    def pos(self) -> pygame.Vector2:
+        return pygame.Vector2(self.store.pos[self.entity].tolist())
+
+    @property
+    def prev_pos(self) -> pygame.Vector2:
+        return pygame.Vector2(self.store.prev_pos[self.entity].tolist())
+
+    @property
+    def velocity(self) -> pygame.Vector2:
+        return pygame.Vector2(self.store.vel[self.entity].tolist())
+
+    @velocity.setter
+    def velocity(self, velocity):
+        self.store.vel[self.entity] = tuple(velocity)
+
+    @property
+    def width(self):
+        return int(self.store.size[self.entity, 0])
+
+    @property
+    def height(self):
+        return int(self.store.size[self.entity, 1])
+
+    @property
+    def render_rect(self) -> pygame.Rect:
+        """rect at the position blended between the last two steps by interpolation."""
+        return self.store.render_rect(self.entity, self.interpolation)
+
+    @property
+    def draw_bounds(self) -> pygame.Rect:
+        return self.render_rect
+
+    def update(self, dt, screen_width, screen_height):
+        if not self.store.managed:
+            self.store.integrate(dt, [self.entity])
+            self.store.clamp((0, 0, screen_width, screen_height), [self.entity])
+
+    def draw(self, surface, offset=(0, 0)):
+        """Blit at render_rect (offset: camera position, see CustomGroup)."""
+        surface.blit(self.image, self.render_rect.move(-offset[0], -offset[1]))
+
+    def capture(self):
+        """The blits draw() makes, as plain (image, rect) data (see CustomGroup.capture)."""
+        return [(self.image, self.render_rect)]
+
+    def set_position(self, x, y):
+        self.store.set_position(self.entity, x, y)
+
+    def move(self, dx, dy):
+        x, y = self.store.pos[self.entity].tolist()
+        self.store.set_position(self.entity, x + dx, y + dy)
+
+    def kill(self):
+        """Leave every group and free the entity's slot in the store (the sprite is dead afterwards)."""
+        super().kill()
+        if self.entity is not None:
+            self.store.destroy(self.entity)
+            # The slot is recycled by the next create(); this sprite must not reach it again
+            self.entity = None
+
+    def animation(self):
+        pass
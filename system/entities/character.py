@@ -1,133 +1,210 @@
 #main character and projectile
 import math
 import pygame
-from physics_engine.tract import projectile
+from physics_engine.projectile_system import ProjectileSystem
 import renderer.Light as light
-
-class Character(pygame.sprite.Sprite):
-    def __init__(self, image_path, pos=(0, 0), width=None, height=None):
-        super().__init__()
-        self.image = pygame.image.load(image_path).convert_alpha()
-
+from renderer.group_overide import offset_blits
+from renderer.trajectory import TrajectoryPreview
+from system.GameGlobals import asset_manager, input_manager, sim_clock
+from system.entities.base import StoreSprite
+from system.pool import ObjectPool
+
+class Character(StoreSprite):
+    def __init__(self, image_path, pos=(0, 0), width=None, height=None, store=None):
         if width and height:
-            self.image = pygame.transform.scale(self.image, (width, height))
-
-        self.rect = self.image.get_rect(topleft=pos)
-        self.velocity = pygame.Vector2(0, 0)
+            image = asset_manager.load(image_path, (width, height))
+        else:
+            image = asset_manager.load(image_path)
+        # Transform, velocity and clamping live in the entity store
+        super().__init__(image, pos, store)
 
         # Movement parameters
-        self.speed = 5
+        self.speed = 300  # pixels per second
         # Shooting mechanics
         self.projectiles = pygame.sprite.Group()
+        self.projectile_system = ProjectileSystem()
+        # Projectiles are recycled: sustained fire reuses sprites instead of building new ones
+        self.projectile_pool = ObjectPool(ProjectileEntity, preallocate=8)
+        self._projectile_slots = {}  # slot index -> ProjectileEntity
+        self.trajectory_preview = TrajectoryPreview()  # computed by prepare_frame()
+        self._projectiles_changed = False  # fired or expired since the last prepare_frame()
+        self._dirty = False
+        self.ground_y = None
+        # Optional SpatialHash; projectiles register on collision_layer while alive
+        self.collision = None
+        self.collision_layer = 1
+        # Optional ParticleEmitter; detonating projectiles burst into it
+        self.effects = None
         self.last_shot_time = 0
         self.shoot_cooldown = 0.3  # seconds
-
-    @property
-    def width(self):
-        return self.image.get_width()
-
-    @property
-    def height(self):
-        return self.image.get_height()
+        # Actions and pointer come from this tick's input snapshot
+        self.input_manager = input_manager
+        # Cooldowns run on simulated time so replays fire on the same steps
+        self.clock = sim_clock
 
     def update(self, dt, screen_width, screen_height):
-        keys = pygame.key.get_pressed()
-
-        if keys[pygame.K_a]:
-            self.rect.x -= self.speed
-        if keys[pygame.K_d]:
-            self.rect.x += self.speed
-        if keys[pygame.K_w]:
-            self.rect.y -= self.speed
-        if keys[pygame.K_s]:
-            self.rect.y += self.speed
+        snapshot = self.input_manager.snapshot
+
+        vx = vy = 0
+        if snapshot.action('move_left'):
+            vx -= self.speed
+        if snapshot.action('move_right'):
+            vx += self.speed
+        if snapshot.action('move_up'):
+            vy -= self.speed
+        if snapshot.action('move_down'):
+            vy += self.speed
+        self.store.vel[self.entity] = (vx, vy)
+        # Movement and clamping (unless the scene runs them for every entity)
+        super().update(dt, screen_width, screen_height)
 
         # Shoot projectile
-        now = pygame.time.get_ticks() / 1000
-        if keys[pygame.K_SPACE] and (now - self.last_shot_time) >= self.shoot_cooldown:
+        now = self.clock.now()
+        if snapshot.action('shoot') and (now - self.last_shot_time) >= self.shoot_cooldown:
             self.last_shot_time = now
-            mouse_pos = pygame.mouse.get_pos()
-            proj = ProjectileEntity(coords=self.rect.center, speed=640, target_pos=mouse_pos)
-
-            self.projectiles.add(proj)
-
-        # Clamp inside screen
-        self.rect.clamp_ip(pygame.Rect(0, 0, screen_width, screen_height))
-
-        # Update projectiles
+            self.shoot(snapshot.mouse_pos)
+
+        # Update projectiles: one vectorized step, then sprites read back positions
+        self.ground_y = screen_height - 64
+        expired = self.projectile_system.step(dt, self.ground_y)
+        for index in expired.tolist():
+            self._projectiles_changed = True
+            proj = self._projectile_slots.pop(index)
+            if self.effects is not None:
+                proj.explode(self.effects)
+            self.projectile_pool.release(proj)
         self.projectiles.update(dt)
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
-        for proj in self.projectiles:
-            proj.draw_trajectory(surface)
-        self.projectiles.draw(surface)
+    def shoot(self, target_pos, speed=640):
+        """Launch a projectile from the character's center towards target_pos."""
+        proj = self.projectile_pool.acquire(self.rect.center, speed, target_pos, self.projectile_system)
+        if proj is None:
+            return None
+        if self.collision is not None:
+            proj.attach(self.collision, self.collision_layer)
+        self.projectiles.add(proj)
+        self._projectile_slots[proj.index] = proj
+        self._projectiles_changed = True
+        return proj
+
+    def prepare_frame(self, screen_height):
+        """Compute this frame's trajectory preview; call once per frame before capture() or draw_bounds."""
+        ground_y = self.ground_y if self.ground_y is not None else screen_height - 64
+        self.trajectory_preview.prepare(self.projectile_system, ground_y, focus=self.rect.center)
+        # Flying projectiles and their previews move every frame; landed ones sit still, but one
+        # fired or expired inside the current bounds changes pixels without changing the bounds
+        self._dirty = self._projectiles_changed or self.projectile_system.flying_indices().size > 0
+        self._projectiles_changed = False
 
+    @property
+    def dirty(self):
+        """True when the last prepare_frame() saw the character's drawing change in place."""
+        return self._dirty
 
-    def set_position(self, x, y):
-        self.rect.topleft = (x, y)
+    @property
+    def draw_bounds(self):
+        """Area covered by draw(): the character, its projectiles and their preview."""
+        bounds = self.render_rect.unionall([proj.rect for proj in self.projectiles])
+        if self.trajectory_preview.bounds is not None:
+            bounds.union_ip(self.trajectory_preview.bounds)
+        return bounds
 
-    def move(self, dx, dy):
-        self.rect.x += dx
-        self.rect.y += dy
+    def draw(self, surface, offset=(0, 0)):
+        self.prepare_frame(surface.get_height())
+        surface.blits(offset_blits(self.capture(), offset), doreturn=False)
+
+    def capture(self):
+        """The character, its trajectory preview and its projectiles as (image, dest) blits (see prepare_frame)."""
+        return [(self.image, self.render_rect)] + self.trajectory_preview.prepared \
+            + [(proj.image, proj.rect.copy()) for proj in self.projectiles]
 
 
 class ProjectileEntity(pygame.sprite.Sprite):
-    def __init__(self, coords, speed, target_pos):
+    _preview = None  # shared by draw_trajectory so the dot sprite is built once
+    FUSE_MASK = (10, 100, 100)  # (radius, steps, alpha) of the fuse glow
+    EXPLOSION_PARTICLES = 300
+
+    def __init__(self, coords=None, speed=0, target_pos=None, system=None):
         super().__init__()
+        self.image = asset_manager.load('assets/tnt.png')
+        self.rect = self.image.get_rect()
+        self.collision = None
+        self.system = None
+        self.index = None
+        # Without a system the sprite is blank until reinit() (ObjectPool factory)
+        if system is not None:
+            self.reinit(coords, speed, target_pos, system)
+
+    def reinit(self, coords, speed, target_pos, system):
+        """Launch this sprite from coords towards target_pos (also used when recycled)."""
         # Calculate angle from coords to target_pos
         dx = target_pos[0] - coords[0]
         dy = target_pos[1] - coords[1]
         angle = math.degrees(math.atan2(dy, dx))  # angle in degrees
 
-        self.traj = projectile(coords, speed, angle, t=0)
-        self.image = pygame.image.load('assets/tnt.png').convert_alpha() 
-        self.rect = self.image.get_rect(center=coords)
-        self.active = True
-        self.death_timer = 0
+        # Motion, ground test and death timer live in the shared ProjectileSystem
+        self.system = system
+        self.index = system.spawn(coords, speed, angle)
+        self.rect.center = coords
 
-    def update(self, dt):
-        if not self.active:
-            self.death_timer += dt
-            if self.death_timer >= 3:
-                self.kill()
-            return
+    def reset(self):
+        """Detach from groups and the collision hash before going back to a pool."""
+        self.kill()
+        self.system = None
+        self.index = None
+
+    def attach(self, collision, layer):
+        """Register in a SpatialHash; the rect is kept in sync until kill()."""
+        self.collision = collision
+        collision.insert(self, self.rect, layer)
 
-        self.traj.update(dt)
-        x, y = self.traj.pos
-        screen_height = pygame.display.get_surface().get_height()
-        if y >= screen_height - 64:
-            y = screen_height - 64
-            self.active = False
+    def hit(self):
+        """Stop the flight where it is; the fuse then burns down like after landing."""
+        self.system.stop(self.index)
 
-        self.rect.center = (x, y)
+    def kill(self):
+        if self.collision is not None:
+            self.collision.remove(self)
+            self.collision = None
+        super().kill()
+
+    @property
+    def active(self):
+        return bool(self.system.active[self.index])
+
+    @property
+    def death_timer(self):
+        return float(self.system.death_timer[self.index])
+
+    def update(self, dt):
+        self.rect.center = self.system.position(self.index)
+        if self.collision is not None:
+            self.collision.move(self, self.rect)
+
+    def explode(self, effects):
+        """Detonate into a ParticleEmitter (called when the fuse has burnt down)."""
+        return effects.burst(self.rect.center, self.EXPLOSION_PARTICLES)
 
     def animation(self):
         pass
     def get_trajectory_points(self, steps=30, step_time=0.1):
         points = []
         for i in range(steps):
-            t = self.traj.t + i * step_time
-            x, y = self.traj.position_at(t)  # You must have a method like this
+            t = self.system.t[self.index] + i * step_time
+            x, y = self.system.position_at(self.index, t)
             points.append((x, y))
         return points
-    def draw_trajectory(self, surface):
-        points = self.get_trajectory_points()
-        gray = (128, 128, 128)
-        alpha = 80  # transparency
-
-        for point in points:
-            surf = pygame.Surface((6, 6), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*gray, alpha), (3, 3), 3)
-            surface.blit(surf, (point[0] - 3, point[1] - 3))
+    def draw_trajectory(self, surface, preview=None):
+        # Prefer Character.trajectory_preview, which batches every projectile at once
+        if preview is None:
+            if ProjectileEntity._preview is None:
+                ProjectileEntity._preview = TrajectoryPreview()
+            preview = ProjectileEntity._preview
+        preview.draw(surface, self.system, surface.get_height() - 64, indices=[self.index])
 
     def fuse(self):
-        light_radius = 10
-        light_alpha = 100
-        gradient_steps = 100
-
-        # Create the glowing fuse effect
-        fuse_surf = light.circle_light_mask(light_radius, gradient_steps, light_alpha)
+        # Create the glowing fuse effect (cached mask, shared by every projectile)
+        fuse_surf = light.circle_light_mask(*self.FUSE_MASK)
         # Center it on the projectile
         fuse_rect = fuse_surf.get_rect(center=(self.rect.centerx + 16, self.rect.centery - 3))
         return fuse_surf, fuse_rect
@@ -0,0 +1,209 @@
+#input subsystem
+import pygame
+
+# Mouse buttons as bindable inputs (keyboard keys are plain pygame key codes)
+MOUSE_LEFT = ('mouse', 1)
+MOUSE_MIDDLE = ('mouse', 2)
+MOUSE_RIGHT = ('mouse', 3)
+
+DEFAULT_BINDINGS = {
+    'move_left': (pygame.K_a,),
+    'move_right': (pygame.K_d,),
+    'move_up': (pygame.K_w,),
+    'move_down': (pygame.K_s,),
+    'shoot': (pygame.K_SPACE,),
+}
+
+
+class InputSnapshot:
+    """
+    One tick of input as plain data: held/pressed/released inputs and
+    actions, the pointer and the raw events. Snapshots are never mutated, so
+    they can be kept, recorded or fed to a headless or fixed-step simulation.
+    """
+    __slots__ = ('tick', 'events', 'types', 'held', 'pressed', 'released', 'mouse_pos',
+                 'actions', 'actions_pressed', 'actions_released')
+
+    def __init__(self, tick=0, events=(), held=frozenset(), pressed=frozenset(), released=frozenset(),
+                 mouse_pos=(0, 0), actions=frozenset(), actions_pressed=frozenset(), actions_released=frozenset()):
+        self.tick = tick
+        self.events = tuple(events)
+        self.types = frozenset(event.type for event in self.events)
+        self.held = held  # keys and mouse buttons currently down
+        self.pressed = pressed  # went down this tick
+        self.released = released  # went up this tick
+        self.mouse_pos = mouse_pos
+        self.actions = actions
+        self.actions_pressed = actions_pressed
+        self.actions_released = actions_released
+
+    def key(self, key) -> bool:
+        return key in self.held
+
+    def action(self, name: str) -> bool:
+        """True while any input bound to the action is held."""
+        return name in self.actions
+
+    def has(self, event_type: int) -> bool:
+        return event_type in self.types
+
+
+class InputManager:
+    """
+    Drains the SDL event queue once per tick into an InputSnapshot and
+    dispatches it.
+
+    Handlers subscribe by event type or by action name and are looked up in
+    dicts, so the cost of a tick depends on the events that happened, not on
+    how many widgets or entities listen. Actions map to any number of keys
+    or mouse buttons and can be rebound at runtime.
+    """
+
+    def __init__(self, bindings: dict = None):
+        """
+        Parameters:
+        - bindings (dict): action name -> iterable of inputs (key codes or MOUSE_* constants)
+        """
+        self._bindings = {}
+        self._by_input = {}  # input -> actions bound to it
+        self._handlers = {}  # event type -> tuple of handler(event)
+        self._action_handlers = {}  # (action, 'pressed' | 'released') -> tuple of handler(snapshot)
+        self._held = set()
+        self._mouse_pos = (0, 0)
+        self.tick = 0
+        self.snapshot = InputSnapshot()
+        for action, inputs in (bindings or {}).items():
+            self.bind(action, *inputs)
+
+    # Bindings
+    def bind(self, action: str, *inputs):
+        """Add inputs to an action."""
+        bound = self._bindings.setdefault(action, [])
+        bound.extend(i for i in inputs if i not in bound)
+        self._index_bindings()
+
+    def unbind(self, action: str, *inputs):
+        """Remove inputs from an action (all of them if none are given)."""
+        if inputs:
+            self._bindings[action] = [i for i in self._bindings.get(action, ()) if i not in inputs]
+        else:
+            self._bindings.pop(action, None)
+        self._index_bindings()
+
+    def rebind(self, action: str, *inputs):
+        """Replace an action's inputs."""
+        self._bindings[action] = list(dict.fromkeys(inputs))
+        self._index_bindings()
+
+    def bindings(self) -> dict:
+        """action -> tuple of inputs (e.g. to save in a settings file)."""
+        return {action: tuple(inputs) for action, inputs in self._bindings.items()}
+
+    def _index_bindings(self):
+        by_input = {}
+        for action, inputs in self._bindings.items():
+            for i in inputs:
+                by_input.setdefault(i, []).append(action)
+        self._by_input = {i: tuple(actions) for i, actions in by_input.items()}
+
+    def _actions(self, inputs) -> frozenset:
+        by_input = self._by_input
+        return frozenset(action for i in inputs for action in by_input.get(i, ()))
+
+    # Subscriptions
+    def subscribe(self, event_type: int, handler):
+        """Call handler(event) for every event of event_type."""
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+
+    def unsubscribe(self, event_type: int, handler):
+        handlers = tuple(h for h in self._handlers.get(event_type, ()) if h != handler)
+        if handlers:
+            self._handlers[event_type] = handlers
+        else:
+            self._handlers.pop(event_type, None)
+
+    def on_action(self, action: str, handler, phase: str = 'pressed'):
+        """Call handler(snapshot) when an action is 'pressed' or 'released'."""
+        key = (action, phase)
+        self._action_handlers[key] = self._action_handlers.get(key, ()) + (handler,)
+
+    def off_action(self, action: str, handler, phase: str = 'pressed'):
+        key = (action, phase)
+        handlers = tuple(h for h in self._action_handlers.get(key, ()) if h != handler)
+        if handlers:
+            self._action_handlers[key] = handlers
+        else:
+            self._action_handlers.pop(key, None)
+
+    # Ticks
+    def poll(self, events=None, mouse_pos=None) -> InputSnapshot:
+        """
+        Build this tick's snapshot and dispatch it.
+
+        Parameters:
+        - events (list): Events to use instead of draining pygame's queue
+          (headless runs, replays); the pointer then only moves with them
+        - mouse_pos (tuple): Pointer position to report (e.g. a recorded one)
+        """
+        live = events is None
+        if live:
+            events = pygame.event.get()
+
+        held = self._held
+        pressed = set()
+        released = set()
+        for event in events:
+            kind = event.type
+            if kind == pygame.KEYDOWN:
+                held.add(event.key)
+                pressed.add(event.key)
+            elif kind == pygame.KEYUP:
+                held.discard(event.key)
+                released.add(event.key)
+            elif kind == pygame.MOUSEBUTTONDOWN:
+                held.add(('mouse', event.button))
+                pressed.add(('mouse', event.button))
+                self._mouse_pos = event.pos
+            elif kind == pygame.MOUSEBUTTONUP:
+                held.discard(('mouse', event.button))
+                released.add(('mouse', event.button))
+                self._mouse_pos = event.pos
+            elif kind == pygame.MOUSEMOTION:
+                self._mouse_pos = event.pos
+            elif kind == pygame.WINDOWFOCUSLOST:
+                # Key-up events are lost with the focus; nothing stays stuck down
+                released.update(held)
+                held.clear()
+        if mouse_pos is not None:
+            self._mouse_pos = mouse_pos
+        elif live:
+            # Event positions can lag the cursor; the live queue reads it directly
+            self._mouse_pos = pygame.mouse.get_pos()
+
+        self.tick += 1
+        snapshot = InputSnapshot(
+            self.tick, events, frozenset(held), frozenset(pressed), frozenset(released),
+            tuple(self._mouse_pos), self._actions(held), self._actions(pressed), self._actions(released))
+        self.feed(snapshot)
+        return snapshot
+
+    def feed(self, snapshot: InputSnapshot):
+        """Make snapshot current and dispatch it (poll() does this; replays call it directly)."""
+        self.snapshot = snapshot
+        self._held = set(snapshot.held)
+        self._mouse_pos = snapshot.mouse_pos
+        self.tick = snapshot.tick
+
+        handlers = self._handlers
+        if handlers:
+            for event in snapshot.events:
+                for handler in handlers.get(event.type, ()):
+                    handler(event)
+        action_handlers = self._action_handlers
+        if action_handlers:
+            for action in snapshot.actions_pressed:
+                for handler in action_handlers.get((action, 'pressed'), ()):
+                    handler(snapshot)
+            for action in snapshot.actions_released:
+                for handler in action_handlers.get((action, 'released'), ()):
+                    handler(snapshot)
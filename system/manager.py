@@ -1,21 +1,347 @@
+import importlib
+import threading
+from collections import OrderedDict
+import pygame
+from system.startup import timeline
+
+
+def scene_class(scene):
+    """
+    scene itself, or the class named by a 'package.module:Class' string.
+
+    Strings let a game start without importing a scene's module (and all
+    it pulls in); preload() then imports it on the worker thread.
+    """
+    if not isinstance(scene, str):
+        return scene
+    module, _, name = scene.partition(':')
+    with timeline.phase(f'import {module}'):
+        return getattr(importlib.import_module(module), name)
+
+
+def _scene_name(scene) -> str:
+    return scene.rpartition(':')[2] if isinstance(scene, str) else scene.__name__
+
+
+class PreloadHandle:
+    """
+    Progress of one SceneManager.preload().
+
+    The worker thread runs scene_cls.prepare(handle), which reports through
+    begin()/advance(); the manager then builds the scene on the main thread.
+    Reads from other threads are plain attribute reads (no locking needed).
+    """
+
+    def __init__(self, key, scene_cls, args, kwargs):
+        self.key = key
+        self.scene_cls = scene_cls
+        self.args = args
+        self.kwargs = kwargs
+        self.total = 0
+        self.done = 0
+        self.stage = 'queued'
+        self.error = None
+        self.prepared = False  # worker finished
+        self.scene = None  # constructed on the main thread
+        self._thread = None
+
+    def begin(self, total: int):
+        """Called by prepare() with the number of advance() calls to expect."""
+        self.total = total
+
+    def advance(self, stage: str = None):
+        self.done += 1
+        if stage is not None:
+            self.stage = stage
+
+    @property
+    def fraction(self) -> float:
+        """0..1; the main-thread construction counts as the last step."""
+        if self.scene is not None:
+            return 1.0
+        return min(self.done, self.total) / (self.total + 1)
+
+    @property
+    def ready(self) -> bool:
+        return self.scene is not None
+
+    def _run(self):
+        try:
+            if isinstance(self.scene_cls, str):
+                self.stage = 'importing'
+                self.scene_cls = scene_class(self.scene_cls)
+            self.stage = 'preparing'
+            with timeline.phase(f'scene prepare {self.scene_cls.__name__}'):
+                self.scene_cls.prepare(self)
+        except Exception as error:  # re-raised on the main thread by poll()
+            self.error = error
+        self.prepared = True
+
+
+class _StackEntry:
+    __slots__ = ('scene', 'key', 'below', 'snapshot')
+
+    def __init__(self, scene, key, below):
+        self.scene = scene
+        self.key = key
+        self.below = below  # how scene renders under the one above: 'snapshot', 'live' or None
+        self.snapshot = None
+
+
 class SceneManager:
-    def __init__(self):
+    RENDER_BELOW = ('snapshot', 'live', None)
+
+    def __init__(self, cache_size: int = 4, memory_budget: int = None):
+        """
+        Parameters:
+        - cache_size (int): Prepared scenes kept for instant switch_to (least recently used go first)
+        - memory_budget (int): Bytes of resource_footprint() allowed across suspended and
+          cached scenes; the heaviest are unload()ed beyond it (None: no limit)
+        """
         self.current_scene = None
+        self.cache_size = cache_size
+        self.memory_budget = memory_budget
+        self._cache = OrderedDict()  # key -> prepared scene not currently shown
+        self._pending = {}  # key -> PreloadHandle still preparing
+        self._current_key = None
+        self._stack = []  # suspended scenes under current_scene, bottom first
+        self._unloaded = set()  # scenes whose resources were evicted
+
+    @staticmethod
+    def _key(scene_cls, args, kwargs):
+        return (scene_cls, args, tuple(sorted(kwargs.items())))
+
+    def preload(self, scene_cls, *args, **kwargs) -> PreloadHandle:
+        """
+        Start preparing scene_cls(*args, **kwargs) in the background.
+
+        scene_cls.prepare() runs on a worker thread; the scene itself is built
+        on the main thread by poll() (called from update()) once that is done.
+        Returns a handle with progress; switch_to(scene_cls, ...) picks it up.
+        scene_cls may be a 'module:Class' string (see scene_class()), imported
+        on the worker too; switch_to() must then be given the same string.
+        """
+        key = self._key(scene_cls, args, kwargs)
+        if key in self._pending:
+            return self._pending[key]
+        handle = PreloadHandle(key, scene_cls, args, kwargs)
+        if key in self._cache or key == self._current_key:
+            handle.prepared = True
+            handle.scene = self._cache.get(key, self.current_scene)
+            return handle
+        handle._thread = threading.Thread(target=handle._run, name=f"preload-{_scene_name(scene_cls)}", daemon=True)
+        self._pending[key] = handle
+        handle._thread.start()
+        return handle
+
+    def _finish(self, handle):
+        del self._pending[handle.key]
+        if handle.error is not None:
+            raise handle.error
+        handle.stage = 'building'
+        with timeline.phase(f'scene build {handle.scene_cls.__name__}'):
+            handle.scene = handle.scene_cls(*handle.args, **handle.kwargs)
+        handle.stage = 'ready'
+        self._cache_scene(handle.key, handle.scene)
+
+    def _cache_scene(self, key, scene):
+        self._cache[key] = scene
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._unloaded.discard(evicted)
+        self._enforce_budget()
+
+    def poll(self):
+        """Build scenes whose background preparation finished (main thread only)."""
+        for handle in [h for h in self._pending.values() if h.prepared]:
+            self._finish(handle)
+
+    def cached_scenes(self) -> list:
+        return list(self._cache.values())
+
+    def _resolve(self, scene, args, kwargs):
+        """Instance for scene (an instance or a scene class) and its cache key."""
+        if not isinstance(scene, (type, str)):
+            return scene, None
+        key = self._key(scene, args, kwargs)
+        handle = self._pending.get(key)
+        if handle is not None:
+            handle._thread.join()
+            self._finish(handle)
+        if key in self._cache:
+            return self._cache.pop(key), key
+        if key == self._current_key:
+            return self.current_scene, key
+        scene = scene_class(scene)
+        with timeline.phase(f'scene build {scene.__name__}'):
+            return scene(*args, **kwargs), key
+
+    def _show(self, scene):
+        if scene in self._unloaded:
+            self._unloaded.discard(scene)
+            scene.reload()
+        scene.invalidate()
+
+    def switch_to(self, scene, *args, **kwargs):
+        """
+        Replace the current (top) scene. scene may be an instance, or a scene
+        class (or 'module:Class' string): then a cached prepared instance is
+        reused, a running preload is waited for, or the scene is built right away.
+        """
+        scene, key = self._resolve(scene, args, kwargs)
+        timeline.mark(f'switch to {type(scene).__name__}')
 
-    def switch_to(self, scene):
         if self.current_scene:
             self.current_scene.exit()
+            if self._current_key is not None and self.current_scene is not scene:
+                # Keep it prepared so switching back is instant
+                self._cache_scene(self._current_key, self.current_scene)
         self.current_scene = scene
+        self._current_key = key
+        self._show(scene)
         self.current_scene.enter()
 
+    def push(self, scene, *args, below: str = 'snapshot', **kwargs):
+        """
+        Suspend the current scene (state kept) and enter scene on top of it.
+
+        Parameters:
+        - scene: Scene instance or class (+ constructor args), as for switch_to
+        - below (str): How the suspended scene shows underneath: 'snapshot'
+          (frozen copy drawn with one blit), 'live' (still drawn every frame,
+          not updated) or None (hidden)
+        """
+        if below not in self.RENDER_BELOW:
+            raise ValueError(f"below must be one of {self.RENDER_BELOW}")
+        scene, key = self._resolve(scene, args, kwargs)
+        if self.current_scene is not None:
+            self.current_scene.suspend()
+            self._stack.append(_StackEntry(self.current_scene, self._current_key, below))
+        self.current_scene = scene
+        self._current_key = key
+        self._show(scene)
+        scene.enter()
+        self._enforce_budget()
+
+    def pop(self):
+        """Exit the top scene and resume the one below it; returns the popped scene."""
+        if not self._stack:
+            raise IndexError('pop from an empty scene stack')
+        popped, popped_key = self.current_scene, self._current_key
+        popped.exit()
+        entry = self._stack.pop()
+        self.current_scene = entry.scene
+        self._current_key = entry.key
+        self._show(entry.scene)
+        entry.scene.resume()
+        if popped_key is not None:
+            self._cache_scene(popped_key, popped)
+        return popped
+
+    @property
+    def stack(self) -> list:
+        """Scenes bottom first, current scene last."""
+        return [entry.scene for entry in self._stack] + ([self.current_scene] if self.current_scene else [])
+
+    def _visible_below(self):
+        """Indices of stack entries drawn live this frame (they must stay loaded)."""
+        visible = set()
+        i = len(self._stack) - 1
+        while i >= 0 and self._stack[i].below == 'live':
+            visible.add(i)
+            i -= 1
+        return visible
+
+    def resource_footprint(self) -> dict:
+        """Bytes per loaded suspended/cached scene plus snapshot surfaces."""
+        scenes = [entry.scene for entry in self._stack] + list(self._cache.values())
+        return {
+            'scenes': sum(scene.resource_footprint() for scene in scenes if scene not in self._unloaded),
+            'snapshots': sum(entry.snapshot.get_pitch() * entry.snapshot.get_height()
+                             for entry in self._stack if entry.snapshot is not None),
+            'unloaded': len(self._unloaded),
+        }
+
+    def _enforce_budget(self):
+        if self.memory_budget is None:
+            return
+        visible = self._visible_below()
+        candidates = list(self._cache.values())
+        for i, entry in enumerate(self._stack):
+            # A snapshot not captured yet still needs its scene to draw it
+            if i not in visible and (entry.below != 'snapshot' or entry.snapshot is not None):
+                candidates.append(entry.scene)
+        loaded = [(scene.resource_footprint(), scene) for scene in candidates if scene not in self._unloaded]
+        total = sum(size for size, _ in loaded)
+        # Heaviest first
+        for size, scene in sorted(loaded, key=lambda item: item[0], reverse=True):
+            if total <= self.memory_budget or size <= 0:
+                break
+            scene.unload()
+            self._unloaded.add(scene)
+            total -= size
+
     def handle_events(self, events):
         if self.current_scene:
             self.current_scene.handle_events(events)
 
     def update(self, dt):
+        # Off the main thread (pipelined Engine) the Engine polls at its handoff instead
+        if self._pending and threading.current_thread() is threading.main_thread():
+            self.poll()
         if self.current_scene:
             self.current_scene.update(dt)
 
-    def draw(self, screen):
+    def draw(self, screen, interpolation=1.0):
+        if self.current_scene:
+            # Blend factor between the last two fixed steps (see system.engine.Engine)
+            self.current_scene.interpolation = interpolation
+            if self._stack and self._stack[-1].below is not None:
+                # Overlay: repaint what is underneath, then the whole top scene
+                self._draw_below(screen, len(self._stack) - 1)
+                self.current_scene.invalidate()
+                self.current_scene.draw(screen)
+                return None
+            return self.current_scene.draw(screen)
+
+    def capture(self, interpolation=1.0):
+        """
+        The current scene's capture() for render(), or None when this frame
+        has to be drawn serially (the scene cannot capture, or an overlay
+        shows scenes underneath).
+        """
+        scene = self.current_scene
+        if scene is None or (self._stack and self._stack[-1].below is not None):
+            return None
+        scene.interpolation = interpolation
+        frame = scene.capture()
+        return None if frame is None else (scene, frame)
+
+    def render(self, screen, captured):
+        """Draw a capture() result; the scene that captured it draws, even if a switch happened since."""
+        scene, frame = captured
+        return scene.render(screen, frame)
+
+    def _draw_below(self, surface, i):
+        entry = self._stack[i]
+        if entry.below == 'live':
+            self._compose(surface, i)
+            return
+        if entry.snapshot is None:
+            entry.snapshot = pygame.Surface(surface.get_size()).convert(surface)
+            self._compose(entry.snapshot, i)
+            self._enforce_budget()
+        surface.blit(entry.snapshot, (0, 0))
+
+    def _compose(self, surface, i):
+        """Draw suspended scene i (and whatever shows beneath it) onto surface."""
+        if i > 0 and self._stack[i - 1].below is not None:
+            self._draw_below(surface, i - 1)
+        scene = self._stack[i].scene
+        scene.invalidate()
+        scene.draw(surface)
+
+    def invalidate(self, rects=None):
         if self.current_scene:
-            self.current_scene.draw(screen)
+            self.current_scene.invalidate(rects)
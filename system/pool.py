@@ -0,0 +1,97 @@
+#object pool
+
+
+class ObjectPool:
+    """
+    Free list of reusable objects for short-lived entities (projectiles, effects).
+
+    acquire() hands out a released object re-initialised in place, or builds a
+    new one only when the free list is empty; release() resets the object and
+    puts it back. Once the pool has grown to the peak number of objects alive
+    at once, steady-state spawning allocates nothing.
+    """
+
+    def __init__(self, factory, *, reinit=None, reset=None, preallocate: int = 0, max_size: int = None):
+        """
+        Parameters:
+        - factory (callable): factory() builds a blank object
+        - reinit (callable): reinit(obj, *args, **kwargs) prepares an object on
+          acquire (default: obj.reinit(*args, **kwargs) if the object has one)
+        - reset (callable): reset(obj) runs on release (default: obj.reset() if present)
+        - preallocate (int): Objects built up front
+        - max_size (int): Most objects the pool will ever build (None = unbounded);
+          acquire() returns None once they are all in use
+        """
+        self.factory = factory
+        self._reinit = reinit
+        self._reset = reset
+        self.max_size = max_size
+        self._free = []
+        self._out = {}  # id -> object handed out by acquire(); only these can be released
+        self.created = 0
+        self.in_use = 0
+        self.high_water = 0  # most objects in use at once
+        self.acquires = 0
+        self.reused = 0  # acquires served from the free list
+        self.exhausted = 0  # acquire() calls refused by max_size
+        self.preallocate(preallocate)
+
+    def __len__(self):
+        """Objects waiting in the free list."""
+        return len(self._free)
+
+    def preallocate(self, count: int):
+        """Build objects until count are free (bounded by max_size)."""
+        while len(self._free) < count and (self.max_size is None or self.created < self.max_size):
+            obj = self.factory()
+            self.created += 1
+            self._free.append(obj)
+
+    def acquire(self, *args, **kwargs):
+        """Take an object (reused if possible) and re-initialise it with the arguments."""
+        if self._free:
+            obj = self._free.pop()
+            self.reused += 1
+        elif self.max_size is None or self.created < self.max_size:
+            obj = self.factory()
+            self.created += 1
+        else:
+            self.exhausted += 1
+            return None
+        self._out[id(obj)] = obj
+        self.acquires += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+
+        if self._reinit is not None:
+            self._reinit(obj, *args, **kwargs)
+        else:
+            reinit = getattr(obj, 'reinit', None)
+            if reinit is not None:
+                reinit(*args, **kwargs)
+        return obj
+
+    def release(self, obj):
+        """Reset obj and return it to the free list (ValueError unless acquire() handed it out)."""
+        if self._out.pop(id(obj), None) is not obj:
+            raise ValueError("object was not acquired from this pool, or was released twice")
+        if self._reset is not None:
+            self._reset(obj)
+        else:
+            reset = getattr(obj, 'reset', None)
+            if reset is not None:
+                reset()
+        self.in_use -= 1
+        self._free.append(obj)
+
+    def stats(self) -> dict:
+        return {
+            'created': self.created,
+            'in_use': self.in_use,
+            'free': len(self._free),
+            'high_water': self.high_water,
+            'acquires': self.acquires,
+            'reused': self.reused,
+            'exhausted': self.exhausted,
+        }
@@ -0,0 +1,154 @@
+#input recording and replay
+import struct
+import time
+import zlib
+import numpy as np
+import pygame
+
+MAGIC = b'PMEREC'
+VERSION = 1
+_HEADER = struct.Struct('<6sHdq')  # magic, version, step, particle seed (-1: none)
+_FRAME = struct.Struct('<dhhIH')  # frame time, mouse x, mouse y, state checksum, event count
+_TYPE = struct.Struct('<I')
+_KEY = struct.Struct('<iH')  # key, mod
+_BUTTON = struct.Struct('<Bhh')  # button, x, y
+_MOTION = struct.Struct('<hh')  # x, y
+_BARE = (pygame.QUIT, pygame.WINDOWFOCUSLOST)
+
+
+def _encode_event(event):
+    # Only the events InputManager interprets are kept; None drops the event
+    kind = event.type
+    if kind in (pygame.KEYDOWN, pygame.KEYUP):
+        return _TYPE.pack(kind) + _KEY.pack(event.key, getattr(event, 'mod', 0))
+    if kind in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        return _TYPE.pack(kind) + _BUTTON.pack(event.button, *event.pos)
+    if kind == pygame.MOUSEMOTION:
+        return _TYPE.pack(kind) + _MOTION.pack(*event.pos)
+    if kind in _BARE:
+        return _TYPE.pack(kind)
+    return None
+
+
+def _decode_event(data, offset):
+    (kind,), offset = _TYPE.unpack_from(data, offset), offset + _TYPE.size
+    if kind in (pygame.KEYDOWN, pygame.KEYUP):
+        key, mod = _KEY.unpack_from(data, offset)
+        return pygame.event.Event(kind, key=key, mod=mod, unicode='', scancode=0), offset + _KEY.size
+    if kind in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        button, x, y = _BUTTON.unpack_from(data, offset)
+        return pygame.event.Event(kind, button=button, pos=(x, y)), offset + _BUTTON.size
+    if kind == pygame.MOUSEMOTION:
+        x, y = _MOTION.unpack_from(data, offset)
+        return pygame.event.Event(kind, pos=(x, y), rel=(0, 0), buttons=(0, 0, 0)), offset + _MOTION.size
+    if kind in _BARE:
+        return pygame.event.Event(kind), offset
+    raise ValueError(f"unknown event type {kind} in input log")
+
+
+def state_checksum(state) -> int:
+    """CRC-32 over a sequence of arrays (or numbers); equal state gives equal checksums."""
+    crc = 0
+    for item in state:
+        crc = zlib.crc32(np.ascontiguousarray(item), crc)
+    return crc
+
+
+def scene_checksum(scene_manager) -> int:
+    """Checksum of the current scene's sim_state()."""
+    scene = scene_manager.current_scene
+    return state_checksum(scene.sim_state()) if scene is not None else 0
+
+
+class InputRecorder:
+    """
+    Streams one frame per Engine.tick() to a compact binary log: the frame
+    time fed to the accumulator, the pointer, the input events and a checksum
+    of the simulation state after the frame (see Engine(recorder=...)).
+    """
+
+    def __init__(self, path: str, step: float, seed: int = None, scene_manager=None):
+        """
+        Parameters:
+        - path (str): Output file
+        - step (float): The Engine's simulation step (replays must use the same)
+        - seed (int): Seed the scene's random generators were created with
+        - scene_manager (SceneManager): Checksummed after every frame (None: checksums are 0)
+        """
+        self.scene_manager = scene_manager
+        self.frames = 0
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, step, -1 if seed is None else seed))
+
+    def record(self, frame_time: float, snapshot):
+        events = [data for data in map(_encode_event, snapshot.events) if data is not None]
+        checksum = scene_checksum(self.scene_manager) if self.scene_manager is not None else 0
+        x, y = snapshot.mouse_pos
+        self._file.write(_FRAME.pack(frame_time, x, y, checksum, len(events)))
+        self._file.write(b''.join(events))
+        self.frames += 1
+
+    def close(self):
+        self._file.close()
+
+
+class InputLog:
+    """A recorded session: step, seed and per-frame (frame_time, mouse_pos, events, checksum)."""
+
+    def __init__(self, step: float, seed: int = None, frames=None):
+        self.step = step
+        self.seed = seed
+        self.frames = frames or []
+
+    def __len__(self):
+        return len(self.frames)
+
+    @classmethod
+    def load(cls, path: str) -> 'InputLog':
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, step, seed = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input log")
+        frames = []
+        offset = _HEADER.size
+        while offset < len(data):
+            frame_time, x, y, checksum, count = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            events = []
+            for _ in range(count):
+                event, offset = _decode_event(data, offset)
+                events.append(event)
+            frames.append((frame_time, (x, y), events, checksum))
+        return cls(step, None if seed < 0 else seed, frames)
+
+
+def replay(log: InputLog, engine, verify: bool = True) -> dict:
+    """
+    Run a recorded session through engine as fast as possible.
+
+    The engine must drive a freshly built scene (created with log.seed) and
+    use log.step; each frame gets its recorded frame time and input instead
+    of the clock and the SDL queue. Returns the per-frame checksums, the
+    first frame whose checksum differs from the recording (None if all
+    match) and the wall time taken.
+    """
+    if abs(engine.step - log.step) > 1e-12:
+        raise ValueError(f"engine step {engine.step} differs from the recorded {log.step}")
+    checksums = []
+    mismatch = None
+    engine.running = True
+    start = time.perf_counter()
+    for i, (frame_time, mouse_pos, events, recorded) in enumerate(log.frames):
+        engine.tick(frame_time, events, mouse_pos)
+        engine.finish()  # a pipelined engine may still be stepping
+        checksum = scene_checksum(engine.scene_manager)
+        checksums.append(checksum)
+        if verify and mismatch is None and checksum != recorded:
+            mismatch = i
+    return {
+        'frames': len(checksums),
+        'checksums': checksums,
+        'mismatch': mismatch,
+        'seconds': time.perf_counter() - start,
+    }
@@ -0,0 +1,100 @@
+#startup timeline
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    """
+    Where the time before the first frame goes: named phases (imports,
+    display init, fonts, asset decodes, scene preparation and construction)
+    and marks (first frame, scene switches), in ms since the timeline was
+    created.
+
+    The global timeline starts when this module is first imported, so game
+    scripts import it before anything else. A phase nested in another phase
+    of the same name is not recorded again; recording stops after
+    max_phases phases or finish(), after which phase() only checks a flag.
+    Engine.run() calls finish() at the first frame of the first scene that
+    is not a loading screen.
+    """
+
+    def __init__(self, origin: float = None, max_phases: int = 256):
+        """
+        Parameters:
+        - origin (float): perf_counter() value of time 0 (default: now)
+        - max_phases (int): Phases recorded before recording stops by itself
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self.max_phases = max_phases
+        self.phases = []  # (name, start ms, duration ms, depth, thread name, counted in totals)
+        self.marks = []  # (label, ms)
+        self.active = True
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        """ms since the origin."""
+        return (time.perf_counter() - self.origin) * 1000
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record the enclosed block as a phase; the category is the first word of name."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        if not self.active or name in stack:
+            yield
+            return
+        # Time inside an enclosing phase of the same category is only counted once
+        counted = all(outer.split()[0] != name.split()[0] for outer in stack)
+        stack.append(name)
+        start = self.now()
+        try:
+            yield
+        finally:
+            stack.pop()
+            duration = self.now() - start
+            with self._lock:
+                if self.active:
+                    self.phases.append((name, start, duration, len(stack), threading.current_thread().name, counted))
+                    if len(self.phases) >= self.max_phases:
+                        self.active = False
+
+    def mark(self, label: str):
+        """Record a point in time (e.g. 'first frame')."""
+        if self.active:
+            with self._lock:
+                self.marks.append((label, self.now()))
+
+    def first(self, label: str) -> float:
+        """ms of the first mark with label, or None."""
+        return next((ms for name, ms in self.marks if name == label), None)
+
+    def finish(self):
+        """Stop recording."""
+        self.active = False
+
+    def totals(self) -> dict:
+        """Category (first word of the phase name) -> ms spent in its outermost phases."""
+        totals = {}
+        for name, _, duration, _, _, counted in self.phases:
+            if counted:
+                category = name.split()[0]
+                totals[category] = totals.get(category, 0.0) + duration
+        return totals
+
+    def report(self) -> str:
+        """Human-readable timeline: every phase and mark in start order, then totals per category."""
+        rows = [(start, f"{start:8.1f} +{duration:7.1f}  {'  ' * depth}{name}"
+                 + (f"  [{thread}]" if thread != 'MainThread' else ''))
+                for name, start, duration, depth, thread, _ in self.phases]
+        rows += [(ms, f"{ms:8.1f}           * {label}") for label, ms in self.marks]
+        lines = ['startup timeline (ms since start)']
+        lines += [row for _, row in sorted(rows, key=lambda row: row[0])]
+        lines.append('totals: ' + ', '.join(f"{name} {ms:.1f}" for name, ms in self.totals().items()))
+        return '\n'.join(lines)
+
+
+timeline = StartupTimeline()
+